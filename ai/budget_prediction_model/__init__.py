@@ -1,9 +1,12 @@
 from .train_and_tune import train_models, train_all_categories
 from .inference import predict_next_day
+from .registry import ModelRegistry, model_registry
 
 __all__ = [
     "train_models",
     "train_all_categories",
     "predict_next_day",
+    "ModelRegistry",
+    "model_registry",
 ]
 # This file is intentionally left blank. It makes the 'ai' directory a Python package.
@@ -1,16 +1,12 @@
 import pandas as pd
 import numpy as np
 from datetime import timedelta
-import joblib
-import tensorflow as tf
 import warnings
-import os
 import re
 
-warnings.filterwarnings("ignore")
+from .registry import model_registry
 
-# Get the directory of the current script
-AI_DIR = os.path.dirname(os.path.abspath(__file__))
+warnings.filterwarnings("ignore")
 
 
 def _category_model_key(category: str) -> str:
@@ -19,31 +15,9 @@ def _category_model_key(category: str) -> str:
     return key or "Uncategorized"
 
 
-def _resolve_model_paths(category: str) -> dict[str, str]:
-    category_key = _category_model_key(category)
-    prefix_candidates = [f"GLOBAL_{category_key}", f"GLOBAL_{category}"]
-
-    for prefix in prefix_candidates:
-        model_path_lstm = os.path.join(AI_DIR, f"lstm_{prefix}.keras")
-        model_path_xgb = os.path.join(AI_DIR, f"xgb_{prefix}.pkl")
-        scaler_path = os.path.join(AI_DIR, f"scaler_{prefix}.pkl")
-        accounts_path = os.path.join(AI_DIR, f"accounts_{prefix}.pkl")
-        meta_path = os.path.join(AI_DIR, f"meta_{prefix}.pkl")
-
-        if all(
-            os.path.exists(path)
-            for path in [model_path_lstm, model_path_xgb, scaler_path, accounts_path]
-        ):
-            return {
-                "prefix": prefix,
-                "model_path_lstm": model_path_lstm,
-                "model_path_xgb": model_path_xgb,
-                "scaler_path": scaler_path,
-                "accounts_path": accounts_path,
-                "meta_path": meta_path,
-            }
-
-    raise FileNotFoundError(f"Models for category '{category}' not found.")
+def _prefix_candidates(category: str) -> list[str]:
+    candidates = [f"GLOBAL_{_category_model_key(category)}", f"GLOBAL_{category}"]
+    return list(dict.fromkeys(candidates))
 
 
 def _build_category_series_for_user(
@@ -82,19 +56,12 @@ def predict_next_day(
     budget_remaining: float,
     look_back: int = 30,
 ):
-    paths = _resolve_model_paths(category)
-    model_path_lstm = paths["model_path_lstm"]
-    model_path_xgb = paths["model_path_xgb"]
-    scaler_path = paths["scaler_path"]
-    accounts_path = paths["accounts_path"]
-    meta_path = paths["meta_path"]
-    transactions_path = os.path.join(AI_DIR, "transactions.csv")
-
-    lstm_model = tf.keras.models.load_model(model_path_lstm)
-    xgb_model = joblib.load(model_path_xgb)
-    scaler = joblib.load(scaler_path)
-    trained_accounts = joblib.load(accounts_path)
-    metadata = joblib.load(meta_path) if os.path.exists(meta_path) else {}
+    # Loaded once per process; reloaded only when the artifacts change.
+    bundle = model_registry.get(_prefix_candidates(category))
+    lstm_model = bundle.lstm_model
+    xgb_model = bundle.xgb_model
+    scaler = bundle.scaler
+    metadata = bundle.metadata
     effective_look_back = int(metadata.get("look_back", look_back))
     fallback_amount = float(metadata.get("fallback_amount", 0.0))
     lstm_quality = float(metadata.get("lstm_quality", 0.5))
@@ -118,10 +85,7 @@ def predict_next_day(
         ],
     )
 
-    df = pd.read_csv(transactions_path)
-    df["date"] = pd.to_datetime(df["date"]).dt.date
-    df["amount"] = pd.to_numeric(df["amount"], errors="coerce")
-    df.dropna(subset=["amount"], inplace=True)
+    df = model_registry.transactions()
 
     user_series = _build_category_series_for_user(df, user_id, category)
     if user_series.empty:
@@ -0,0 +1,249 @@
+"""
+Process-wide registry of the per-category GLOBAL_* model bundles.
+
+The artifact directory is indexed once (and again only when its mtime
+changes); each category's LSTM, XGBoost model, scaler, accounts and metadata
+are deserialized on first use and kept in an LRU bounded by the bundles'
+on-disk size. A bundle whose artifact mtimes changed since it was loaded is
+reloaded on its next lookup, so retrained models are picked up without a
+restart.
+"""
+
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any
+
+import joblib
+import pandas as pd
+import tensorflow as tf
+
+logger = logging.getLogger(__name__)
+
+AI_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_LSTM_PATTERN = re.compile(r"^lstm_(GLOBAL_.+)\.keras$")
+_REQUIRED = ("lstm", "xgb", "scaler", "accounts")
+
+
+def _artifact_paths(directory: str, prefix: str) -> dict[str, str]:
+    return {
+        "lstm": os.path.join(directory, f"lstm_{prefix}.keras"),
+        "xgb": os.path.join(directory, f"xgb_{prefix}.pkl"),
+        "scaler": os.path.join(directory, f"scaler_{prefix}.pkl"),
+        "accounts": os.path.join(directory, f"accounts_{prefix}.pkl"),
+        "meta": os.path.join(directory, f"meta_{prefix}.pkl"),
+    }
+
+
+def _stat(paths: dict[str, str]) -> tuple[tuple, int] | None:
+    """(mtime signature, total bytes) of a bundle's files; None if a required one is gone."""
+    signature = []
+    total = 0
+    for kind, path in paths.items():
+        try:
+            info = os.stat(path)
+        except FileNotFoundError:
+            if kind in _REQUIRED:
+                return None
+            signature.append((kind, None))
+            continue
+        signature.append((kind, info.st_mtime_ns))
+        total += info.st_size
+    return tuple(signature), total
+
+
+@dataclass(eq=False)
+class ModelBundle:
+    prefix: str
+    lstm_model: Any
+    xgb_model: Any
+    scaler: Any
+    trained_accounts: Any
+    metadata: dict
+    signature: tuple = field(repr=False)
+    nbytes: int = 0
+    load_seconds: float = 0.0
+
+
+class ModelRegistry:
+    """
+    LRU of ModelBundles keyed by artifact prefix, bounded by total artifact
+    bytes. Also caches the parsed transactions.csv history the same way.
+    """
+
+    def __init__(self, name: str, directory: str, max_bytes: int):
+        self.name = name
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._index: dict[str, dict[str, str]] = {}
+        self._index_mtime: int | None = None
+        self._bundles: OrderedDict[str, ModelBundle] = OrderedDict()
+        self._bytes = 0
+        self._transactions: tuple[int, pd.DataFrame] | None = None
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+        self.evictions = 0
+        self.loads = 0
+        self.load_seconds = 0.0
+
+    def _refresh_index(self):
+        mtime = os.stat(self.directory).st_mtime_ns
+        if mtime == self._index_mtime:
+            return
+        index = {}
+        for entry in os.scandir(self.directory):
+            match = _LSTM_PATTERN.match(entry.name)
+            if not match:
+                continue
+            paths = _artifact_paths(self.directory, match.group(1))
+            if all(os.path.exists(paths[kind]) for kind in _REQUIRED):
+                index[match.group(1)] = paths
+        self._index = index
+        self._index_mtime = mtime
+
+    def prefixes(self) -> list[str]:
+        with self._lock:
+            self._refresh_index()
+            return sorted(self._index)
+
+    def _resolve(self, prefix_candidates: list[str]) -> tuple[str, dict[str, str]] | None:
+        self._refresh_index()
+        for prefix in prefix_candidates:
+            paths = self._index.get(prefix)
+            if paths is not None:
+                return prefix, paths
+        return None
+
+    def _load(self, prefix: str, paths: dict[str, str], signature: tuple, nbytes: int) -> ModelBundle:
+        start = time.perf_counter()
+        bundle = ModelBundle(
+            prefix=prefix,
+            lstm_model=tf.keras.models.load_model(paths["lstm"]),
+            xgb_model=joblib.load(paths["xgb"]),
+            scaler=joblib.load(paths["scaler"]),
+            trained_accounts=joblib.load(paths["accounts"]),
+            metadata=joblib.load(paths["meta"]) if os.path.exists(paths["meta"]) else {},
+            signature=signature,
+            nbytes=nbytes,
+        )
+        bundle.load_seconds = time.perf_counter() - start
+        logger.info("Loaded model bundle %s in %.3fs", prefix, bundle.load_seconds)
+        return bundle
+
+    def _store(self, bundle: ModelBundle):
+        previous = self._bundles.pop(bundle.prefix, None)
+        if previous is not None:
+            self._bytes -= previous.nbytes
+        self.loads += 1
+        self.load_seconds += bundle.load_seconds
+        if bundle.nbytes > self.max_bytes:
+            return
+        self._bundles[bundle.prefix] = bundle
+        self._bytes += bundle.nbytes
+        self._evict()
+
+    def _evict(self):
+        while self._bytes > self.max_bytes and self._bundles:
+            _, evicted = self._bundles.popitem(last=False)
+            self._bytes -= evicted.nbytes
+            self.evictions += 1
+
+    def get(self, prefix_candidates: list[str]) -> ModelBundle:
+        """
+        The bundle for the first candidate prefix with all required artifacts,
+        loading or reloading it when needed. Raises FileNotFoundError if none.
+        """
+        with self._lock:
+            resolved = self._resolve(prefix_candidates)
+        if resolved is None:
+            raise FileNotFoundError(f"Models for prefixes {prefix_candidates} not found.")
+        prefix, paths = resolved
+
+        stat = _stat(paths)
+        if stat is None:
+            raise FileNotFoundError(f"Models for prefix '{prefix}' not found.")
+        signature, nbytes = stat
+
+        with self._lock:
+            bundle = self._bundles.get(prefix)
+            if bundle is not None and bundle.signature == signature:
+                self._bundles.move_to_end(prefix)
+                self.hits += 1
+                return bundle
+            self.misses += 1
+            if bundle is not None:
+                self.reloads += 1
+
+        # One load at a time: concurrent misses for the same prefix wait for
+        # the first one instead of deserializing the models again.
+        with self._load_lock:
+            with self._lock:
+                bundle = self._bundles.get(prefix)
+                if bundle is not None and bundle.signature == signature:
+                    self._bundles.move_to_end(prefix)
+                    return bundle
+            bundle = self._load(prefix, paths, signature, nbytes)
+            with self._lock:
+                self._store(bundle)
+        return bundle
+
+    def transactions(self) -> pd.DataFrame:
+        """The parsed transactions.csv history, re-read only when the file changes. Do not mutate."""
+        path = os.path.join(self.directory, "transactions.csv")
+        mtime = os.stat(path).st_mtime_ns
+        cached = self._transactions
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        df = pd.read_csv(path)
+        df["date"] = pd.to_datetime(df["date"]).dt.date
+        df["amount"] = pd.to_numeric(df["amount"], errors="coerce")
+        df.dropna(subset=["amount"], inplace=True)
+        self._transactions = (mtime, df)
+        return df
+
+    def resize(self, max_bytes: int):
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._bundles.clear()
+            self._bytes = 0
+            self._index_mtime = None
+            self._transactions = None
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        with self._lock:
+            bundles = {
+                prefix: round(bundle.load_seconds * 1000, 1)
+                for prefix, bundle in self._bundles.items()
+            }
+        return {
+            "name": self.name,
+            "size": len(bundles),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "reloads": self.reloads,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "loads": self.loads,
+            "load_ms_total": round(self.load_seconds * 1000, 1),
+            "load_ms_by_bundle": bundles,
+        }
+
+
+# The API resizes this from settings.BUDGET_MODEL_CACHE_MAX_MB.
+model_registry = ModelRegistry("budget_models", AI_DIR, 256 * 1024 * 1024)
@@ -0,0 +1,96 @@
+"""add daily transaction aggregates table
+
+Revision ID: a4d8e1f6c3b7
+Revises: f3a1c7d9e2b4
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a4d8e1f6c3b7"
+down_revision: Union[str, Sequence[str], None] = "f3a1c7d9e2b4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    if "daily_transaction_aggregates" not in set(inspector.get_table_names()):
+        op.create_table(
+            "daily_transaction_aggregates",
+            sa.Column(
+                "id", postgresql.UUID(as_uuid=True), primary_key=True, nullable=False
+            ),
+            sa.Column(
+                "user_id", sa.String(), sa.ForeignKey("users.user_id"), nullable=False
+            ),
+            sa.Column(
+                "account_id",
+                postgresql.UUID(as_uuid=True),
+                sa.ForeignKey("bank_accounts.id"),
+                nullable=True,
+            ),
+            sa.Column("day", sa.Date(), nullable=False),
+            sa.Column("category", sa.String(), nullable=False, server_default=""),
+            sa.Column("type", sa.String(length=10), nullable=False),
+            sa.Column(
+                "total_amount", sa.Numeric(precision=14, scale=2), nullable=False
+            ),
+            sa.Column("tx_count", sa.Integer(), nullable=False),
+            sa.UniqueConstraint(
+                "user_id",
+                "account_id",
+                "day",
+                "category",
+                "type",
+                name="uq_daily_transaction_aggregate",
+                postgresql_nulls_not_distinct=True,
+            ),
+        )
+        op.create_index(
+            "ix_daily_transaction_aggregates_account_day",
+            "daily_transaction_aggregates",
+            ["account_id", "day"],
+            unique=False,
+        )
+        op.create_index(
+            "ix_daily_transaction_aggregates_user_day",
+            "daily_transaction_aggregates",
+            ["user_id", "day"],
+            unique=False,
+        )
+
+        # Backfill from existing history.
+        op.execute(
+            """
+            INSERT INTO daily_transaction_aggregates
+                (id, user_id, account_id, day, category, type, total_amount, tx_count)
+            SELECT
+                gen_random_uuid(),
+                user_id,
+                account_id,
+                (date AT TIME ZONE 'UTC')::date,
+                COALESCE(category, ''),
+                type,
+                SUM(amount),
+                COUNT(*)
+            FROM transactions
+            GROUP BY user_id, account_id, (date AT TIME ZONE 'UTC')::date,
+                COALESCE(category, ''), type
+            """
+        )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_daily_transaction_aggregates_user_day")
+    op.execute("DROP INDEX IF EXISTS ix_daily_transaction_aggregates_account_day")
+    op.execute("DROP TABLE IF EXISTS daily_transaction_aggregates")
@@ -0,0 +1,37 @@
+"""add transactions account_id/date index
+
+Revision ID: a7c3e9d1f5b2
+Revises: f6a2d8c4b9e1
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a7c3e9d1f5b2"
+down_revision: Union[str, Sequence[str], None] = "f6a2d8c4b9e1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    existing = {index["name"] for index in inspector.get_indexes("transactions")}
+    if "ix_transactions_account_id_date" not in existing:
+        op.create_index(
+            "ix_transactions_account_id_date",
+            "transactions",
+            ["account_id", "date"],
+            unique=False,
+        )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_transactions_account_id_date")
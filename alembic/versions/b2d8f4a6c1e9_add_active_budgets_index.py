@@ -0,0 +1,38 @@
+"""add partial index on active budgets by user, category and period
+
+Revision ID: b2d8f4a6c1e9
+Revises: a7c3e9d1f5b2
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b2d8f4a6c1e9"
+down_revision: Union[str, Sequence[str], None] = "a7c3e9d1f5b2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    existing = {index["name"] for index in inspector.get_indexes("budgets")}
+    if "ix_budgets_active_user_category_period" not in existing:
+        op.create_index(
+            "ix_budgets_active_user_category_period",
+            "budgets",
+            ["user_id", "category", "start_date", "end_date"],
+            unique=False,
+            postgresql_where=sa.text("is_completed = false"),
+        )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_budgets_active_user_category_period")
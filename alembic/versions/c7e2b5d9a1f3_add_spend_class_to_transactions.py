@@ -0,0 +1,30 @@
+"""add spend_class to transactions
+
+Revision ID: c7e2b5d9a1f3
+Revises: a4d8e1f6c3b7
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c7e2b5d9a1f3"
+down_revision: Union[str, Sequence[str], None] = "a4d8e1f6c3b7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing rows are classified by scripts/backfill_spend_class.py; until
+    # then analytics classifies NULL rows on read.
+    op.execute(
+        "ALTER TABLE transactions ADD COLUMN IF NOT EXISTS spend_class VARCHAR(20)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE transactions DROP COLUMN IF EXISTS spend_class")
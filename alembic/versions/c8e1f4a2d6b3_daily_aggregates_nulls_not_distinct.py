@@ -0,0 +1,74 @@
+"""treat NULL account_id as equal in the daily aggregate unique key
+
+Revision ID: c8e1f4a2d6b3
+Revises: b2d8f4a6c1e9
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c8e1f4a2d6b3"
+down_revision: Union[str, Sequence[str], None] = "b2d8f4a6c1e9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_TABLE = "daily_transaction_aggregates"
+_CONSTRAINT = "uq_daily_transaction_aggregate"
+_COLUMNS = ["user_id", "account_id", "day", "category", "type"]
+
+# Rows without an account never hit the upsert's conflict target, so each
+# such transaction added its own row. Fold them into one row per key.
+_DUPLICATES = """
+    SELECT user_id, day, category, type,
+        MIN(id::text)::uuid AS keep_id,
+        SUM(total_amount) AS total_amount,
+        SUM(tx_count) AS tx_count
+    FROM daily_transaction_aggregates
+    WHERE account_id IS NULL
+    GROUP BY user_id, day, category, type
+    HAVING COUNT(*) > 1
+"""
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if _TABLE not in set(inspector.get_table_names()):
+        return
+
+    op.execute(
+        f"""
+        UPDATE daily_transaction_aggregates AS agg
+        SET total_amount = dup.total_amount, tx_count = dup.tx_count
+        FROM ({_DUPLICATES}) AS dup
+        WHERE agg.id = dup.keep_id
+        """
+    )
+    op.execute(
+        f"""
+        DELETE FROM daily_transaction_aggregates AS agg
+        USING ({_DUPLICATES}) AS dup
+        WHERE agg.account_id IS NULL
+            AND agg.user_id = dup.user_id
+            AND agg.day = dup.day
+            AND agg.category = dup.category
+            AND agg.type = dup.type
+            AND agg.id <> dup.keep_id
+        """
+    )
+
+    op.drop_constraint(_CONSTRAINT, _TABLE, type_="unique")
+    op.create_unique_constraint(
+        _CONSTRAINT, _TABLE, _COLUMNS, postgresql_nulls_not_distinct=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint(_CONSTRAINT, _TABLE, type_="unique")
+    op.create_unique_constraint(_CONSTRAINT, _TABLE, _COLUMNS)
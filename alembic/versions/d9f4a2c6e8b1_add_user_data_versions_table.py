@@ -0,0 +1,47 @@
+"""add user data versions table
+
+Revision ID: d9f4a2c6e8b1
+Revises: c7e2b5d9a1f3
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d9f4a2c6e8b1"
+down_revision: Union[str, Sequence[str], None] = "c7e2b5d9a1f3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    if "user_data_versions" not in set(inspector.get_table_names()):
+        op.create_table(
+            "user_data_versions",
+            sa.Column(
+                "user_id",
+                sa.String(),
+                sa.ForeignKey("users.user_id"),
+                primary_key=True,
+                nullable=False,
+            ),
+            sa.Column("version", sa.BigInteger(), nullable=False),
+            sa.Column(
+                "updated_at",
+                sa.DateTime(timezone=True),
+                server_default=sa.text("now()"),
+                nullable=False,
+            ),
+        )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS user_data_versions")
@@ -0,0 +1,42 @@
+"""add user evaluation status table
+
+Revision ID: e3b8c1f5a7d2
+Revises: d9f4a2c6e8b1
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e3b8c1f5a7d2"
+down_revision: Union[str, Sequence[str], None] = "d9f4a2c6e8b1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    if "user_evaluation_status" not in set(inspector.get_table_names()):
+        op.create_table(
+            "user_evaluation_status",
+            sa.Column(
+                "user_id",
+                sa.String(),
+                sa.ForeignKey("users.user_id"),
+                primary_key=True,
+                nullable=False,
+            ),
+            sa.Column("last_evaluated_at", sa.DateTime(timezone=True), nullable=False),
+            sa.Column("evaluated_version", sa.BigInteger(), nullable=False),
+        )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS user_evaluation_status")
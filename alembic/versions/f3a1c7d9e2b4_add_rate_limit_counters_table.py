@@ -0,0 +1,43 @@
+"""add rate limit counters table
+
+Revision ID: f3a1c7d9e2b4
+Revises: b6c3f9b2e4d1
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f3a1c7d9e2b4"
+down_revision: Union[str, Sequence[str], None] = "b6c3f9b2e4d1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    if "rate_limit_counters" not in set(inspector.get_table_names()):
+        op.create_table(
+            "rate_limit_counters",
+            sa.Column("key", sa.String(), primary_key=True, nullable=False),
+            sa.Column("count", sa.Integer(), nullable=False),
+            sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        )
+        op.create_index(
+            "ix_rate_limit_counters_expires_at",
+            "rate_limit_counters",
+            ["expires_at"],
+            unique=False,
+        )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_rate_limit_counters_expires_at")
+    op.execute("DROP TABLE IF EXISTS rate_limit_counters")
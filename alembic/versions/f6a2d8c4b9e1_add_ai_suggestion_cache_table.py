@@ -0,0 +1,36 @@
+"""add ai suggestion cache table
+
+Revision ID: f6a2d8c4b9e1
+Revises: e3b8c1f5a7d2
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f6a2d8c4b9e1"
+down_revision: Union[str, Sequence[str], None] = "e3b8c1f5a7d2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    if "ai_suggestion_cache" not in set(inspector.get_table_names()):
+        op.create_table(
+            "ai_suggestion_cache",
+            sa.Column("fingerprint", sa.String(length=64), primary_key=True, nullable=False),
+            sa.Column("suggestions", sa.JSON(), nullable=False),
+            sa.Column("generated_at", sa.DateTime(timezone=True), nullable=False),
+        )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS ai_suggestion_cache")
@@ -1,4 +1,6 @@
 from fastapi import APIRouter
+
+from app.config import settings
 from .auth import router as auth_router
 from .bank import router as bank_router
 from .bank_sync_status import router as bank_sync_status_router
@@ -14,6 +16,7 @@ from .rewards import router as rewards_router  # Import the new rewards router
 from .ai_predictions import router as ai_predictions_router
 from .timeline import router as timeline_router
 from .vouchers import router as vouchers_router
+from .ops import router as ops_router
 
 api_router = APIRouter()
 
@@ -37,5 +40,7 @@ api_router.include_router(
     rewards_router, prefix="/rewards", tags=["rewards"]
 )  # Include the new rewards router
 api_router.include_router(timeline_router, prefix="", tags=["timeline"])
+if settings.OPS_ENDPOINTS_ENABLED:
+    api_router.include_router(ops_router, prefix="/ops", tags=["ops"])
 
 __all__ = ["api_router"]
@@ -9,6 +9,7 @@ from app.services.stock_predictions import (
     predict_for_user_instruments,
 )
 from app.utils.rate_limit import limiter
+from app.utils.http_cache import VersionedResponse
 
 router = APIRouter()
 
@@ -23,7 +24,13 @@ def get_latest_budget_predictions(
     """
     Fetch the latest stored budget predictions for the authenticated user.
     """
-    user_id = current_user.user_id
+    cached = VersionedResponse(request, db, current_user.user_id)
+    if cached.hit is not None:
+        return cached.hit
+    return cached.render(build_latest_budget_predictions(db, current_user.user_id))
+
+
+def build_latest_budget_predictions(db: Session, user_id: str) -> list[BudgetPrediction]:
     predictions = get_latest_predictions_for_user(db, user_id)
     if not predictions:
         raise HTTPException(
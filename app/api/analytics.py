@@ -1,15 +1,37 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 from typing import List
+import numpy as np
 import pandas as pd
 from datetime import datetime, timezone
-from decimal import Decimal
 
-from app import crud, schemas
+from app import schemas
 from app.utils.deps import get_db, get_current_user
+from app.utils.http_cache import VersionedResponse
+from app.utils.serialization import (
+    data_points,
+    line_series,
+    money,
+    to_columnar,
+    to_jsonable,
+)
 from app.models.user import User
 from app.models.bank import BankAccount
+from app.services.analytics_engine import (
+    CREDIT,
+    DEBIT,
+    build_analytics_pivots,
+    month_code,
+    month_labels,
+    week_labels,
+)
+from app.services.analytics_queries import get_window_spend_class_totals
+from app.services.transaction_frame_cache import (
+    get_account_frame,
+    get_window_day_totals_from_frame,
+)
+from app.services.spend_classifier import DISCRETIONARY, NON_DISCRETIONARY
 
 router = APIRouter()
 
@@ -34,6 +56,7 @@ def _get_user_nabil_account(db: Session, user_id: str) -> BankAccount:
 
 @router.get("/", response_model=schemas.AnalyticsResponse)
 def get_financial_analytics(
+    request: Request,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
     time_horizon: str | None = Query(
@@ -49,17 +72,40 @@ def get_financial_analytics(
         None,
         description="ISO end date for analytics filter (e.g. 2025-12-31T18:14:59.999Z)",
     ),
+    response_format: str | None = Query(
+        None,
+        alias="format",
+        pattern="^columnar$",
+        description="'columnar' returns chart series as parallel labels/values arrays",
+    ),
 ):
+    cached = VersionedResponse(request, db, current_user.user_id)
+    if cached.hit is not None:
+        return cached.hit
+    result = build_financial_analytics(
+        db, current_user, time_horizon, year, startDate, endDate
+    )
+    if response_format == "columnar":
+        result = to_columnar(result, schemas.AnalyticsResponse)
+    return cached.render(result)
+
+
+def build_financial_analytics(
+    db: Session,
+    current_user: User,
+    time_horizon: str | None = None,
+    year: int | None = None,
+    startDate: str | None = None,
+    endDate: str | None = None,
+) -> dict:
+    """AnalyticsResponse as a JSON-ready dict."""
     db_bank_account = _get_user_nabil_account(db, current_user.user_id)
     external_id = db_bank_account.external_account_id
 
-    # Fetch transactions using internal id
-    transactions = crud.get_transactions_by_account(
-        db=db, account_id=db_bank_account.id
-    )
+    frame = get_account_frame(db, current_user.user_id, db_bank_account.id)
 
-    if not transactions:
-        return schemas.AnalyticsResponse(
+    if not len(frame):
+        empty = schemas.AnalyticsResponse(
             yearlyTransactionData=[],
             monthlyTransactionData=[],
             weeklyTransactionData=[],
@@ -74,25 +120,7 @@ def get_financial_analytics(
             momGrowth=[],
             momGrowthSeries=[],
         )
-
-    # Convert to DataFrame safely
-    df = pd.DataFrame(
-        [
-            {
-                "id": t.id,
-                "amount": float(t.amount),
-                "type": t.type,
-                "category": t.category,
-                "description": t.description,
-                "merchant": t.merchant,
-                "date": t.date,
-            }
-            for t in transactions
-        ]
-    )
-
-    df["date"] = pd.to_datetime(df["date"]).dt.tz_convert(timezone.utc)
-    df["amount"] = df["amount"].astype(float)
+        return to_jsonable(empty)
 
     # Use timezone-aware UTC for all date operations
     now = pd.Timestamp(datetime.now(timezone.utc))
@@ -124,8 +152,10 @@ def get_financial_analytics(
         )
     elif normalized_horizon in {"", "1y", "year", "all", "all_years"}:
         # No explicit selection defaults to all available years in data.
-        start_date = df["date"].min()
-        end_date = df["date"].max()
+        start_date = pd.Timestamp(frame.first_day, tz=timezone.utc)
+        end_date = pd.Timestamp(frame.last_day, tz=timezone.utc) + pd.Timedelta(
+            days=1, microseconds=-1
+        )
     elif normalized_horizon in {"3m", "90d"}:
         end_date = now
         start_date = end_date - pd.DateOffset(months=3)
@@ -144,267 +174,97 @@ def get_financial_analytics(
             status_code=400, detail="endDate must be on or after startDate"
         )
 
-    # Filter for the selected unified horizon.
-    df_window = df[(df["date"] >= start_date) & (df["date"] <= end_date)].copy()
+    # Whole days come from the cached daily frame (partial edge days are summed
+    # in Postgres); one columnar pass then builds every period/category pivot
+    # the charts below read from.
+    window_start = start_date.to_pydatetime()
+    window_end = end_date.to_pydatetime()
+    day_totals = get_window_day_totals_from_frame(
+        db, frame, db_bank_account.id, start_date, end_date
+    )
+    pivots = build_analytics_pivots(
+        day_totals["day"],
+        day_totals["type"],
+        day_totals["category"],
+        day_totals["amount"],
+    )
 
     # --- Helper Functions ---
-    def format_data_for_chart(series):
-        # This function now expects a series with a pre-formatted string index
+    # Charts are built as JSON-ready dicts with amounts formatted in bulk; the
+    # strings match the "%.2f" Decimal serialization of the response model.
+    def format_line_series_data(labels, income_values, expense_values, prefix):
         return [
-            schemas.DataPoint(label=str(label), value=round(Decimal(value), 2))
-            for label, value in series.items()
+            line_series(f"{prefix}_income", labels, income_values),
+            line_series(f"{prefix}_expense", labels, expense_values),
         ]
 
-    def format_line_series_data(groups, prefix):
-        income_points = []
-        expense_points = []
-        for label, group in groups:
-            income = group[group["type"] == "CREDIT"]["amount"].sum()
-            expense = group[group["type"] == "DEBIT"]["amount"].sum()
-            income_points.append(
-                schemas.LineSeriesDataPoint(x=str(label), y=round(Decimal(income), 2))
-            )
-            expense_points.append(
-                schemas.LineSeriesDataPoint(x=str(label), y=round(Decimal(expense), 2))
-            )
-        return [
-            schemas.LineSeries(id=f"{prefix}_income", data=income_points),
-            schemas.LineSeries(id=f"{prefix}_expense", data=expense_points),
-        ]
-
-    def pct_growth(current: float, previous: float) -> Decimal | None:
+    def pct_growth(current: float, previous: float) -> str | None:
         if previous == 0:
             return None
-        return round(Decimal(((current - previous) / previous) * 100), 2)
-
-    def classify_discretionary(row) -> str:
-        text = " ".join(
-            [
-                str(row.get("category") or ""),
-                str(row.get("description") or ""),
-                str(row.get("merchant") or ""),
-            ]
-        ).lower()
-
-        non_discretionary_keywords = {
-            "utility",
-            "electricity",
-            "water",
-            "gas",
-            "internet",
-            "rent",
-            "maintenance",
-            "insurance",
-            "medical",
-            "hospital",
-            "pharmacy",
-            "school",
-            "education",
-            "tuition",
-            "loan",
-            "emi",
-            "debt",
-            "grocer",
-            "grocery",
-            "supermarket",
-        }
-
-        discretionary_keywords = {
-            "dining",
-            "restaurant",
-            "cafe",
-            "coffee",
-            "entertainment",
-            "movie",
-            "shopping",
-            "fashion",
-            "taxi",
-            "ride",
-            "travel",
-            "fuel",
-            "gym",
-            "subscription",
-            "delivery",
-            "snack",
-            "fast food",
-            "food",
-            "transport",
-        }
-
-        if any(keyword in text for keyword in non_discretionary_keywords):
-            return "non_discretionary"
-
-        if any(keyword in text for keyword in discretionary_keywords):
-            return "discretionary"
-
-        category = str(row.get("category") or "").lower().strip()
-        needs_categories = {
-            "utilities",
-            "maintenance",
-            "rent",
-            "insurance",
-            "healthcare",
-            "education",
-            "groceries",
-        }
-
-        if category in needs_categories:
-            return "non_discretionary"
-
-        return "discretionary"
-
-    # --- Monthly Data Calculation ---
-    if year is not None:
-        df_monthly = df_window
-        # Create labels for all months in the selected year
-        all_months_labels = [
-            pd.Timestamp(year=year, month=m, day=1).strftime("%b %Y")
-            for m in range(1, 13)
-        ]
-    else:
-        df_monthly = df_window
-        labels_start = pd.Timestamp(start_date).replace(
-            day=1, hour=0, minute=0, second=0, microsecond=0
-        )
-        labels_end = pd.Timestamp(end_date).replace(
-            day=1, hour=0, minute=0, second=0, microsecond=0
-        )
-        # Use months fully covering the selected window.
-        all_months_labels = (
-            pd.date_range(start=labels_start, end=labels_end, freq="MS")
-            .strftime("%b %Y")
-            .tolist()
-        )
-
-    def process_monthly_data(series, labels):
-        # Reindex to include all 12 months, filling missing ones with 0
-        series = series.reindex(labels, fill_value=0)
-        return series
-
-    # --- Transaction (Debit) Data ---
-    yearly_transactions = (
-        df_window[df_window["type"] == "DEBIT"]
-        .groupby(df_window["date"].dt.year)["amount"]
-        .sum()
-    )
+        return money(((current - previous) / previous) * 100)
 
-    # Group by 'Month YYYY' string format
+    # --- Period Labels ---
+    # Months covering the window (or all 12 months of the selected year).
     if year is not None:
-        monthly_transactions_series = (
-            df_monthly[df_monthly["type"] == "DEBIT"]
-            .groupby(df_monthly["date"].dt.strftime("%b %Y"))["amount"]
-            .sum()
-        )
+        first_month = month_code(year, 1)
+        last_month = month_code(year, 12)
     else:
-        monthly_transactions_series = (
-            df_window[df_window["type"] == "DEBIT"]
-            .groupby(df_window["date"].dt.strftime("%b %Y"))["amount"]
-            .sum()
-        )
-    monthly_transactions = process_monthly_data(
-        monthly_transactions_series, all_months_labels
-    )
+        first_month = month_code(start_date.year, start_date.month)
+        last_month = month_code(end_date.year, end_date.month)
+    window_month_codes = np.arange(first_month, last_month + 1)
+    all_months_labels = month_labels(window_month_codes)
 
-    weekly_transactions = (
-        df_window[df_window["type"] == "DEBIT"]
-        .groupby(df_window["date"].dt.strftime("%G-W%V"))["amount"]
-        .sum()
+    # --- Transaction (Debit) Data ---
+    debit_years, debit_year_totals = pivots.yearly.column(DEBIT, present_only=True)
+    yearly_transactions = data_points(debit_years, debit_year_totals)
+    monthly_expense = pivots.monthly.lookup(window_month_codes, DEBIT)
+    monthly_transactions = data_points(all_months_labels, monthly_expense)
+    debit_weeks, debit_week_totals = pivots.weekly.column(DEBIT, present_only=True)
+    weekly_transactions = data_points(
+        week_labels(debit_weeks), debit_week_totals
     )
 
     # --- Balance (Credit) Data ---
-    yearly_balance = (
-        df_window[df_window["type"] == "CREDIT"]
-        .groupby(df_window["date"].dt.year)["amount"]
-        .sum()
-    )
-
-    if year is not None:
-        monthly_balance_series = (
-            df_monthly[df_monthly["type"] == "CREDIT"]
-            .groupby(df_monthly["date"].dt.strftime("%b %Y"))["amount"]
-            .sum()
-        )
-    else:
-        monthly_balance_series = (
-            df_window[df_window["type"] == "CREDIT"]
-            .groupby(df_window["date"].dt.strftime("%b %Y"))["amount"]
-            .sum()
-        )
-    monthly_balance = process_monthly_data(monthly_balance_series, all_months_labels)
-
-    weekly_balance = (
-        df_window[df_window["type"] == "CREDIT"]
-        .groupby(df_window["date"].dt.strftime("%G-W%V"))["amount"]
-        .sum()
+    credit_years, credit_year_totals = pivots.yearly.column(CREDIT, present_only=True)
+    yearly_balance = data_points(credit_years, credit_year_totals)
+    monthly_income = pivots.monthly.lookup(window_month_codes, CREDIT)
+    monthly_balance = data_points(all_months_labels, monthly_income)
+    credit_weeks, credit_week_totals = pivots.weekly.column(CREDIT, present_only=True)
+    weekly_balance = data_points(
+        week_labels(credit_weeks), credit_week_totals
     )
 
     # --- Line Series ---
     yearlyLineSeries = format_line_series_data(
-        df_window.groupby(df_window["date"].dt.year), "yearly"
+        pivots.yearly.codes,
+        pivots.yearly.totals[:, CREDIT],
+        pivots.yearly.totals[:, DEBIT],
+        "yearly",
     )
-
-    # Monthly Line Series
-    # Monthly line series uses the same unified selected window.
-    df_last_12_months = df_window.copy()
-
-    monthly_income_series = (
-        df_last_12_months[df_last_12_months["type"] == "CREDIT"]
-        .groupby(df_last_12_months["date"].dt.strftime("%b %Y"))["amount"]
-        .sum()
+    monthlyLineSeries = format_line_series_data(
+        all_months_labels, monthly_income, monthly_expense, "monthly"
     )
-    monthly_income = process_monthly_data(monthly_income_series, all_months_labels)
-
-    monthly_expense_series = (
-        df_last_12_months[df_last_12_months["type"] == "DEBIT"]
-        .groupby(df_last_12_months["date"].dt.strftime("%b %Y"))["amount"]
-        .sum()
+    weeklyLineSeries = format_line_series_data(
+        week_labels(pivots.weekly.codes),
+        pivots.weekly.totals[:, CREDIT],
+        pivots.weekly.totals[:, DEBIT],
+        "weekly",
     )
-    monthly_expense = process_monthly_data(monthly_expense_series, all_months_labels)
-
-    income_points = [
-        schemas.LineSeriesDataPoint(x=str(label), y=round(Decimal(value), 2))
-        for label, value in monthly_income.items()
-    ]
-    expense_points = [
-        schemas.LineSeriesDataPoint(x=str(label), y=round(Decimal(value), 2))
-        for label, value in monthly_expense.items()
-    ]
-
-    monthlyLineSeries = [
-        schemas.LineSeries(id="monthly_income", data=income_points),
-        schemas.LineSeries(id="monthly_expense", data=expense_points),
-    ]
-
-    df_weekly = df_window.copy()
-    df_weekly["year_week"] = df_weekly["date"].dt.strftime("%G-W%V")
-    weeklyLineSeries = format_line_series_data(df_weekly.groupby("year_week"), "weekly")
 
     # --- Pie Charts ---
     pieExpense = [
-        schemas.PieChartData(
-            id=category, label=category, value=round(Decimal(amount), 2)
-        )
-        for category, amount in df_window[df_window["type"] == "DEBIT"]
-        .groupby("category")["amount"]
-        .sum()
-        .nlargest(5)
-        .items()
+        {"id": category, "label": category, "value": money(amount)}
+        for category, amount in pivots.top_categories(DEBIT, 5)
     ]
 
     pieIncome = [
-        schemas.PieChartData(
-            id=category, label=category, value=round(Decimal(amount), 2)
-        )
-        for category, amount in df_window[df_window["type"] == "CREDIT"]
-        .groupby("category")["amount"]
-        .sum()
-        .nlargest(5)
-        .items()
+        {"id": category, "label": category, "value": money(amount)}
+        for category, amount in pivots.top_categories(CREDIT, 5)
     ]
 
     # --- New Advisor-Focused Charts ---
-    total_income = float(df_window[df_window["type"] == "CREDIT"]["amount"].sum())
-    total_expense = float(df_window[df_window["type"] == "DEBIT"]["amount"].sum())
+    total_income = pivots.total_income
+    total_expense = pivots.total_expense
     ratio_pct = (total_expense / total_income * 100) if total_income > 0 else 0.0
 
     if ratio_pct >= 90:
@@ -417,49 +277,33 @@ def get_financial_analytics(
         gauge_zone = "healthy"
         gauge_insight = "Expense-to-income ratio is in a healthier range with better room for savings."
 
-    expense_income_gauge = schemas.ExpenseIncomeGauge(
-        totalIncome=round(Decimal(total_income), 2),
-        totalExpenses=round(Decimal(total_expense), 2),
-        expenseToIncomeRatioPct=round(Decimal(ratio_pct), 2),
-        zone=gauge_zone,
-        advisorInsight=gauge_insight,
-    )
-
-    trend_start = pd.Timestamp(start_date).replace(
-        day=1, hour=0, minute=0, second=0, microsecond=0
-    )
-    trend_end = pd.Timestamp(end_date)
-    if trend_end.tzinfo is None:
-        trend_end = trend_end.tz_localize(timezone.utc)
-
-    df_trend = df_window.copy()
-    month_labels = (
-        pd.date_range(start=trend_start, end=trend_end, freq="MS")
-        .strftime("%b %Y")
-        .tolist()
-    )
-
-    monthly_income_for_growth = (
-        df_trend[df_trend["type"] == "CREDIT"]
-        .groupby(df_trend["date"].dt.strftime("%b %Y"))["amount"]
-        .sum()
-        .reindex(month_labels, fill_value=0)
-    )
-    monthly_expense_for_growth = (
-        df_trend[df_trend["type"] == "DEBIT"]
-        .groupby(df_trend["date"].dt.strftime("%b %Y"))["amount"]
-        .sum()
-        .reindex(month_labels, fill_value=0)
+    expense_income_gauge = {
+        "totalIncome": money(total_income),
+        "totalExpenses": money(total_expense),
+        "expenseToIncomeRatioPct": money(ratio_pct),
+        "zone": gauge_zone,
+        "advisorInsight": gauge_insight,
+    }
+
+    # Growth and savings-rate charts cover the months spanned by the window.
+    trend_month_codes = np.arange(
+        month_code(start_date.year, start_date.month),
+        month_code(end_date.year, end_date.month) + 1,
     )
+    trend_labels = month_labels(trend_month_codes)
+    monthly_income_for_growth = pivots.monthly.lookup(trend_month_codes, CREDIT).tolist()
+    monthly_expense_for_growth = pivots.monthly.lookup(
+        trend_month_codes, DEBIT
+    ).tolist()
 
     mom_growth = []
     income_growth_points = []
     expense_growth_points = []
     previous_income = None
     previous_expense = None
-    for label in month_labels:
-        income_val = float(monthly_income_for_growth[label])
-        expense_val = float(monthly_expense_for_growth[label])
+    for label, income_val, expense_val in zip(
+        trend_labels, monthly_income_for_growth, monthly_expense_for_growth
+    ):
 
         income_growth = (
             pct_growth(income_val, previous_income)
@@ -473,50 +317,35 @@ def get_financial_analytics(
         )
 
         mom_growth.append(
-            schemas.MoMGrowthPoint(
-                label=label,
-                income=round(Decimal(income_val), 2),
-                expense=round(Decimal(expense_val), 2),
-                incomeGrowthPct=income_growth,
-                expenseGrowthPct=expense_growth,
-            )
+            {
+                "label": label,
+                "income": money(income_val),
+                "expense": money(expense_val),
+                "incomeGrowthPct": income_growth,
+                "expenseGrowthPct": expense_growth,
+            }
         )
 
         income_growth_points.append(
-            schemas.LineSeriesDataPoint(
-                x=label,
-                y=income_growth if income_growth is not None else Decimal("0.00"),
-            )
+            {"x": label, "y": income_growth if income_growth is not None else "0.00"}
         )
         expense_growth_points.append(
-            schemas.LineSeriesDataPoint(
-                x=label,
-                y=expense_growth if expense_growth is not None else Decimal("0.00"),
-            )
+            {"x": label, "y": expense_growth if expense_growth is not None else "0.00"}
         )
 
         previous_income = income_val
         previous_expense = expense_val
 
     mom_growth_series = [
-        schemas.LineSeries(id="mom_income_growth_pct", data=income_growth_points),
-        schemas.LineSeries(id="mom_expense_growth_pct", data=expense_growth_points),
+        {"id": "mom_income_growth_pct", "data": income_growth_points},
+        {"id": "mom_expense_growth_pct", "data": expense_growth_points},
     ]
 
-    debit_df = df_window[df_window["type"] == "DEBIT"].copy()
-    if debit_df.empty:
-        discretionary_total = 0.0
-        non_discretionary_total = 0.0
-    else:
-        debit_df["discretionary_group"] = debit_df.apply(classify_discretionary, axis=1)
-        discretionary_total = float(
-            debit_df[debit_df["discretionary_group"] == "discretionary"]["amount"].sum()
-        )
-        non_discretionary_total = float(
-            debit_df[debit_df["discretionary_group"] == "non_discretionary"][
-                "amount"
-            ].sum()
-        )
+    spend_class_totals = get_window_spend_class_totals(
+        db, db_bank_account.id, window_start, window_end
+    )
+    discretionary_total = spend_class_totals[DISCRETIONARY]
+    non_discretionary_total = spend_class_totals[NON_DISCRETIONARY]
 
     total_split = discretionary_total + non_discretionary_total
     discretionary_ratio = (
@@ -526,58 +355,58 @@ def get_financial_analytics(
         (non_discretionary_total / total_split) * 100 if total_split > 0 else 0.0
     )
 
-    discretionary_split = schemas.DiscretionarySplit(
-        discretionary=round(Decimal(discretionary_total), 2),
-        nonDiscretionary=round(Decimal(non_discretionary_total), 2),
-        discretionaryRatioPct=round(Decimal(discretionary_ratio), 2),
-        nonDiscretionaryRatioPct=round(Decimal(non_discretionary_ratio), 2),
-        segments=[
-            schemas.DiscretionarySplitSegment(
-                id="discretionary",
-                label="Wants",
-                value=round(Decimal(discretionary_total), 2),
-            ),
-            schemas.DiscretionarySplitSegment(
-                id="non_discretionary",
-                label="Needs",
-                value=round(Decimal(non_discretionary_total), 2),
-            ),
+    discretionary_split = {
+        "discretionary": money(discretionary_total),
+        "nonDiscretionary": money(non_discretionary_total),
+        "discretionaryRatioPct": money(discretionary_ratio),
+        "nonDiscretionaryRatioPct": money(non_discretionary_ratio),
+        "segments": [
+            {
+                "id": "discretionary",
+                "label": "Wants",
+                "value": money(discretionary_total),
+            },
+            {
+                "id": "non_discretionary",
+                "label": "Needs",
+                "value": money(non_discretionary_total),
+            },
         ],
-        advisorInsight=(
+        "advisorInsight": (
             "A higher Wants share indicates more flexible spend that can be trimmed without affecting essentials."
             if discretionary_ratio >= 50
             else "Most spend is concentrated in Needs, so savings gains may require structural optimization."
         ),
-    )
+    }
 
     savings_rate_points = []
-    for label in month_labels:
-        income_val = float(monthly_income_for_growth[label])
-        expense_val = float(monthly_expense_for_growth[label])
+    for label, income_val, expense_val in zip(
+        trend_labels, monthly_income_for_growth, monthly_expense_for_growth
+    ):
         net_val = income_val - expense_val
         savings_rate = (net_val / income_val * 100) if income_val > 0 else 0.0
 
         savings_rate_points.append(
-            schemas.SavingsRatePoint(
-                label=label,
-                income=round(Decimal(income_val), 2),
-                expense=round(Decimal(expense_val), 2),
-                netSavings=round(Decimal(net_val), 2),
-                savingsRatePct=round(Decimal(savings_rate), 2),
-            )
+            {
+                "label": label,
+                "income": money(income_val),
+                "expense": money(expense_val),
+                "netSavings": money(net_val),
+                "savingsRatePct": money(savings_rate),
+            }
         )
 
-    total_surplus = sum(float(point.netSavings) for point in savings_rate_points)
+    total_surplus = sum(float(point["netSavings"]) for point in savings_rate_points)
     avg_savings_rate = (
-        sum(float(point.savingsRatePct) for point in savings_rate_points)
+        sum(float(point["savingsRatePct"]) for point in savings_rate_points)
         / len(savings_rate_points)
         if savings_rate_points
         else 0.0
     )
 
     if len(savings_rate_points) >= 2:
-        rate_delta = float(savings_rate_points[-1].savingsRatePct) - float(
-            savings_rate_points[0].savingsRatePct
+        rate_delta = float(savings_rate_points[-1]["savingsRatePct"]) - float(
+            savings_rate_points[0]["savingsRatePct"]
         )
     else:
         rate_delta = 0.0
@@ -592,13 +421,13 @@ def get_financial_analytics(
         savings_trend = "stable"
         savings_insight = "Savings rate trend is stable. Consistent control of variable expenses can lift this further."
 
-    savings_rate_trend = schemas.SavingsRateTrend(
-        points=savings_rate_points,
-        totalNetSurplus=round(Decimal(total_surplus), 2),
-        avgSavingsRatePct=round(Decimal(avg_savings_rate), 2),
-        trend=savings_trend,
-        advisorInsight=savings_insight,
-    )
+    savings_rate_trend = {
+        "points": savings_rate_points,
+        "totalNetSurplus": money(total_surplus),
+        "avgSavingsRatePct": money(avg_savings_rate),
+        "trend": savings_trend,
+        "advisorInsight": savings_insight,
+    }
 
     # --- Freshness Metadata ---
     from app.crud.bank_sync_status import get_sync_status
@@ -612,7 +441,9 @@ def get_financial_analytics(
     if sync_status:
         last_successful_sync = sync_status.last_successful_sync
         last_attempted_sync = sync_status.last_attempted_sync
-        sync_status_value = sync_status.sync_status
+        sync_status_value = getattr(
+            sync_status.sync_status, "value", sync_status.sync_status
+        )
         failure_reason = sync_status.failure_reason
         from datetime import date
 
@@ -626,26 +457,27 @@ def get_financial_analytics(
             last_successful_sync = last_successful_sync.isoformat()
         if last_attempted_sync is not None:
             last_attempted_sync = last_attempted_sync.isoformat()
-    return schemas.AnalyticsResponse(
-        yearlyTransactionData=format_data_for_chart(yearly_transactions),
-        monthlyTransactionData=format_data_for_chart(monthly_transactions),
-        weeklyTransactionData=format_data_for_chart(weekly_transactions),
-        yearlyBalanceData=format_data_for_chart(yearly_balance),
-        monthlyBalanceData=format_data_for_chart(monthly_balance),
-        weeklyBalanceData=format_data_for_chart(weekly_balance),
-        yearlyLineSeries=yearlyLineSeries,
-        monthlyLineSeries=monthlyLineSeries,
-        weeklyLineSeries=weeklyLineSeries,
-        pieExpense=pieExpense,
-        pieIncome=pieIncome,
-        expenseIncomeGauge=expense_income_gauge,
-        momGrowth=mom_growth,
-        momGrowthSeries=mom_growth_series,
-        discretionarySplit=discretionary_split,
-        savingsRateTrend=savings_rate_trend,
-        is_data_fresh=is_data_fresh,
-        last_successful_sync=last_successful_sync,
-        last_attempted_sync=last_attempted_sync,
-        sync_status=sync_status_value,
-        failure_reason=failure_reason,
-    )
+    # Same keys, order and value formatting as AnalyticsResponse serializes to.
+    return {
+        "yearlyTransactionData": yearly_transactions,
+        "monthlyTransactionData": monthly_transactions,
+        "weeklyTransactionData": weekly_transactions,
+        "yearlyBalanceData": yearly_balance,
+        "monthlyBalanceData": monthly_balance,
+        "weeklyBalanceData": weekly_balance,
+        "yearlyLineSeries": yearlyLineSeries,
+        "monthlyLineSeries": monthlyLineSeries,
+        "weeklyLineSeries": weeklyLineSeries,
+        "pieExpense": pieExpense,
+        "pieIncome": pieIncome,
+        "expenseIncomeGauge": expense_income_gauge,
+        "momGrowth": mom_growth,
+        "momGrowthSeries": mom_growth_series,
+        "discretionarySplit": discretionary_split,
+        "savingsRateTrend": savings_rate_trend,
+        "is_data_fresh": is_data_fresh,
+        "last_successful_sync": last_successful_sync,
+        "last_attempted_sync": last_attempted_sync,
+        "sync_status": sync_status_value,
+        "failure_reason": failure_reason,
+    }
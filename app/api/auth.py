@@ -7,7 +7,6 @@ from fastapi import (
     File,
     Request,
 )
-from app.crud.budget import update_completed_budgets_for_user
 from app.services.reward_evaluation import evaluate_rewards
 from app.crud import (
     create_user,
@@ -46,10 +45,10 @@ from app.utils.deps import (
 from sqlalchemy.orm import Session
 from app.utils.auth import (
     create_temp_token,
-    verify_password,
+    verify_password_async,
     create_access_token,
     create_refresh_token,
-    get_password_hash,
+    get_password_hash_async,
 )
 from app.utils.email import send_otp_email
 import random
@@ -127,7 +126,9 @@ async def login_user(
     db: Session = Depends(get_db),
 ):
     user = get_user_by_email(db, email=user_login.email)
-    if not user or not verify_password(user_login.password, user.hashed_password):
+    if not user or not await verify_password_async(
+        user_login.password, user.hashed_password
+    ):
         raise HTTPException(
             status_code=400,
             detail="Incorrect email or password",
@@ -175,7 +176,7 @@ async def request_otp(
     db: Session = Depends(get_db),
 ):
     otp_code = "".join(random.choices(string.digits, k=6))
-    hashed_otp = get_password_hash(otp_code)
+    hashed_otp = await get_password_hash_async(otp_code)
 
     # If existing OTP for same purpose, delete it first
     existing_otp = get_otp_by_user_id(
@@ -216,13 +217,12 @@ async def verify_otp(
         delete_otp(db, db_otp)
         raise HTTPException(status_code=400, detail="OTP has expired.")
 
-    if not verify_password(otp_data.code, db_otp.code):
+    if not await verify_password_async(otp_data.code, db_otp.code):
         raise HTTPException(status_code=400, detail="Invalid OTP.")
 
     set_otp_as_used(db, db_otp)
 
-    # Update completed budgets and evaluate rewards
-    update_completed_budgets_for_user(db=db, user_id=current_user.user_id)
+    # Expired budgets are closed by the nightly close-out job.
     evaluate_rewards(db=db, user=current_user)
 
     if otp_data.purpose == OtpPurpose.ACCOUNT_VERIFICATION:
@@ -266,7 +266,7 @@ async def reset_password(
     current_user: User = Depends(get_current_user_from_reset_token),
     db: Session = Depends(get_db),
 ):
-    hashed_password = get_password_hash(password_data.new_password)
+    hashed_password = await get_password_hash_async(password_data.new_password)
     update_user_password(db, user_id=current_user.user_id, new_password=hashed_password)
     return {"message": "Password has been reset successfully."}
 
@@ -282,7 +282,7 @@ async def create_new_user(
     if db_user:
         raise HTTPException(status_code=400, detail="Email already registered")
 
-    user.password = get_password_hash(user.password)
+    user.password = await get_password_hash_async(user.password)
     new_user = create_user(db=db, user=user)
 
     token_data = {"id": new_user.user_id, "token_type": "temp"}
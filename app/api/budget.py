@@ -10,6 +10,8 @@ from app.schemas.budget import (
     BudgetGoalAdaptiveAdjustment,
     BudgetGoalPeriodReview,
     BudgetGoalPredictionExplanation,
+    BudgetGoalSimulationGridRequest,
+    BudgetGoalSimulationGridResult,
     BudgetGoalSimulationRequest,
     BudgetGoalSimulationResult,
     BudgetGoalStatus,
@@ -23,6 +25,7 @@ from app.services.budget_goal_intelligence import (
     get_budget_period_review,
     get_budget_prediction_explanation,
     simulate_budget_goal,
+    simulate_budget_goal_grid,
 )
 
 router = APIRouter()
@@ -139,6 +142,30 @@ def simulate_budget_goal_outcome(
     return simulation
 
 
+@router.post(
+    "/{budget_id}/simulate/grid", response_model=BudgetGoalSimulationGridResult
+)
+def simulate_budget_goal_grid_outcome(
+    budget_id: str,
+    payload: BudgetGoalSimulationGridRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    simulation = simulate_budget_goal_grid(
+        db,
+        current_user.user_id,
+        budget_id,
+        payload.reduction_percents,
+        payload.daily_caps,
+    )
+    if not simulation:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Budget not found",
+        )
+    return simulation
+
+
 @router.get("/{budget_id}/suggestions", response_model=BudgetGoalSuggestionsResponse)
 def get_goal_suggestions(
     budget_id: str,
@@ -1,17 +1,19 @@
+import asyncio
+import logging
+from contextvars import ContextVar
 from datetime import datetime, timezone
 from decimal import Decimal
 
-import httpx
 import pandas as pd
 from dateutil.relativedelta import relativedelta
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from app import crud
 from app.config.settings import settings
-from app.crud.budget import update_completed_budgets_for_user
 from app.crud.stock_instrument import get_stock_instruments_by_user
+from app.db.session import SessionLocal
 from app.models.bank import BankAccount
 from app.models.user import User
 from app.schemas.dashboard import (
@@ -26,11 +28,22 @@ from app.schemas.dashboard import (
     StockItem,
     SummaryData,
 )
-from app.services.reward_evaluation import evaluate_rewards
+from app.services.ai_suggestions import build_fallback_suggestions, get_ai_suggestions
+from app.services.analytics_engine import rolling_month_window
 from app.services.budget_goal_intelligence import get_all_budget_goal_statuses
+from app.services.transaction_frame_cache import get_account_frame
+from app.services.user_evaluation import is_evaluation_stale, request_user_evaluation
 from app.utils.deps import get_current_user, get_db
+from app.utils.http_cache import VersionedResponse
+from app.utils.serialization import to_columnar, to_jsonable
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# Names of sections served from a fallback while building the current response.
+_degraded_sections: ContextVar[set[str] | None] = ContextVar(
+    "dashboard_degraded_sections", default=None
+)
 
 
 def _get_user_nabil_account(db: Session, user_id: str) -> BankAccount:
@@ -55,82 +68,6 @@ def _to_decimal_str(value: float | Decimal) -> str:
     return f"{Decimal(str(value)):.2f}"
 
 
-def _build_fallback_suggestions(
-    top_expense_categories: list[tuple[str, float]],
-) -> list[AISuggestionItem]:
-    suggestions: list[AISuggestionItem] = []
-    for category, amount in top_expense_categories:
-        text = (
-            f"Your spending on {category} is high (Rs. {amount:.2f}). "
-            "Set a weekly cap and cut at least 10% from non-essential purchases in this category."
-        )
-        suggestions.append(AISuggestionItem(category=category, suggestion=text))
-    return suggestions
-
-
-async def _generate_ai_suggestions(
-    top_expense_categories: list[tuple[str, float]],
-) -> list[AISuggestionItem]:
-    if not top_expense_categories:
-        return []
-
-    category_lines = "\n".join(
-        [
-            f"- {category}: Rs. {amount:.2f}"
-            for category, amount in top_expense_categories
-        ]
-    )
-
-    prompt = (
-        "You are a financial coach.\n"
-        "Create exactly 3 concise spending suggestions based only on these top expense categories.\n"
-        "Return exactly 3 lines in this format: <category>|<suggestion>.\n"
-        "No numbering. No extra text.\n\n"
-        "Top expense categories:\n"
-        f"{category_lines}"
-    )
-
-    try:
-        async with httpx.AsyncClient(timeout=30) as client:
-            response = await client.post(
-                settings.OLLAMA_API_URL,
-                json={
-                    "model": "phi3:mini",
-                    "prompt": prompt,
-                    "stream": False,
-                },
-            )
-            response.raise_for_status()
-
-        raw_output = response.json().get("response", "")
-        parsed: list[AISuggestionItem] = []
-        valid_categories = {
-            category.lower(): category for category, _ in top_expense_categories
-        }
-
-        for line in raw_output.splitlines():
-            if "|" not in line:
-                continue
-            category_part, suggestion_part = line.split("|", 1)
-            category = category_part.strip()
-            suggestion = suggestion_part.strip()
-            if not category or not suggestion:
-                continue
-
-            normalized = category.lower()
-            if normalized in valid_categories:
-                category = valid_categories[normalized]
-
-            parsed.append(AISuggestionItem(category=category, suggestion=suggestion))
-
-        if len(parsed) >= 3:
-            return parsed[:3]
-    except Exception:
-        pass
-
-    return _build_fallback_suggestions(top_expense_categories)
-
-
 def _format_line_series_data(groups, prefix: str) -> list[LineSeries]:
     income_points: list[LineSeriesDataPoint] = []
     expense_points: list[LineSeriesDataPoint] = []
@@ -148,18 +85,6 @@ def _format_line_series_data(groups, prefix: str) -> list[LineSeries]:
     ]
 
 
-def _month_window(now: datetime) -> tuple[pd.Timestamp, pd.Timestamp]:
-    month_end = pd.Timestamp(now)
-    # Use a fixed 4-week horizon for monthly dashboard calculations.
-    month_start = (month_end - pd.Timedelta(days=27)).replace(
-        hour=0,
-        minute=0,
-        second=0,
-        microsecond=0,
-    )
-    return month_start, month_end
-
-
 def _year_window(now: datetime) -> tuple[pd.Timestamp, pd.Timestamp]:
     year_end = pd.Timestamp(now)
     year_start = (year_end - relativedelta(years=1)).replace(
@@ -380,15 +305,13 @@ def _top_stocks(db: Session, user_id: str) -> list[StockItem]:
     return [item[1] for item in ranked[:2]]
 
 
-def _recent_transactions(transactions) -> list[RecentTransactionItem]:
-    sorted_transactions = sorted(
-        transactions,
-        key=lambda t: t.date or datetime.min.replace(tzinfo=timezone.utc),
-        reverse=True,
-    )
+RECENT_TRANSACTIONS_LIMIT = 6
 
+
+def _recent_transactions(transactions) -> list[RecentTransactionItem]:
+    """Items for transactions already ordered newest first."""
     result: list[RecentTransactionItem] = []
-    for tx in sorted_transactions[:6]:
+    for tx in transactions:
         result.append(
             RecentTransactionItem(
                 id=str(tx.id),
@@ -403,30 +326,124 @@ def _recent_transactions(transactions) -> list[RecentTransactionItem]:
     return result
 
 
-def _in_window(value: datetime | None, start: pd.Timestamp, end: pd.Timestamp) -> bool:
-    if value is None:
-        return False
-    ts = pd.to_datetime(value, utc=True)
-    return start <= ts <= end
+def _in_own_session(fn, *args):
+    """fn(db, *args) on a private session, so sections can run in threads."""
+    db = SessionLocal()
+    try:
+        return fn(db, *args)
+    finally:
+        db.close()
+
+
+def _load_recent_transactions(
+    db: Session, account_id, start: pd.Timestamp, end: pd.Timestamp
+) -> list[RecentTransactionItem]:
+    return _recent_transactions(
+        crud.get_recent_transactions_by_account_in_window(
+            db,
+            account_id=account_id,
+            start=start,
+            end=end,
+            limit=RECENT_TRANSACTIONS_LIMIT,
+        )
+    )
+
+
+def _mark_degraded(name: str):
+    degraded = _degraded_sections.get()
+    if degraded is not None:
+        degraded.add(name)
+
+
+async def _run_section(name: str, awaitable, timeout: float, fallback):
+    """
+    Await one dashboard section, serving `fallback()` if it misses its
+    deadline or fails. A section running in a thread is left to finish in the
+    background on its own session.
+    """
+    try:
+        return await asyncio.wait_for(awaitable, timeout)
+    except asyncio.TimeoutError:
+        logger.warning("Dashboard section %s missed its %.1fs deadline", name, timeout)
+    except Exception:
+        logger.exception("Dashboard section %s failed", name)
+    _mark_degraded(name)
+    return fallback()
+
+
+def _db_section(name: str, fn, *args) -> asyncio.Task:
+    return asyncio.create_task(
+        _run_section(
+            name,
+            asyncio.to_thread(_in_own_session, fn, *args),
+            settings.DASHBOARD_SECTION_TIMEOUT_SECONDS,
+            list,
+        )
+    )
+
+
+async def _ai_suggestions_section(
+    top_expense_categories: list[tuple[str, float]],
+) -> list[AISuggestionItem]:
+    suggestions = await _run_section(
+        "aiSuggestions",
+        get_ai_suggestions(top_expense_categories),
+        settings.DASHBOARD_AI_SUGGESTIONS_TIMEOUT_SECONDS,
+        lambda: build_fallback_suggestions(top_expense_categories),
+    )
+    if suggestions is None:
+        _mark_degraded("aiSuggestions")
+        return build_fallback_suggestions(top_expense_categories)
+    return suggestions
 
 
 @router.get("/", response_model=DashboardResponse)
 async def get_dashboard_data(
+    request: Request,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
+    response_format: str | None = Query(
+        None,
+        alias="format",
+        pattern="^columnar$",
+        description="'columnar' returns chart series as parallel labels/values arrays",
+    ),
 ):
+    # Read-only: budget close-out and reward evaluation run on a schedule, or
+    # after this response when the user's evaluation marker is stale.
+    if await asyncio.to_thread(
+        _in_own_session, is_evaluation_stale, current_user.user_id
+    ):
+        request_user_evaluation(background_tasks, current_user.user_id)
+
+    cached = VersionedResponse(request, db, current_user.user_id)
+    if cached.hit is not None:
+        return cached.hit
+    degraded: set[str] = set()
+    _degraded_sections.set(degraded)
+    result = await build_dashboard_data(db, current_user)
+    if response_format == "columnar":
+        result = to_columnar(to_jsonable(result), DashboardResponse)
+    # Fallback sections must not be pinned to this data version.
+    return cached.render(result, cacheable=not degraded)
+
+
+async def build_dashboard_data(db: Session, current_user: User) -> DashboardResponse:
     db_bank_account = _get_user_nabil_account(db, current_user.user_id)
     external_id = db_bank_account.external_account_id
 
-    # Update completed budgets and evaluate rewards
-    update_completed_budgets_for_user(db=db, user_id=current_user.user_id)
-    evaluate_rewards(db=db, user=current_user)
-
-    transactions = crud.get_transactions_by_account(
-        db=db, account_id=db_bank_account.id
+    # Independent DB sections start first and run concurrently (each in a
+    # thread on its own session) while the charts are computed from the frame.
+    top_budget_goals = _db_section(
+        "topBudgetGoals", _top_budget_goals, current_user.user_id
     )
+    top_stocks = _db_section("topStocks", _top_stocks, current_user.user_id)
 
-    if not transactions:
+    frame = await asyncio.to_thread(
+        _in_own_session, get_account_frame, current_user.user_id, db_bank_account.id
+    )
+    if not len(frame):
         empty_series = LineSeries(id="", data=[])
         return DashboardResponse(
             summary=SummaryData(
@@ -438,34 +455,27 @@ async def get_dashboard_data(
             yearlyLineSeries=[empty_series, empty_series],
             monthlyLineSeries=[empty_series, empty_series],
             recentTransactions=[],
-            topBudgetGoals=_top_budget_goals(db, current_user.user_id),
-            topStocks=_top_stocks(db, current_user.user_id),
+            topBudgetGoals=await top_budget_goals,
+            topStocks=await top_stocks,
             aiSuggestions=[],
             monthlyExpenseCategoryChart=[],
             yearlyExpenseCategoryChart=[],
         )
 
-    df = pd.DataFrame(
-        [
-            {
-                "amount": float(t.amount),
-                "type": t.type,
-                "date": t.date,
-                "category": t.category,
-            }
-            for t in transactions
-        ]
-    )
-
-    df["date"] = pd.to_datetime(df["date"], utc=True)
-    df["amount"] = df["amount"].astype(float)
-
     now = datetime.now(timezone.utc)
-    month_start, month_end = _month_window(now)
+    month_start, month_end = rolling_month_window(now)
     year_start, year_end = _year_window(now)
+    recent_transactions = _db_section(
+        "recentTransactions",
+        _load_recent_transactions,
+        db_bank_account.id,
+        month_start,
+        month_end,
+    )
 
-    df_month = df[(df["date"] >= month_start) & (df["date"] <= month_end)].copy()
-    df_year = df[(df["date"] >= year_start) & (df["date"] <= year_end)].copy()
+    # Day-range slices of the sorted frame (binary search, no per-row mask).
+    df_month = frame.to_dataframe(month_start.date(), month_end.date())
+    df_year = frame.to_dataframe(year_start.date(), year_end.date())
 
     total_income = df_month[df_month["type"] == "CREDIT"]["amount"].sum()
     total_expenses = df_month[df_month["type"] == "DEBIT"]["amount"].sum()
@@ -494,19 +504,23 @@ async def get_dashboard_data(
         for category, amount in top_expense_series.head(3).items()
     ]
 
-    ai_suggestions = await _generate_ai_suggestions(top_expense_categories)
     monthly_expense_category_chart = _build_expense_category_chart(df_month)
     yearly_expense_category_chart = _build_expense_category_chart(df_year)
 
+    ai_suggestions, recent_items, budget_goal_items, stock_items = await asyncio.gather(
+        _ai_suggestions_section(top_expense_categories),
+        recent_transactions,
+        top_budget_goals,
+        top_stocks,
+    )
+
     return DashboardResponse(
         summary=summary_data,
         yearlyLineSeries=yearly_line_series,
         monthlyLineSeries=monthly_line_series,
-        recentTransactions=_recent_transactions(
-            [tx for tx in transactions if _in_window(tx.date, month_start, month_end)]
-        ),
-        topBudgetGoals=_top_budget_goals(db, current_user.user_id),
-        topStocks=_top_stocks(db, current_user.user_id),
+        recentTransactions=recent_items,
+        topBudgetGoals=budget_goal_items,
+        topStocks=stock_items,
         aiSuggestions=ai_suggestions,
         monthlyExpenseCategoryChart=monthly_expense_category_chart,
         yearlyExpenseCategoryChart=yearly_expense_category_chart,
@@ -515,35 +529,34 @@ async def get_dashboard_data(
 
 @router.get("/ai-suggestions", response_model=DashboardAISuggestionsResponse)
 async def get_dashboard_ai_suggestions(
+    request: Request,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
+    cached = VersionedResponse(request, db, current_user.user_id)
+    if cached.hit is not None:
+        return cached.hit
+    degraded: set[str] = set()
+    _degraded_sections.set(degraded)
+    result = await build_dashboard_ai_suggestions(db, current_user)
+    return cached.render(result, cacheable=not degraded)
+
+
+async def build_dashboard_ai_suggestions(
+    db: Session, current_user: User
+) -> DashboardAISuggestionsResponse:
     db_bank_account = _get_user_nabil_account(db, current_user.user_id)
     external_id = db_bank_account.external_account_id
 
-    transactions = crud.get_transactions_by_account(
-        db=db, account_id=db_bank_account.id
+    frame = await asyncio.to_thread(
+        _in_own_session, get_account_frame, current_user.user_id, db_bank_account.id
     )
-    if not transactions:
+    if not len(frame):
         return DashboardAISuggestionsResponse(suggestions=[])
 
-    df = pd.DataFrame(
-        [
-            {
-                "amount": float(t.amount),
-                "type": t.type,
-                "category": t.category,
-                "date": t.date,
-            }
-            for t in transactions
-        ]
-    )
-
-    df["date"] = pd.to_datetime(df["date"], utc=True)
-
     now = datetime.now(timezone.utc)
-    month_start, month_end = _month_window(now)
-    df_month = df[(df["date"] >= month_start) & (df["date"] <= month_end)].copy()
+    month_start, month_end = rolling_month_window(now)
+    df_month = frame.to_dataframe(month_start.date(), month_end.date())
 
     top_expense_series = (
         df_month[df_month["type"] == "DEBIT"]
@@ -557,5 +570,5 @@ async def get_dashboard_ai_suggestions(
         for category, amount in top_expense_series.head(3).items()
     ]
 
-    suggestions = await _generate_ai_suggestions(top_expense_categories)
+    suggestions = await _ai_suggestions_section(top_expense_categories)
     return DashboardAISuggestionsResponse(suggestions=suggestions)
@@ -0,0 +1,16 @@
+from fastapi import APIRouter, Depends
+
+from app.models.user import User
+from app.utils.cache import cache_stats
+from app.utils.deps import get_current_user
+
+router = APIRouter()
+
+
+@router.get("/cache-stats")
+def get_cache_stats(current_user: User = Depends(get_current_user)):
+    """
+    Size, hit/miss counts and evictions for every in-process cache. Only
+    mounted when OPS_ENDPOINTS_ENABLED is set.
+    """
+    return cache_stats()
@@ -16,6 +16,14 @@ class Settings(BaseSettings):
     SMTP_USER: str
     SMTP_PASSWORD: str
     SMTP_FROM_EMAIL: str
+    SMTP_USE_TLS: bool = True
+
+    # Background OTP mail queue
+    MAIL_QUEUE_WORKERS: int = 2
+    MAIL_QUEUE_MAXSIZE: int = 1000
+    MAIL_MAX_RETRIES: int = 3
+    MAIL_RETRY_BACKOFF_SECONDS: float = 1.0
+    MAIL_SMTP_IDLE_SECONDS: float = 60.0
     OLLAMA_API_URL: str = (
         "http://localhost:11434/api/generate"  # Default for local Ollama
     )
@@ -26,6 +34,58 @@ class Settings(BaseSettings):
     KOSHCONNECT_SIGNING_SECRET: str | None = None
     KOSHCONNECT_SIGN_TOKEN_REQUEST: bool = False
 
+    # Per-request SQL statement counting (X-DB-Query-Count headers, N+1 warnings)
+    SQL_QUERY_STATS_ENABLED: bool = False
+    SQL_QUERY_STATS_REPEAT_THRESHOLD: int = 3
+
+    # Mount /ops (process-wide cache internals); keep off on public deployments
+    OPS_ENDPOINTS_ENABLED: bool = False
+
+    # Authenticated user resolution cache (token claims + user snapshots)
+    AUTH_CACHE_TTL_SECONDS: int = 60
+    AUTH_CACHE_MAX_ENTRIES: int = 10000
+
+    # Max concurrent Argon2 hash/verify operations (run off the event loop)
+    PASSWORD_HASH_MAX_CONCURRENCY: int = 4
+
+    # Rate limit counter storage: "memory://" (per worker), "appdb://" (shared
+    # Postgres table) or any limits storage URI such as "redis://host:6379".
+    RATE_LIMIT_STORAGE_URI: str = "memory://"
+
+    # Process-local cache of per-account daily transaction frames
+    TRANSACTION_FRAME_CACHE_MAX_MB: int = 64
+
+    # Loaded budget prediction model bundles (LSTM, XGBoost, scaler), by artifact size
+    BUDGET_MODEL_CACHE_MAX_MB: int = 256
+
+    # Rendered bodies of ETag-versioned GET responses (analytics, dashboard, predictions)
+    HTTP_RESPONSE_CACHE_MAX_ENTRIES: int = 5000
+    HTTP_RESPONSE_CACHE_TTL_SECONDS: int = 3600
+    # br (when the brotli package is installed) or gzip for those bodies
+    HTTP_COMPRESSION_MIN_BYTES: int = 1024
+    HTTP_GZIP_LEVEL: int = 6
+    HTTP_BROTLI_QUALITY: int = 5
+
+    # Scheduled reward evaluation (kept off GET /dashboard)
+    USER_EVALUATION_INTERVAL_MINUTES: int = 15
+    USER_EVALUATION_BATCH_SIZE: int = 500
+
+    # Nightly platform-wide close-out of expired budgets
+    BUDGET_CLOSEOUT_HOUR_UTC: int = 0
+    BUDGET_CLOSEOUT_BATCH_SIZE: int = 1000
+
+    # Per-section deadlines for GET /dashboard/ (fallbacks are served on expiry)
+    DASHBOARD_SECTION_TIMEOUT_SECONDS: float = 3.0
+    DASHBOARD_AI_SUGGESTIONS_TIMEOUT_SECONDS: float = 4.0
+
+    # LLM suggestion cache (fresh for the TTL, then served stale while refreshing)
+    AI_SUGGESTIONS_TTL_SECONDS: int = 86400
+    AI_SUGGESTIONS_STALE_SECONDS: int = 172800
+    AI_SUGGESTIONS_CACHE_MAX_ENTRIES: int = 10000
+    AI_SUGGESTIONS_AMOUNT_BUCKET_RATIO: float = 1.25
+    AI_SUGGESTIONS_LLM_CONCURRENCY: int = 2
+    AI_SUGGESTIONS_PRECOMPUTE_HOUR_UTC: int = 2
+
     class Config:
         env_file = ".env"
 
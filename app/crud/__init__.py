@@ -12,10 +12,25 @@ from .bank import (
     get_bank_account_by_user_and_bank_name,
     create_transaction,
     get_transactions_by_account,
+    get_transactions_by_account_in_window,
+    get_recent_transactions_by_account_in_window,
     get_total_spending_for_category_and_month,
     deactivate_bank_accounts_by_user,
     delete_transactions_by_user,
 )
+from .daily_aggregate import (
+    add_transaction_to_daily_aggregates,
+    get_daily_aggregates_by_account,
+    get_all_daily_aggregates_by_account,
+    has_daily_aggregates_for_account,
+    rebuild_daily_aggregates,
+)
+from .budget_ledger import (
+    apply_transaction_to_budget_ledger,
+    budget_in_transaction_month,
+    reconcile_remaining_budgets,
+)
+from .user_data_version import get_user_data_version, bump_user_data_version
 from .budget import (
     create_budget,
     get_budgets_by_user,
@@ -23,6 +38,7 @@ from .budget import (
     update_budget,
     delete_budget,
     get_budget_by_category_and_user_and_date,
+    get_active_budgets_for_transaction,
     evaluate_budget_completion,
 )
 from .reward import (
@@ -48,15 +64,28 @@ __all__ = [
     "get_bank_account_by_user_and_bank_name",
     "create_transaction",
     "get_transactions_by_account",
+    "get_transactions_by_account_in_window",
+    "get_recent_transactions_by_account_in_window",
     "get_total_spending_for_category_and_month",
     "deactivate_bank_accounts_by_user",
     "delete_transactions_by_user",
+    "add_transaction_to_daily_aggregates",
+    "get_daily_aggregates_by_account",
+    "get_all_daily_aggregates_by_account",
+    "has_daily_aggregates_for_account",
+    "rebuild_daily_aggregates",
+    "apply_transaction_to_budget_ledger",
+    "budget_in_transaction_month",
+    "reconcile_remaining_budgets",
+    "get_user_data_version",
+    "bump_user_data_version",
     "create_budget",
     "get_budgets_by_user",
     "get_budget_by_id",
     "update_budget",
     "delete_budget",
     "get_budget_by_category_and_user_and_date",
+    "get_active_budgets_for_transaction",
     "evaluate_budget_completion",
     "get_reward_by_id",
     "get_all_rewards",
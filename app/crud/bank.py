@@ -1,10 +1,23 @@
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 import uuid
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from dateutil.relativedelta import relativedelta
 
 from app.models.bank import BankAccount, Transaction
 from app.schemas.bank import TransactionCreate
+from app.services.spend_classifier import classify_transaction
+from app.crud.daily_aggregate import (
+    add_transaction_to_daily_aggregates,
+    delete_daily_aggregates_by_user,
+)
+from app.crud.budget_ledger import (
+    apply_transaction_to_budget_ledger,
+    reset_budget_ledger_for_user,
+)
+from app.crud.user_data_version import bump_user_data_version
 
 
 def get_bank_account(db: Session, bank_account_id: uuid.UUID):
@@ -27,17 +40,23 @@ def deactivate_bank_accounts_by_user(db: Session, user_id: str):
     db.query(BankAccount).filter(BankAccount.user_id == user_id).update(
         {BankAccount.is_active: False}, synchronize_session=False
     )
+    bump_user_data_version(db, user_id)
     db.commit()
 
 
 def delete_transactions_by_user(db: Session, user_id: str):
     db.query(Transaction).filter(Transaction.user_id == user_id).delete()
+    delete_daily_aggregates_by_user(db, user_id)
+    reset_budget_ledger_for_user(db, user_id)
     db.commit()
 
 
 def create_transaction(db: Session, transaction: TransactionCreate, user_id: str):
     db_transaction = Transaction(**transaction.model_dump(), user_id=user_id)
+    db_transaction.spend_class = classify_transaction(db_transaction)
     db.add(db_transaction)
+    add_transaction_to_daily_aggregates(db, db_transaction)
+    apply_transaction_to_budget_ledger(db, db_transaction)
     db.commit()
     db.refresh(db_transaction)
     return db_transaction
@@ -47,6 +66,37 @@ def get_transactions_by_account(db: Session, account_id: uuid.UUID):
     return db.query(Transaction).filter(Transaction.account_id == account_id).all()
 
 
+def get_transactions_by_account_in_window(
+    db: Session, account_id: uuid.UUID, start: datetime, end: datetime
+):
+    return (
+        db.query(Transaction)
+        .filter(
+            Transaction.account_id == account_id,
+            Transaction.date >= start,
+            Transaction.date <= end,
+        )
+        .all()
+    )
+
+
+def get_recent_transactions_by_account_in_window(
+    db: Session, account_id: uuid.UUID, start: datetime, end: datetime, limit: int
+):
+    """Newest `limit` transactions in the window, read off ix_transactions_account_id_date."""
+    return (
+        db.query(Transaction)
+        .filter(
+            Transaction.account_id == account_id,
+            Transaction.date >= start,
+            Transaction.date <= end,
+        )
+        .order_by(Transaction.date.desc())
+        .limit(limit)
+        .all()
+    )
+
+
 def get_transactions_by_user(db: Session, user_id: str):
     return db.query(Transaction).filter(Transaction.user_id == user_id).all()
 
@@ -85,31 +135,40 @@ def get_total_spending_for_category_and_month(
     return total_spent if total_spent is not None else 0.0
 
 
-def get_monthly_spending_history(
-    db: Session, user_id: str, category: str, months: int = 12
-):
+def get_monthly_spending_totals(
+    db: Session, user_id: str, categories: list[str], months: int = 12
+) -> dict[str, dict[date, Decimal]]:
     """
-    Computes the average and minimum monthly spending for a category over a given period.
+    DEBIT spend per category and calendar month for the last `months` months
+    (the current one included), in one grouped query. Months without
+    spending are absent.
     """
     today = datetime.utcnow().date()
-    monthly_spends = []
-    processed_months = set()
-
-    for i in range(months):
-        # Go back month by month
-        target_date = today - timedelta(days=i * 30)  # Approximate
-        year, month = target_date.year, target_date.month
-
-        if (year, month) not in processed_months:
-            processed_months.add((year, month))
-            monthly_spend = get_total_spending_for_category_and_month(
-                db, user_id, category, year, month
-            )
-            # Only include months where there was spending, to get a realistic 'min_spend'
-            if monthly_spend > 0:
-                monthly_spends.append(monthly_spend)
-
-    # We need at least two data points to find a meaningful reduction
+    first_month = today.replace(day=1) - relativedelta(months=months - 1)
+    month = func.date_trunc("month", Transaction.date)
+
+    rows = (
+        db.query(Transaction.category, month, func.sum(Transaction.amount))
+        .filter(
+            Transaction.user_id == user_id,
+            Transaction.category.in_(categories),
+            Transaction.type == "DEBIT",
+            Transaction.date >= datetime.combine(first_month, datetime.min.time()),
+        )
+        .group_by(Transaction.category, month)
+        .all()
+    )
+
+    totals: dict[str, dict[date, Decimal]] = {category: {} for category in categories}
+    for category, month_start, total in rows:
+        totals[category][month_start.date()] = total
+    return totals
+
+
+def _summarize_monthly_spends(monthly_spends: list) -> dict:
+    # Only months with spending count, to get a realistic 'min_spend'; we
+    # need at least two of them to find a meaningful reduction.
+    monthly_spends = [spend for spend in monthly_spends if spend > 0]
     if len(monthly_spends) < 2:
         return {"avg_spend": 0, "min_spend": 0}
 
@@ -117,3 +176,23 @@ def get_monthly_spending_history(
     min_spend = min(monthly_spends)
 
     return {"avg_spend": avg_spend, "min_spend": min_spend}
+
+
+def get_monthly_spending_histories(
+    db: Session, user_id: str, categories: list[str], months: int = 12
+) -> dict[str, dict]:
+    """Average and minimum monthly spending per category, from one history fetch."""
+    totals = get_monthly_spending_totals(db, user_id, categories, months)
+    return {
+        category: _summarize_monthly_spends(list(by_month.values()))
+        for category, by_month in totals.items()
+    }
+
+
+def get_monthly_spending_history(
+    db: Session, user_id: str, category: str, months: int = 12
+):
+    """
+    Computes the average and minimum monthly spending for a category over a given period.
+    """
+    return get_monthly_spending_histories(db, user_id, [category], months)[category]
@@ -2,6 +2,7 @@ from app.models import BankSyncStatus, SyncStatusEnum
 from sqlalchemy.orm import Session
 from datetime import datetime
 from typing import Optional
+from app.crud.user_data_version import bump_user_data_version
 
 
 def get_or_create_sync_status(db: Session, user_id: str) -> BankSyncStatus:
@@ -37,6 +38,7 @@ def update_sync_status(
     if failure_reason is not None:
         sync_status.failure_reason = failure_reason
     db.add(sync_status)
+    bump_user_data_version(db, user_id)
     db.commit()
     db.refresh(sync_status)
     return sync_status
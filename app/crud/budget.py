@@ -4,13 +4,18 @@ from app.schemas.budget import BudgetCreate, BudgetUpdate
 from datetime import date
 from fastapi import HTTPException
 from app.crud.bank import get_total_spending_for_category_and_month
+from app.crud.budget_ledger import budget_in_transaction_month
+from app.models.bank import Transaction
+from app.crud.user_data_version import bump_user_data_version
 from app.models.user import User
 from decimal import Decimal
 
 
 def _update_remaining_budget(db: Session, budget: Budget):
     """
-    Calculates and updates the remaining_budget for a given budget based on actual spending.
+    Recalculates remaining_budget from actual spending and commits. Only
+    write paths use this; reads rely on the ledger kept by
+    app.crud.budget_ledger.
     """
     current_spending = get_total_spending_for_category_and_month(
         db,
@@ -32,30 +37,21 @@ def _update_remaining_budget(db: Session, budget: Budget):
 
 
 def get_budgets_by_user(db: Session, user_id: str):
-    budgets = db.query(Budget).filter(Budget.user_id == user_id).all()
-    # Update remaining_budget for each budget before returning
-    updated_budgets = []
-    for budget in budgets:
-        updated_budgets.append(_update_remaining_budget(db, budget))
-    return updated_budgets
+    return db.query(Budget).filter(Budget.user_id == user_id).all()
 
 
 def get_budget_by_id(db: Session, budget_id: str, user_id: str):
-    budget = (
+    return (
         db.query(Budget)
         .filter(Budget.id == budget_id, Budget.user_id == user_id)
         .first()
     )
-    if budget:
-        # Update remaining_budget before returning a single budget
-        budget = _update_remaining_budget(db, budget)
-    return budget
 
 
 def get_budget_by_category_and_user_and_date(
     db: Session, user_id: str, category: str, start_date: date, end_date: date
 ):
-    budget = (
+    return (
         db.query(Budget)
         .filter(
             Budget.user_id == user_id,
@@ -65,10 +61,29 @@ def get_budget_by_category_and_user_and_date(
         )
         .first()
     )
-    if budget:
-        # Update remaining_budget before returning
-        budget = _update_remaining_budget(db, budget)
-    return budget
+
+
+def get_active_budgets_for_transaction(db: Session, transaction: Transaction):
+    """
+    Uncompleted budgets of the transaction's user and category that count it
+    as spend: the same calendar-month-of-start_date rule as the ledger and
+    budget_month_spend (the user/category prefix of
+    ix_budgets_active_user_category_period serves it). Non-DEBIT
+    transactions never count as spend, so they match nothing.
+    """
+    if transaction.type != "DEBIT" or not transaction.category:
+        return []
+
+    return (
+        db.query(Budget)
+        .filter(
+            Budget.user_id == transaction.user_id,
+            Budget.category == transaction.category,
+            Budget.is_completed == False,
+            budget_in_transaction_month(transaction),
+        )
+        .all()
+    )
 
 
 def create_budget(db: Session, budget: BudgetCreate, user_id: str):
@@ -96,9 +111,10 @@ def create_budget(db: Session, budget: BudgetCreate, user_id: str):
             )
 
     db_budget = Budget(**budget.dict(), user_id=user_id)
-    # Initialize remaining_budget upon creation
-    db_budget.remaining_budget = budget.budget_amount
+    # Open the ledger with the spend already booked in the budget's month
+    db_budget.remaining_budget = budget.budget_amount - current_month_spending_decimal
     db.add(db_budget)
+    bump_user_data_version(db, user_id)
     db.commit()
     db.refresh(db_budget)
     return db_budget
@@ -108,6 +124,7 @@ def update_budget(db: Session, budget_id: str, budget: BudgetUpdate, user_id: st
     db_budget = get_budget_by_id(db, budget_id=budget_id, user_id=user_id)
     if db_budget:
         db_budget.budget_amount = budget.budget_amount
+        bump_user_data_version(db, user_id)
         # Re-calculate remaining budget if budget_amount is updated
         _update_remaining_budget(db, db_budget)
     return db_budget
@@ -117,6 +134,7 @@ def delete_budget(db: Session, budget_id: str, user_id: str):
     db_budget = get_budget_by_id(db, budget_id=budget_id, user_id=user_id)
     if db_budget:
         db.delete(db_budget)
+        bump_user_data_version(db, user_id)
         db.commit()
     return db_budget
 
@@ -170,54 +188,3 @@ def evaluate_budget_completion(db: Session, budget: Budget, user: User) -> bool:
 
         return True
     return False
-
-
-def update_completed_budgets_for_user(db: Session, user_id: str):
-    """
-    Checks and updates the status of completed budgets for a user.
-    """
-    user = db.query(User).filter(User.user_id == user_id).first()
-    if not user:
-        return
-
-    today = date.today()
-    uncompleted_budgets = (
-        db.query(Budget)
-        .filter(
-            Budget.user_id == user_id,
-            Budget.end_date < today,
-            Budget.is_completed == False,
-        )
-        .all()
-    )
-
-    for budget in uncompleted_budgets:
-        if evaluate_budget_completion(db, budget, user):
-            user.goals_completed += 1
-            from app.services.event_logger import log_event_async
-
-            log_event_async(
-                db,
-                user_id,
-                "budget_completed",
-                "budget",
-                str(budget.id),
-                {
-                    "category": budget.category,
-                    "budget_amount": float(budget.budget_amount),
-                    "remaining_budget": float(budget.remaining_budget),
-                    "xp_gained": 10,
-                },
-            )
-
-        budget.is_completed = True
-        db.add(budget)
-
-    db.commit()
-    db.refresh(user)
-
-    # Re-evaluate all rewards for the user after budget updates
-    from app.services.reward_evaluation import evaluate_rewards
-
-    new_rewards = evaluate_rewards(db, user)
-    return new_rewards
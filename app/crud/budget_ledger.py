@@ -0,0 +1,110 @@
+"""
+Budget.remaining_budget kept as a ledger: budget_amount minus the user's
+DEBIT spend in the budget's category during the calendar month of its
+start_date. Ingestion debits it in the same database transaction as the new
+Transaction, and reconcile_remaining_budgets() recomputes it from the
+transactions table to correct any drift.
+"""
+
+from sqlalchemy import DateTime, and_, cast, func, literal, literal_column, select
+from sqlalchemy.orm import Session
+
+from app.models.bank import Transaction
+from app.models.budget import Budget
+from app.crud.user_data_version import (
+    bump_all_user_data_versions,
+    bump_user_data_version,
+)
+
+
+def _month_start(value):
+    # Naive timestamps, like get_total_spending_for_category_and_month's bounds.
+    return func.date_trunc("month", cast(value, DateTime(timezone=False)))
+
+
+def budget_in_transaction_month(transaction: Transaction):
+    """
+    Filter for the budgets a transaction counts against by date: those whose
+    start_date is in the transaction's calendar month, as in budget_month_spend.
+    """
+    return _month_start(Budget.start_date) == _month_start(
+        literal(transaction.date, DateTime(timezone=True))
+    )
+
+
+def apply_transaction_to_budget_ledger(db: Session, transaction: Transaction) -> int:
+    """
+    Debit a new DEBIT transaction from the budgets whose category and month
+    it falls in. Runs inside the caller's transaction; returns rows updated.
+    """
+    if transaction.type != "DEBIT" or not transaction.category:
+        return 0
+
+    return (
+        db.query(Budget)
+        .filter(
+            Budget.user_id == transaction.user_id,
+            Budget.category == transaction.category,
+            budget_in_transaction_month(transaction),
+        )
+        .update(
+            {
+                Budget.remaining_budget: func.coalesce(
+                    Budget.remaining_budget, Budget.budget_amount
+                )
+                - transaction.amount
+            },
+            synchronize_session=False,
+        )
+    )
+
+
+def reset_budget_ledger_for_user(db: Session, user_id: str):
+    """Restore every budget of the user to its full amount (no spend left), without committing."""
+    db.query(Budget).filter(Budget.user_id == user_id).update(
+        {Budget.remaining_budget: Budget.budget_amount}, synchronize_session=False
+    )
+
+
+def budget_month_spend():
+    """
+    Correlated SUM of the DEBIT spend counted against a budget row: its
+    category in the calendar month of its start_date.
+    """
+    month_start = _month_start(Budget.start_date)
+    return (
+        select(func.coalesce(func.sum(Transaction.amount), 0))
+        .where(
+            and_(
+                Transaction.user_id == Budget.user_id,
+                Transaction.category == Budget.category,
+                Transaction.type == "DEBIT",
+                Transaction.date >= month_start,
+                Transaction.date < month_start + literal_column("interval '1 month'"),
+            )
+        )
+        .scalar_subquery()
+    )
+
+
+def reconcile_remaining_budgets(db: Session, user_id: str | None = None) -> int:
+    """
+    Recompute remaining_budget from the transactions table (all users, or
+    one) with a single UPDATE, touching only rows that drifted. Returns the
+    number of budgets corrected.
+    """
+    expected = Budget.budget_amount - budget_month_spend()
+    query = db.query(Budget).filter(Budget.remaining_budget.is_distinct_from(expected))
+    if user_id is not None:
+        query = query.filter(Budget.user_id == user_id)
+
+    corrected = query.update(
+        {Budget.remaining_budget: expected}, synchronize_session=False
+    )
+    if corrected:
+        if user_id is not None:
+            bump_user_data_version(db, user_id)
+        else:
+            bump_all_user_data_versions(db)
+    db.commit()
+    return corrected
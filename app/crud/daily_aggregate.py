@@ -0,0 +1,148 @@
+import uuid
+from datetime import date, datetime, timezone
+
+from sqlalchemy import Date, cast, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models.bank import Transaction
+from app.models.daily_transaction_aggregate import DailyTransactionAggregate
+from app.crud.user_data_version import (
+    bump_all_user_data_versions,
+    bump_user_data_version,
+)
+
+
+def _utc_day(value: datetime) -> date:
+    if value.tzinfo is None:
+        return value.date()
+    return value.astimezone(timezone.utc).date()
+
+
+def add_transaction_to_daily_aggregates(db: Session, transaction: Transaction):
+    """
+    Fold one new transaction into its daily aggregate row and bump the user's
+    data version. Runs inside the caller's transaction, so commit it together
+    with the Transaction insert.
+    """
+    table = DailyTransactionAggregate.__table__
+    stmt = insert(table).values(
+        id=uuid.uuid4(),
+        user_id=transaction.user_id,
+        account_id=transaction.account_id,
+        day=_utc_day(transaction.date),
+        category=transaction.category or "",
+        type=transaction.type,
+        total_amount=transaction.amount,
+        tx_count=1,
+    )
+    stmt = stmt.on_conflict_do_update(
+        constraint="uq_daily_transaction_aggregate",
+        set_={
+            "total_amount": table.c.total_amount + stmt.excluded.total_amount,
+            "tx_count": table.c.tx_count + stmt.excluded.tx_count,
+        },
+    )
+    db.execute(stmt)
+    bump_user_data_version(db, transaction.user_id)
+
+
+def get_daily_aggregates_by_account(
+    db: Session, account_id: uuid.UUID, start_day: date, end_day: date
+):
+    return (
+        db.query(
+            DailyTransactionAggregate.day,
+            DailyTransactionAggregate.category,
+            DailyTransactionAggregate.type,
+            DailyTransactionAggregate.total_amount,
+            DailyTransactionAggregate.tx_count,
+        )
+        .filter(
+            DailyTransactionAggregate.account_id == account_id,
+            DailyTransactionAggregate.day >= start_day,
+            DailyTransactionAggregate.day <= end_day,
+        )
+        .all()
+    )
+
+
+def get_all_daily_aggregates_by_account(db: Session, account_id: uuid.UUID):
+    return (
+        db.query(
+            DailyTransactionAggregate.day,
+            DailyTransactionAggregate.category,
+            DailyTransactionAggregate.type,
+            DailyTransactionAggregate.total_amount,
+            DailyTransactionAggregate.tx_count,
+        )
+        .filter(DailyTransactionAggregate.account_id == account_id)
+        .order_by(DailyTransactionAggregate.day)
+        .all()
+    )
+
+
+def has_daily_aggregates_for_account(db: Session, account_id: uuid.UUID) -> bool:
+    return db.query(
+        db.query(DailyTransactionAggregate)
+        .filter(DailyTransactionAggregate.account_id == account_id)
+        .exists()
+    ).scalar()
+
+
+def delete_daily_aggregates_by_user(db: Session, user_id: str):
+    """Delete a user's aggregate rows without committing."""
+    db.query(DailyTransactionAggregate).filter(
+        DailyTransactionAggregate.user_id == user_id
+    ).delete(synchronize_session=False)
+    bump_user_data_version(db, user_id)
+
+
+def rebuild_daily_aggregates(db: Session, user_id: str | None = None) -> int:
+    """
+    Recompute aggregate rows from the transactions table (all users, or one)
+    with a single INSERT ... SELECT. Returns the number of rows written.
+    """
+    delete_query = db.query(DailyTransactionAggregate)
+    if user_id is not None:
+        delete_query = delete_query.filter(
+            DailyTransactionAggregate.user_id == user_id
+        )
+    delete_query.delete(synchronize_session=False)
+
+    day = cast(func.timezone("UTC", Transaction.date), Date)
+    category = func.coalesce(Transaction.category, "")
+    source = select(
+        func.gen_random_uuid(),
+        Transaction.user_id,
+        Transaction.account_id,
+        day,
+        category,
+        Transaction.type,
+        func.sum(Transaction.amount),
+        func.count(Transaction.id),
+    ).group_by(Transaction.user_id, Transaction.account_id, day, category, Transaction.type)
+    if user_id is not None:
+        source = source.where(Transaction.user_id == user_id)
+
+    result = db.execute(
+        insert(DailyTransactionAggregate.__table__).from_select(
+            [
+                "id",
+                "user_id",
+                "account_id",
+                "day",
+                "category",
+                "type",
+                "total_amount",
+                "tx_count",
+            ],
+            source,
+        )
+    )
+    if user_id is not None:
+        bump_user_data_version(db, user_id)
+    else:
+        bump_all_user_data_versions(db)
+    db.commit()
+    return result.rowcount
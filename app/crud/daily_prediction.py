@@ -31,6 +31,7 @@ def get_latest_predictions_for_user(db: Session, user_id: str):
 from sqlalchemy.orm import Session
 from app.models.daily_prediction import DailyPrediction
 from app.schemas.ai_predictions import DailyPredictionCreate
+from app.crud.user_data_version import bump_user_data_version
 
 
 def create_daily_prediction(
@@ -38,6 +39,7 @@ def create_daily_prediction(
 ) -> DailyPrediction:
     db_prediction = DailyPrediction(**prediction.dict())
     db.add(db_prediction)
+    bump_user_data_version(db, prediction.user_id)
     db.commit()
     db.refresh(db_prediction)
     return db_prediction
@@ -2,6 +2,7 @@ from sqlalchemy.orm import Session
 from app.models.goal import Goal, GoalStatus
 from app.schemas.goal import GoalCreate
 from decimal import Decimal
+from app.crud.user_data_version import bump_user_data_version
 
 
 def create_goal(db: Session, user_id: str, goal: GoalCreate) -> Goal:
@@ -14,6 +15,7 @@ def create_goal(db: Session, user_id: str, goal: GoalCreate) -> Goal:
         status=GoalStatus.ACTIVE,
     )
     db.add(db_goal)
+    bump_user_data_version(db, user_id)
     db.commit()
     db.refresh(db_goal)
     return db_goal
@@ -47,6 +49,7 @@ def get_goal_by_id_and_user(db: Session, goal_id: str, user_id: str) -> Goal | N
 
 def update_goal(db: Session, goal: Goal) -> Goal:
     db.add(goal)
+    bump_user_data_version(db, goal.user_id)
     db.commit()
     db.refresh(goal)
     return goal
@@ -0,0 +1,54 @@
+from sqlalchemy import func, literal, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models.user import User
+from app.models.user_data_version import UserDataVersion
+
+
+def get_user_data_version(db: Session, user_id: str) -> int:
+    version = (
+        db.query(UserDataVersion.version)
+        .filter(UserDataVersion.user_id == user_id)
+        .scalar()
+    )
+    return version or 0
+
+
+def bump_user_data_version(db: Session, user_id: str):
+    """Increment the user's data version inside the caller's transaction."""
+    table = UserDataVersion.__table__
+    stmt = insert(table).values(user_id=user_id, version=1)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.user_id],
+        set_={"version": table.c.version + 1, "updated_at": func.now()},
+    )
+    db.execute(stmt)
+
+
+def bump_user_data_versions(db: Session, user_ids: list[str]):
+    """bump_user_data_version for many users in one statement."""
+    if not user_ids:
+        return
+    table = UserDataVersion.__table__
+    stmt = insert(table).values(
+        [{"user_id": user_id, "version": 1} for user_id in sorted(set(user_ids))]
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.user_id],
+        set_={"version": table.c.version + 1, "updated_at": func.now()},
+    )
+    db.execute(stmt)
+
+
+def bump_all_user_data_versions(db: Session):
+    """bump_user_data_version for every user, including those without a row yet."""
+    table = UserDataVersion.__table__
+    stmt = insert(table).from_select(
+        ["user_id", "version"], select(User.user_id, literal(1))
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.user_id],
+        set_={"version": table.c.version + 1, "updated_at": func.now()},
+    )
+    db.execute(stmt)
@@ -0,0 +1,63 @@
+"""
+Cross-process claims on named jobs via Postgres advisory locks.
+
+The lock is transaction-scoped and taken on a dedicated connection, so it is
+held across any commits the claimed work makes on its own session and is
+released when the claim's transaction ends (or its connection dies).
+"""
+
+import hashlib
+from contextlib import contextmanager
+from typing import Iterator
+
+from sqlalchemy import func, select
+from sqlalchemy.engine import Connection
+
+from app.db.session import engine
+
+
+def _lock_key(name: str) -> int:
+    # pg advisory locks take a signed 64-bit key.
+    return int.from_bytes(hashlib.sha256(name.encode()).digest()[:8], "big", signed=True)
+
+
+def acquire_advisory_lock(name: str) -> Connection | None:
+    """
+    Claim `name` without waiting. Returns the connection holding the claim
+    (pass it to release_advisory_lock), or None if another session holds it.
+    """
+    conn = engine.connect()
+    try:
+        conn.begin()
+        claimed = conn.execute(
+            select(func.pg_try_advisory_xact_lock(_lock_key(name)))
+        ).scalar()
+    except Exception:
+        conn.close()
+        raise
+    if not claimed:
+        conn.close()
+        return None
+    return conn
+
+
+def release_advisory_lock(conn: Connection):
+    """End the claim's transaction, which releases the lock."""
+    try:
+        conn.rollback()
+    finally:
+        conn.close()
+
+
+@contextmanager
+def advisory_lock(name: str) -> Iterator[bool]:
+    """
+    `with advisory_lock("job") as claimed:` - claimed is False when another
+    process is already running the job; the block should then skip it.
+    """
+    conn = acquire_advisory_lock(name)
+    try:
+        yield conn is not None
+    finally:
+        if conn is not None:
+            release_advisory_lock(conn)
@@ -0,0 +1,184 @@
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+_QUERY_START_KEY = "query_stats_start"
+
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+_STRING_LITERAL_PATTERN = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL_PATTERN = re.compile(r"\b\d+(?:\.\d+)?\b")
+# Expanded IN lists render one placeholder per value, e.g. IN (%(id_1_1)s, %(id_1_2)s).
+_IN_LIST_PATTERN = re.compile(r"\bIN \((?:[^()]|\([^()]*\))+\)", re.IGNORECASE)
+
+
+def normalize_statement(statement: str) -> str:
+    """Reduce a SQL statement to its shape so repeated queries can be grouped."""
+    shape = _WHITESPACE_PATTERN.sub(" ", statement).strip()
+    shape = _STRING_LITERAL_PATTERN.sub("?", shape)
+    shape = _IN_LIST_PATTERN.sub("IN (?)", shape)
+    return _NUMBER_LITERAL_PATTERN.sub("?", shape)
+
+
+@dataclass(eq=False)
+class QueryStats:
+    count: int = 0
+    total_time: float = 0.0
+    shapes: Counter = field(default_factory=Counter)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, statement: str, elapsed: float):
+        shape = normalize_statement(statement)
+        with self._lock:
+            self.count += 1
+            self.total_time += elapsed
+            self.shapes[shape] += 1
+
+    def repeated_shapes(self, threshold: int) -> list[tuple[str, int]]:
+        """Statement shapes executed at least `threshold` times (likely N+1)."""
+        with self._lock:
+            return [
+                (shape, count)
+                for shape, count in self.shapes.most_common()
+                if count >= threshold
+            ]
+
+
+# Stats for the request currently being served (set by the middleware).
+_request_stats: ContextVar[QueryStats | None] = ContextVar(
+    "request_query_stats", default=None
+)
+# Process-wide collectors used by count_queries(); these see every thread.
+_global_collectors: list[QueryStats] = []
+_global_collectors_lock = threading.Lock()
+_installed_engines: set[int] = set()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault(_QUERY_START_KEY, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start_times = conn.info.get(_QUERY_START_KEY)
+    if not start_times:
+        return
+    elapsed = time.perf_counter() - start_times.pop()
+
+    request_stats = _request_stats.get()
+    if request_stats is not None:
+        request_stats.record(statement, elapsed)
+
+    if _global_collectors:
+        with _global_collectors_lock:
+            collectors = list(_global_collectors)
+        for collector in collectors:
+            collector.record(statement, elapsed)
+
+
+def _handle_error(context):
+    # A failed statement never reaches after_cursor_execute; drop its start time.
+    conn = context.connection
+    if conn is None:
+        return
+    start_times = conn.info.get(_QUERY_START_KEY)
+    if start_times:
+        start_times.pop()
+
+
+def install_query_listeners(engine: Engine):
+    """Attach the statement timing listeners to `engine` (idempotent)."""
+    if id(engine) in _installed_engines:
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+    _installed_engines.add(id(engine))
+
+
+def install_query_stats_middleware(app, engine: Engine, repeat_threshold: int = 3):
+    """
+    Opt-in middleware that counts SQL statements and DB time per request.
+    Totals are returned as X-DB-Query-Count / X-DB-Time-Ms response headers and
+    statement shapes repeated `repeat_threshold` or more times are logged.
+    """
+    install_query_listeners(engine)
+
+    @app.middleware("http")
+    async def query_stats_middleware(request, call_next):
+        stats = QueryStats()
+        token = _request_stats.set(stats)
+        try:
+            response = await call_next(request)
+        finally:
+            _request_stats.reset(token)
+
+        response.headers["X-DB-Query-Count"] = str(stats.count)
+        response.headers["X-DB-Time-Ms"] = f"{stats.total_time * 1000:.2f}"
+
+        repeated = stats.repeated_shapes(repeat_threshold)
+        if repeated:
+            response.headers["X-DB-Repeated-Queries"] = str(len(repeated))
+            for shape, count in repeated:
+                logger.warning(
+                    "Possible N+1 on %s %s: statement ran %d times: %s",
+                    request.method,
+                    request.url.path,
+                    count,
+                    shape,
+                )
+        return response
+
+    return query_stats_middleware
+
+
+@contextmanager
+def count_queries(engine: Engine | None = None):
+    """
+    Collect every statement executed (from any thread) while the block runs.
+
+        with count_queries() as stats:
+            client.get("/api/v1/dashboard/")
+        assert stats.count <= 12
+    """
+    if engine is None:
+        from app.db.session import engine as default_engine
+
+        engine = default_engine
+    install_query_listeners(engine)
+
+    stats = QueryStats()
+    with _global_collectors_lock:
+        _global_collectors.append(stats)
+    try:
+        yield stats
+    finally:
+        with _global_collectors_lock:
+            _global_collectors.remove(stats)
+
+
+@contextmanager
+def assert_max_queries(max_count: int, engine: Engine | None = None):
+    """
+    Fail if the block executes more than `max_count` statements. Exposed to
+    tests as the `max_queries` fixture (conftest.py), next to `query_counter`.
+    """
+    with count_queries(engine) as stats:
+        yield stats
+
+    if stats.count > max_count:
+        repeated = "\n".join(
+            f"  {count}x {shape}" for shape, count in stats.repeated_shapes(2)
+        )
+        raise AssertionError(
+            f"Expected at most {max_count} SQL statements, got {stats.count}."
+            + (f"\nRepeated statements:\n{repeated}" if repeated else "")
+        )
@@ -9,6 +9,11 @@ from .financial_event import FinancialEvent
 from .bank_sync_status import BankSyncStatus, SyncStatusEnum
 from .goal import Goal, GoalType, GoalStatus
 from .stock_instrument import StockInstrument
+from .rate_limit_counter import RateLimitCounter
+from .daily_transaction_aggregate import DailyTransactionAggregate
+from .user_data_version import UserDataVersion
+from .user_evaluation_status import UserEvaluationStatus
+from .ai_suggestion_cache import AISuggestionCacheEntry
 
 __all__ = [
     "User",
@@ -27,4 +32,9 @@ __all__ = [
     "GoalType",
     "GoalStatus",
     "StockInstrument",
+    "RateLimitCounter",
+    "DailyTransactionAggregate",
+    "UserDataVersion",
+    "UserEvaluationStatus",
+    "AISuggestionCacheEntry",
 ]
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, String, DateTime, JSON
+from app.db.base import Base
+
+
+class AISuggestionCacheEntry(Base):
+    """
+    LLM spending suggestions for one fingerprint of top expense categories
+    (see app/services/ai_suggestions.py), shared by all users and workers.
+    """
+
+    __tablename__ = "ai_suggestion_cache"
+
+    fingerprint = Column(String(64), primary_key=True)
+    suggestions = Column(JSON, nullable=False)
+    generated_at = Column(DateTime(timezone=True), nullable=False)
@@ -7,6 +7,7 @@ from sqlalchemy import (
     DateTime,
     Enum as SQLAlchemyEnum,
     Boolean,
+    Index,
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
@@ -49,6 +50,11 @@ class Transaction(Base):
     description = Column(String)
     merchant = Column(String)
     category = Column(String)
+    spend_class = Column(String(20), nullable=True)  # discretionary/non_discretionary
+
+    __table_args__ = (
+        Index("ix_transactions_account_id_date", "account_id", "date"),
+    )
 
     user = relationship("User", back_populates="transactions")
     account = relationship("BankAccount", back_populates="transactions")
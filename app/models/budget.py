@@ -10,6 +10,8 @@ from sqlalchemy import (
     Date,
     func,
     Boolean,
+    Index,
+    text,
 )
 from sqlalchemy.orm import relationship
 from app.db.base import Base
@@ -34,4 +36,15 @@ class Budget(Base):
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     is_completed = Column(Boolean, nullable=False, default=False)
 
+    __table_args__ = (
+        Index(
+            "ix_budgets_active_user_category_period",
+            "user_id",
+            "category",
+            "start_date",
+            "end_date",
+            postgresql_where=text("is_completed = false"),
+        ),
+    )
+
     user = relationship("User", back_populates="budgets")
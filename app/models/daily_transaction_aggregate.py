@@ -0,0 +1,49 @@
+import uuid
+from sqlalchemy import (
+    Column,
+    String,
+    Integer,
+    Numeric,
+    Date,
+    ForeignKey,
+    Index,
+    UniqueConstraint,
+)
+from sqlalchemy.dialects.postgresql import UUID
+from app.db.base import Base
+
+
+class DailyTransactionAggregate(Base):
+    """
+    Per-day DEBIT/CREDIT totals for one account and category, maintained in the
+    same database transaction as each ingested Transaction. Days are UTC dates;
+    a missing category is stored as "" so the unique key can be upserted, and
+    the key treats NULL account_ids as equal (Postgres 15+) for the same reason.
+    """
+
+    __tablename__ = "daily_transaction_aggregates"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(String, ForeignKey("users.user_id"), nullable=False)
+    account_id = Column(
+        UUID(as_uuid=True), ForeignKey("bank_accounts.id"), nullable=True
+    )
+    day = Column(Date, nullable=False)
+    category = Column(String, nullable=False, default="")
+    type = Column(String(10), nullable=False)  # DEBIT/CREDIT
+    total_amount = Column(Numeric(14, 2), nullable=False, default=0)
+    tx_count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id",
+            "account_id",
+            "day",
+            "category",
+            "type",
+            name="uq_daily_transaction_aggregate",
+            postgresql_nulls_not_distinct=True,
+        ),
+        Index("ix_daily_transaction_aggregates_account_day", "account_id", "day"),
+        Index("ix_daily_transaction_aggregates_user_day", "user_id", "day"),
+    )
@@ -11,7 +11,7 @@ class FinancialEvent(Base):
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, nullable=False
     )
     user_id = Column(String, nullable=False, index=True)
-    event_type = Column(String, nullable=False, index=True)
+    event_type = Column(String, nullable=False)
     entity_type = Column(String, nullable=False)
     entity_id = Column(String, nullable=False)
     payload = Column(JSON, nullable=False)
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, String, Integer, DateTime
+from app.db.base import Base
+
+
+class RateLimitCounter(Base):
+    """Fixed-window rate limit counters shared by every API worker."""
+
+    __tablename__ = "rate_limit_counters"
+
+    key = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, String, BigInteger, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+
+class UserDataVersion(Base):
+    """Monotonic counter bumped whenever a user's financial data changes."""
+
+    __tablename__ = "user_data_versions"
+
+    user_id = Column(String, ForeignKey("users.user_id"), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, String, BigInteger, DateTime, ForeignKey
+from app.db.base import Base
+
+
+class UserEvaluationStatus(Base):
+    """
+    Freshness marker for a user's budget close-out and reward evaluation:
+    when it last ran and the data version it saw.
+    """
+
+    __tablename__ = "user_evaluation_status"
+
+    user_id = Column(String, ForeignKey("users.user_id"), primary_key=True)
+    last_evaluated_at = Column(DateTime(timezone=True), nullable=False)
+    evaluated_version = Column(BigInteger, nullable=False, default=0)
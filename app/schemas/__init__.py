@@ -49,6 +49,8 @@ from .budget import (
     BudgetGoalMicroAlert,
     BudgetGoalPeriodReview,
     BudgetGoalPredictionExplanation,
+    BudgetGoalSimulationGridRequest,
+    BudgetGoalSimulationGridResult,
     BudgetGoalSimulationRequest,
     BudgetGoalSimulationResult,
     BudgetGoalStatus,
@@ -99,6 +101,8 @@ __all__ = [
     "BudgetGoalMicroAlert",
     "BudgetGoalPeriodReview",
     "BudgetGoalPredictionExplanation",
+    "BudgetGoalSimulationGridRequest",
+    "BudgetGoalSimulationGridResult",
     "BudgetGoalSimulationRequest",
     "BudgetGoalSimulationResult",
     "BudgetGoalStatus",
@@ -2,7 +2,7 @@
 from pydantic import BaseModel, Field
 from datetime import date, timedelta
 from decimal import Decimal
-from typing import Optional
+from typing import Annotated, Optional
 
 class BudgetBase(BaseModel):
     category: str
@@ -78,6 +78,31 @@ class BudgetGoalSimulationResult(BaseModel):
     simulated_remaining_budget: float
 
 
+class BudgetGoalSimulationGridRequest(BaseModel):
+    # Applied to each remaining day of the period; a daily cap of None means uncapped.
+    reduction_percents: list[Annotated[float, Field(ge=0, le=100)]] = Field(
+        default_factory=lambda: [0.0], min_length=1, max_length=101
+    )
+    daily_caps: list[Optional[Annotated[float, Field(ge=0)]]] = Field(
+        default_factory=lambda: [None], min_length=1, max_length=50
+    )
+
+
+class BudgetGoalSimulationGridResult(BaseModel):
+    budget_id: str
+    category: str
+    budget_amount: float
+    current_spend: float
+    days_left: int
+    baseline_projected_spend: float
+    baseline_overrun_probability: float
+    reduction_percents: list[float]
+    daily_caps: list[Optional[float]]
+    # [reduction index][daily cap index]
+    projected_spend: list[list[float]]
+    overrun_probability: list[list[float]]
+
+
 class BudgetGoalSuggestion(BaseModel):
     suggestion_type: str
     title: str
@@ -1,13 +1,19 @@
 from app.crud.budget import get_budgets_by_user
 from app.crud.daily_prediction import create_daily_prediction
 from ai.budget_prediction_model.inference import predict_next_day
+from ai.budget_prediction_model.registry import model_registry
+from app.config import settings
 from app.models.user import User
 from app.schemas.ai_predictions import DailyPredictionCreate
 from decimal import Decimal
 import logging
 from app.utils import dispatcher
+from app.utils.cache import register_cache
 from app.utils.events import PredictionGenerated
 
+model_registry.resize(settings.BUDGET_MODEL_CACHE_MAX_MB * 1024 * 1024)
+register_cache(model_registry.name, model_registry)
+
 
 def generate_and_store_predictions_for_user(
     db, user_id: str, time_horizon: str = "30d"
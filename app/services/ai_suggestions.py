@@ -0,0 +1,342 @@
+"""
+LLM spending suggestions for a user's top expense categories.
+
+The prompt only depends on the top (category, amount) pairs, so generations
+are cached under a fingerprint of those pairs with amounts bucketed on a
+log scale: users (and days) with similar spending share one generation.
+Entries are fresh for AI_SUGGESTIONS_TTL_SECONDS and are then served stale
+for up to AI_SUGGESTIONS_STALE_SECONDS while a refresh runs in the
+background. A nightly batch precomputes entries for active users, and every
+model call goes through one bounded queue.
+"""
+
+import asyncio
+import hashlib
+import logging
+import math
+import time
+from datetime import date, datetime, timezone
+
+import httpx
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+
+from app.config.settings import settings
+from app.db.advisory_lock import acquire_advisory_lock, release_advisory_lock
+from app.db.session import SessionLocal
+from app.models.ai_suggestion_cache import AISuggestionCacheEntry
+from app.models.bank import BankAccount
+from app.models.daily_transaction_aggregate import DailyTransactionAggregate
+from app.schemas.dashboard import AISuggestionItem
+from app.services.analytics_engine import rolling_month_window
+from app.utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# In-process front of the ai_suggestion_cache table:
+# fingerprint -> (generated_at epoch seconds, [{"category", "suggestion"}]).
+_suggestion_cache = TTLCache(
+    "ai_suggestions",
+    maxsize=settings.AI_SUGGESTIONS_CACHE_MAX_ENTRIES,
+    ttl=settings.AI_SUGGESTIONS_TTL_SECONDS + settings.AI_SUGGESTIONS_STALE_SECONDS,
+)
+
+# Bounded LLM queue: at most this many generations in flight per process,
+# one per fingerprint.
+_llm_slots = asyncio.Semaphore(settings.AI_SUGGESTIONS_LLM_CONCURRENCY)
+_refreshing: dict[str, asyncio.Task] = {}
+
+# One nightly precompute across all workers.
+_PRECOMPUTE_LOCK = "ai_suggestions_precompute"
+
+
+def build_fallback_suggestions(
+    top_expense_categories: list[tuple[str, float]],
+) -> list[AISuggestionItem]:
+    suggestions: list[AISuggestionItem] = []
+    for category, amount in top_expense_categories:
+        text = (
+            f"Your spending on {category} is high (Rs. {amount:.2f}). "
+            "Set a weekly cap and cut at least 10% from non-essential purchases in this category."
+        )
+        suggestions.append(AISuggestionItem(category=category, suggestion=text))
+    return suggestions
+
+
+def _amount_bucket(amount: float) -> int:
+    if amount <= 1:
+        return 0
+    base = math.log(settings.AI_SUGGESTIONS_AMOUNT_BUCKET_RATIO)
+    return int(round(math.log(amount) / base))
+
+
+def _bucket_amount(bucket: int) -> float:
+    """The amount every user in `bucket` is described with."""
+    return settings.AI_SUGGESTIONS_AMOUNT_BUCKET_RATIO**bucket
+
+
+def suggestion_fingerprint(top_expense_categories: list[tuple[str, float]]) -> str:
+    """Ranked, case-normalized categories with log-bucketed amounts."""
+    parts = [
+        f"{category.strip().lower()}:{_amount_bucket(amount)}"
+        for category, amount in top_expense_categories
+    ]
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()
+
+
+def _llm_prompt(top_expense_categories: list[tuple[str, float]]) -> str:
+    # The answer is shared by every user with this fingerprint, so the prompt
+    # only carries what the fingerprint does: bucketed, not exact, amounts.
+    category_lines = "\n".join(
+        [
+            f"- {category.strip().lower()}: about Rs. {_bucket_amount(bucket):.0f}"
+            for category, bucket in (
+                (category, _amount_bucket(amount))
+                for category, amount in top_expense_categories
+            )
+        ]
+    )
+    return (
+        "You are a financial coach.\n"
+        "Create exactly 3 concise spending suggestions based only on these top expense categories.\n"
+        "Return exactly 3 lines in this format: <category>|<suggestion>.\n"
+        "No numbering. No extra text.\n\n"
+        "Top expense categories:\n"
+        f"{category_lines}"
+    )
+
+
+async def _request_llm_suggestions(
+    top_expense_categories: list[tuple[str, float]],
+) -> list[dict] | None:
+    """Parsed model output, or None when the model fails or answers badly."""
+    prompt = _llm_prompt(top_expense_categories)
+
+    try:
+        async with httpx.AsyncClient(timeout=30) as client:
+            response = await client.post(
+                settings.OLLAMA_API_URL,
+                json={
+                    "model": "phi3:mini",
+                    "prompt": prompt,
+                    "stream": False,
+                },
+            )
+            response.raise_for_status()
+
+        raw_output = response.json().get("response", "")
+        parsed: list[dict] = []
+        for line in raw_output.splitlines():
+            if "|" not in line:
+                continue
+            category_part, suggestion_part = line.split("|", 1)
+            category = category_part.strip()
+            suggestion = suggestion_part.strip()
+            if not category or not suggestion:
+                continue
+            parsed.append({"category": category, "suggestion": suggestion})
+
+        if len(parsed) >= 3:
+            return parsed[:3]
+    except Exception:
+        logger.warning("AI suggestion generation failed", exc_info=True)
+    return None
+
+
+def _to_items(
+    entries: list[dict], top_expense_categories: list[tuple[str, float]]
+) -> list[AISuggestionItem]:
+    # Cached entries may come from another user's spelling of the category.
+    valid_categories = {
+        category.lower(): category for category, _ in top_expense_categories
+    }
+    return [
+        AISuggestionItem(
+            category=valid_categories.get(entry["category"].lower(), entry["category"]),
+            suggestion=entry["suggestion"],
+        )
+        for entry in entries
+    ]
+
+
+def _load_entries(fingerprints: list[str]) -> dict[str, tuple[float, list[dict]]]:
+    db = SessionLocal()
+    try:
+        rows = (
+            db.query(AISuggestionCacheEntry)
+            .filter(AISuggestionCacheEntry.fingerprint.in_(fingerprints))
+            .all()
+        )
+        return {
+            row.fingerprint: (row.generated_at.timestamp(), row.suggestions)
+            for row in rows
+        }
+    finally:
+        db.close()
+
+
+def _store_entry(fingerprint: str, generated_at: float, entries: list[dict]):
+    table = AISuggestionCacheEntry.__table__
+    values = {
+        "suggestions": entries,
+        "generated_at": datetime.fromtimestamp(generated_at, timezone.utc),
+    }
+    stmt = insert(table).values(fingerprint=fingerprint, **values)
+    stmt = stmt.on_conflict_do_update(index_elements=[table.c.fingerprint], set_=values)
+    db = SessionLocal()
+    try:
+        db.execute(stmt)
+        db.commit()
+    finally:
+        db.close()
+
+
+def _age(entry: tuple[float, list[dict]]) -> float:
+    return time.time() - entry[0]
+
+
+async def _lookup(fingerprint: str) -> tuple[float, list[dict]] | None:
+    """The cached entry unless it is past its stale-while-revalidate window."""
+    entry = _suggestion_cache.get(fingerprint)
+    if entry is None:
+        entry = (await asyncio.to_thread(_load_entries, [fingerprint])).get(fingerprint)
+        if entry is not None:
+            _suggestion_cache.set(fingerprint, entry)
+    max_age = settings.AI_SUGGESTIONS_TTL_SECONDS + settings.AI_SUGGESTIONS_STALE_SECONDS
+    if entry is None or _age(entry) >= max_age:
+        return None
+    return entry
+
+
+async def _generate(
+    fingerprint: str, top_expense_categories: list[tuple[str, float]]
+) -> list[dict] | None:
+    try:
+        async with _llm_slots:
+            entries = await _request_llm_suggestions(top_expense_categories)
+        if entries is None:
+            return None
+        generated_at = time.time()
+        _suggestion_cache.set(fingerprint, (generated_at, entries))
+        await asyncio.to_thread(_store_entry, fingerprint, generated_at, entries)
+        return entries
+    finally:
+        _refreshing.pop(fingerprint, None)
+
+
+def _ensure_generation(
+    fingerprint: str, top_expense_categories: list[tuple[str, float]]
+) -> asyncio.Task:
+    task = _refreshing.get(fingerprint)
+    if task is None:
+        task = asyncio.create_task(_generate(fingerprint, top_expense_categories))
+        _refreshing[fingerprint] = task
+    return task
+
+
+async def get_ai_suggestions(
+    top_expense_categories: list[tuple[str, float]],
+) -> list[AISuggestionItem] | None:
+    """
+    Suggestions for the top expense categories: cached when possible (stale
+    entries trigger a background refresh), otherwise generated. None when
+    the model fails. A caller's deadline only cancels the wait; the
+    generation still fills the cache.
+    """
+    if not top_expense_categories:
+        return []
+
+    fingerprint = suggestion_fingerprint(top_expense_categories)
+    entry = await _lookup(fingerprint)
+    if entry is not None:
+        if _age(entry) >= settings.AI_SUGGESTIONS_TTL_SECONDS:
+            _ensure_generation(fingerprint, top_expense_categories)
+        return _to_items(entry[1], top_expense_categories)
+
+    entries = await asyncio.shield(
+        _ensure_generation(fingerprint, top_expense_categories)
+    )
+    if entries is None:
+        return None
+    return _to_items(entries, top_expense_categories)
+
+
+def _active_top_expense_categories(
+    start_day: date, end_day: date
+) -> list[list[tuple[str, float]]]:
+    """
+    Top three DEBIT categories over [start_day, end_day] for every active
+    Nabil account, ranked and labelled the way the dashboard ranks them.
+    """
+    db = SessionLocal()
+    try:
+        total = func.sum(DailyTransactionAggregate.total_amount)
+        rows = (
+            db.query(
+                DailyTransactionAggregate.account_id,
+                DailyTransactionAggregate.category,
+                total,
+            )
+            .join(BankAccount, BankAccount.id == DailyTransactionAggregate.account_id)
+            .filter(
+                BankAccount.is_active == True,
+                func.lower(BankAccount.bank_name).like("%nabil%"),
+                DailyTransactionAggregate.type == "DEBIT",
+                DailyTransactionAggregate.day >= start_day,
+                DailyTransactionAggregate.day <= end_day,
+            )
+            .group_by(
+                DailyTransactionAggregate.account_id, DailyTransactionAggregate.category
+            )
+            .order_by(DailyTransactionAggregate.account_id, total.desc())
+            .all()
+        )
+    finally:
+        db.close()
+
+    by_account: dict = {}
+    for account_id, category, amount in rows:
+        top = by_account.setdefault(account_id, [])
+        if len(top) < 3:
+            top.append((category if category else "Uncategorized", float(amount)))
+    return list(by_account.values())
+
+
+async def precompute_ai_suggestions_once() -> int:
+    """
+    Warm the cache for every active user's current fingerprint. Returns
+    generations run; 0 when another worker is already running the batch.
+    """
+    claim = await asyncio.to_thread(acquire_advisory_lock, _PRECOMPUTE_LOCK)
+    if claim is None:
+        logger.info("AI suggestion precompute already running in another worker")
+        return 0
+    try:
+        return await _precompute()
+    finally:
+        await asyncio.to_thread(release_advisory_lock, claim)
+
+
+async def _precompute() -> int:
+    # Same rolling window GET /dashboard ranks over, so fingerprints match.
+    month_start, month_end = rolling_month_window(datetime.now(timezone.utc))
+    candidates = await asyncio.to_thread(
+        _active_top_expense_categories, month_start.date(), month_end.date()
+    )
+
+    by_fingerprint = {
+        suggestion_fingerprint(top_expense_categories): top_expense_categories
+        for top_expense_categories in candidates
+    }
+    existing = await asyncio.to_thread(_load_entries, list(by_fingerprint))
+
+    pending = [
+        _ensure_generation(fingerprint, top_expense_categories)
+        for fingerprint, top_expense_categories in by_fingerprint.items()
+        if fingerprint not in existing
+        or _age(existing[fingerprint]) >= settings.AI_SUGGESTIONS_TTL_SECONDS
+    ]
+
+    # The semaphore bounds how many of these reach the model at once.
+    results = await asyncio.gather(*pending, return_exceptions=True)
+    return sum(1 for result in results if isinstance(result, list))
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+_MONTH_ABBR = np.array(
+    ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+)
+
+DEBIT = 0
+CREDIT = 1
+
+
+@dataclass
+class PeriodPivot:
+    """
+    Amount totals for one granularity. `codes` are sorted integer period codes
+    (year, year*12+month-1 or iso_year*100+iso_week); `totals[:, DEBIT]` and
+    `totals[:, CREDIT]` hold the sums and `counts` the number of source rows.
+    """
+
+    codes: np.ndarray
+    totals: np.ndarray
+    counts: np.ndarray
+
+    def column(self, type_index: int, present_only: bool = False):
+        """(codes, totals) for one type; optionally only periods with rows of that type."""
+        if not present_only:
+            return self.codes, self.totals[:, type_index]
+        mask = self.counts[:, type_index] > 0
+        return self.codes[mask], self.totals[mask, type_index]
+
+    def lookup(self, codes: np.ndarray, type_index: int) -> np.ndarray:
+        """Totals for the given period codes, 0 where a period has no rows."""
+        result = np.zeros(len(codes), dtype=np.float64)
+        if not len(self.codes):
+            return result
+        positions = np.searchsorted(self.codes, codes)
+        positions = np.clip(positions, 0, len(self.codes) - 1)
+        found = self.codes[positions] == codes
+        result[found] = self.totals[positions[found], type_index]
+        return result
+
+
+@dataclass
+class AnalyticsPivots:
+    yearly: PeriodPivot
+    monthly: PeriodPivot
+    weekly: PeriodPivot
+    categories: np.ndarray
+    category_totals: np.ndarray
+    category_counts: np.ndarray
+
+    @property
+    def total_expense(self) -> float:
+        return float(self.yearly.totals[:, DEBIT].sum())
+
+    @property
+    def total_income(self) -> float:
+        return float(self.yearly.totals[:, CREDIT].sum())
+
+    def top_categories(self, type_index: int, limit: int = 5) -> list[tuple[str, float]]:
+        """
+        Largest categories for a type, ties kept in category order.
+        Uncategorized rows ("", which is how NULL categories are stored) are
+        left out, as the per-transaction groupby dropped NULL categories.
+        """
+        present = np.flatnonzero(
+            (self.category_counts[:, type_index] > 0) & (self.categories != "")
+        )
+        values = self.category_totals[present, type_index]
+        order = np.argsort(-values, kind="stable")[:limit]
+        return [(self.categories[present[i]], float(values[i])) for i in order]
+
+
+def _pivot(codes: np.ndarray, type_index: np.ndarray, amount: np.ndarray) -> PeriodPivot:
+    unique_codes, inverse = np.unique(codes, return_inverse=True)
+    cells = inverse * 2 + type_index
+    size = len(unique_codes) * 2
+    totals = np.bincount(cells, weights=amount, minlength=size).reshape(-1, 2)
+    counts = np.bincount(cells, minlength=size).reshape(-1, 2)
+    return PeriodPivot(codes=unique_codes, totals=totals, counts=counts)
+
+
+def period_codes(days: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Integer year, month and ISO-week codes for an array of datetime64[D] days."""
+    days = days.astype("datetime64[D]")
+    years = days.astype("datetime64[Y]").astype(np.int64) + 1970
+    months = days.astype("datetime64[M]").astype(np.int64) % 12
+    month_codes = years * 12 + months
+
+    # ISO week: the week belongs to the year of its Thursday.
+    day_numbers = days.astype(np.int64)
+    weekday = (day_numbers + 3) % 7  # Monday == 0 (1970-01-01 was a Thursday)
+    thursdays = (day_numbers - weekday + 3).astype("datetime64[D]")
+    iso_years = thursdays.astype("datetime64[Y]").astype(np.int64) + 1970
+    iso_year_starts = thursdays.astype("datetime64[Y]").astype("datetime64[D]")
+    iso_weeks = (thursdays - iso_year_starts).astype(np.int64) // 7 + 1
+    week_codes = iso_years * 100 + iso_weeks
+
+    return years, month_codes, week_codes
+
+
+def rolling_month_window(now: datetime) -> tuple[pd.Timestamp, pd.Timestamp]:
+    """The dashboard's "month": a fixed 4-week window ending at `now`."""
+    month_end = pd.Timestamp(now)
+    month_start = (month_end - pd.Timedelta(days=27)).replace(
+        hour=0,
+        minute=0,
+        second=0,
+        microsecond=0,
+    )
+    return month_start, month_end
+
+
+def month_code(year: int, month: int) -> int:
+    return year * 12 + (month - 1)
+
+
+def month_labels(codes: np.ndarray) -> list[str]:
+    """'%b %Y' labels for month codes."""
+    return [f"{_MONTH_ABBR[code % 12]} {code // 12}" for code in codes.tolist()]
+
+
+def week_labels(codes: np.ndarray) -> list[str]:
+    """'%G-W%V' labels for ISO week codes."""
+    return [f"{code // 100}-W{code % 100:02d}" for code in codes.tolist()]
+
+
+def build_analytics_pivots(
+    days: np.ndarray,
+    types: np.ndarray,
+    categories: np.ndarray,
+    amounts: np.ndarray,
+) -> AnalyticsPivots:
+    """
+    One pass over (day, type, category, amount) rows producing the yearly,
+    monthly, ISO-weekly and per-category DEBIT/CREDIT pivots every analytics
+    chart is derived from. Rows that are neither DEBIT nor CREDIT are ignored.
+    """
+    types = np.asarray(types, dtype=object)
+    is_debit = types == "DEBIT"
+    keep = is_debit | (types == "CREDIT")
+
+    days = np.asarray(days, dtype="datetime64[D]")[keep]
+    amounts = np.asarray(amounts, dtype=np.float64)[keep]
+    categories = np.asarray(categories, dtype=object)[keep]
+    type_index = np.where(is_debit[keep], DEBIT, CREDIT)
+
+    years, month_codes, week_codes = period_codes(days)
+
+    has_category = np.array([c is not None for c in categories], dtype=bool)
+    named = categories[has_category].astype(str)
+    category_names, category_inverse = np.unique(named, return_inverse=True)
+    cells = category_inverse * 2 + type_index[has_category]
+    size = len(category_names) * 2
+    category_totals = np.bincount(
+        cells, weights=amounts[has_category], minlength=size
+    ).reshape(-1, 2)
+    category_counts = np.bincount(cells, minlength=size).reshape(-1, 2)
+
+    return AnalyticsPivots(
+        yearly=_pivot(years, type_index, amounts),
+        monthly=_pivot(month_codes, type_index, amounts),
+        weekly=_pivot(week_codes, type_index, amounts),
+        categories=category_names,
+        category_totals=category_totals,
+        category_counts=category_counts,
+    )
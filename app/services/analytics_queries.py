@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models.bank import Transaction
+from app.services.spend_classifier import (
+    DISCRETIONARY,
+    NON_DISCRETIONARY,
+    classify_spend,
+)
+
+
+def get_account_date_bounds(
+    db: Session, account_id: uuid.UUID
+) -> tuple[datetime | None, datetime | None]:
+    """Earliest and latest transaction timestamps on the account."""
+    return (
+        db.query(func.min(Transaction.date), func.max(Transaction.date))
+        .filter(Transaction.account_id == account_id)
+        .one()
+    )
+
+
+def get_window_day_totals(
+    db: Session, account_id: uuid.UUID, start: datetime, end: datetime
+) -> dict[str, np.ndarray]:
+    """
+    Sum of amounts per (UTC day, type, category) for transactions in
+    [start, end], as compact column arrays. Every analytics period (year,
+    month, ISO week) is a whole number of UTC days, so these rows roll up to
+    the same totals as the individual transactions. A missing category is
+    returned as "", like the daily aggregates store it.
+    """
+    day = func.date_trunc("day", func.timezone("UTC", Transaction.date))
+    category = func.coalesce(Transaction.category, "").label("category")
+    rows = (
+        db.query(
+            day.label("day"),
+            Transaction.type,
+            category,
+            func.sum(Transaction.amount).label("amount"),
+            func.count(Transaction.id).label("tx_count"),
+        )
+        .filter(
+            Transaction.account_id == account_id,
+            Transaction.date >= start,
+            Transaction.date <= end,
+        )
+        .group_by(day, Transaction.type, category)
+        .order_by(day)
+        .all()
+    )
+    return {
+        "day": np.array([row.day for row in rows], dtype="datetime64[D]"),
+        "type": np.array([row.type for row in rows], dtype=object),
+        "category": np.array([row.category for row in rows], dtype=object),
+        "amount": np.array([float(row.amount) for row in rows], dtype=np.float64),
+        "tx_count": np.array([row.tx_count for row in rows], dtype=np.int64),
+    }
+
+
+def get_window_spend_class_totals(
+    db: Session, account_id: uuid.UUID, start: datetime, end: datetime
+) -> dict[str, float]:
+    """
+    DEBIT totals per spend_class in the window. Rows ingested before the column
+    existed (spend_class NULL) are grouped by their text fields and classified
+    here, so the split is complete before the backfill has run.
+    """
+    window_filters = (
+        Transaction.account_id == account_id,
+        Transaction.type == "DEBIT",
+        Transaction.date >= start,
+        Transaction.date <= end,
+    )
+    totals = {DISCRETIONARY: 0.0, NON_DISCRETIONARY: 0.0}
+    has_unclassified = False
+    for spend_class, amount in (
+        db.query(Transaction.spend_class, func.sum(Transaction.amount))
+        .filter(*window_filters)
+        .group_by(Transaction.spend_class)
+        .all()
+    ):
+        if spend_class is None:
+            has_unclassified = True
+        else:
+            totals[spend_class] = totals.get(spend_class, 0.0) + float(amount)
+
+    if has_unclassified:
+        for category, description, merchant, amount in (
+            db.query(
+                Transaction.category,
+                Transaction.description,
+                Transaction.merchant,
+                func.sum(Transaction.amount),
+            )
+            .filter(*window_filters, Transaction.spend_class.is_(None))
+            .group_by(
+                Transaction.category, Transaction.description, Transaction.merchant
+            )
+            .all()
+        ):
+            spend_class = classify_spend(category, description, merchant)
+            totals[spend_class] += float(amount)
+
+    return totals
@@ -1,12 +1,14 @@
 from app.db.session import SessionLocal
 from app.services.ai_predictions import generate_and_store_predictions_for_user
-from app.crud.budget import update_completed_budgets_for_user
+from app.services.ai_suggestions import precompute_ai_suggestions_once
+from app.services.budget_closeout import close_expired_budgets_once
 from app.models.user import User
 from app.models.bank import BankAccount
 from app.models.bank_sync_status import BankSyncStatus
 from app.services.bank_sync import login_and_sync_all_accounts
 from app.services.bank_sync_status import record_bank_sync_attempt
-from datetime import datetime, timezone
+from app.services.user_evaluation import evaluate_due_users_once, evaluate_user
+from datetime import datetime, time, timedelta, timezone
 import asyncio
 import logging
 
@@ -19,8 +21,8 @@ def trigger_predictions_and_budget_evaluation(user_id: str):
     try:
         # Generate and store predictions (idempotent)
         generate_and_store_predictions_for_user(db, user_id)
-        # Update completed budgets and evaluate rewards
-        update_completed_budgets_for_user(db, user_id)
+        # Reconcile the budget ledger and evaluate rewards
+        evaluate_user(db, user_id)
     finally:
         db.close()
 
@@ -92,3 +94,46 @@ async def run_daily_bank_sync_loop(interval_minutes: int = 60):
             logger.exception("Unexpected error in daily bank sync loop")
 
         await asyncio.sleep(max(1, interval_minutes) * 60)
+
+
+async def run_user_evaluation_loop(interval_minutes: int = 15):
+    """Periodic ledger reconciliation and reward evaluation for users whose marker is stale."""
+    while True:
+        try:
+            evaluated = await asyncio.to_thread(evaluate_due_users_once)
+            if evaluated:
+                logger.info("Evaluated budgets/rewards for %s users", evaluated)
+        except Exception:
+            logger.exception("Unexpected error in user evaluation loop")
+
+        await asyncio.sleep(max(1, interval_minutes) * 60)
+
+
+def _seconds_until_hour_utc(hour: int) -> float:
+    now = datetime.now(timezone.utc)
+    next_run = datetime.combine(now.date(), time(hour % 24), tzinfo=timezone.utc)
+    if next_run <= now:
+        next_run += timedelta(days=1)
+    return (next_run - now).total_seconds()
+
+
+async def run_nightly_ai_suggestions_loop(hour_utc: int = 2):
+    """Precompute AI spending suggestions for active users once a night."""
+    while True:
+        await asyncio.sleep(_seconds_until_hour_utc(hour_utc))
+        try:
+            generated = await precompute_ai_suggestions_once()
+            logger.info("Precomputed AI suggestions for %s fingerprints", generated)
+        except Exception:
+            logger.exception("Unexpected error in nightly AI suggestions job")
+
+
+async def run_nightly_budget_closeout_loop(hour_utc: int = 0):
+    """Close every expired budget platform-wide once a night."""
+    while True:
+        await asyncio.sleep(_seconds_until_hour_utc(hour_utc))
+        try:
+            closed = await asyncio.to_thread(close_expired_budgets_once)
+            logger.info("Closed %s expired budgets", closed)
+        except Exception:
+            logger.exception("Unexpected error in nightly budget close-out job")
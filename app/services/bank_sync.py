@@ -13,11 +13,15 @@ from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 
 
+from app.crud.daily_aggregate import add_transaction_to_daily_aggregates
+from app.crud.budget_ledger import apply_transaction_to_budget_ledger
+from app.crud.user_data_version import bump_user_data_version
 from app.models.bank import BankAccount, Transaction
 from app.models.stock_instrument import StockInstrument
 from app.models.user import User
 from app.config.settings import settings
 from app.services.event_logger import log_event_async
+from app.services.spend_classifier import classify_transaction
 from app.utils import dispatcher
 from app.utils.events import TransactionCreated
 
@@ -234,6 +238,7 @@ def _sync_stock_instruments_for_user(
         synced_count += 1
 
     if synced_count > 0:
+        bump_user_data_version(db, user_id)
         db.commit()
 
     return synced_count
@@ -550,7 +555,10 @@ async def login_and_sync_all_accounts(
                             merchant=tx.get("merchant"),
                             category=tx.get("category"),
                         )
+                        new_tx.spend_class = classify_transaction(new_tx)
                         db.add(new_tx)
+                        add_transaction_to_daily_aggregates(db, new_tx)
+                        apply_transaction_to_budget_ledger(db, new_tx)
                         db.commit()
                         db.refresh(new_tx)
                         new_transactions_count += 1
@@ -0,0 +1,163 @@
+"""
+Nightly close-out of expired budgets for every user, set-based.
+
+Each batch selects expired, uncompleted budgets together with their
+month spend in one query (locked with SKIP LOCKED so concurrent workers
+split the work), marks them completed and applies XP, savings and
+goals_completed with bulk updates in one transaction. Vouchers,
+budget_completed events and reward evaluation then run per batch.
+"""
+
+import logging
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import bindparam, func, update
+
+from app.config import settings
+from app.crud.budget_ledger import budget_month_spend
+from app.crud.user_data_version import bump_user_data_versions
+from app.db.session import SessionLocal
+from app.models.budget import Budget
+from app.models.user import User
+from app.services.event_logger import log_events
+from app.services.reward_evaluation import evaluate_rewards
+from app.services.voucher_service import issue_vouchers_for_xp_batch
+
+logger = logging.getLogger(__name__)
+
+BUDGET_COMPLETION_XP = 10
+
+
+def _lock_expired_batch(db, today: date, limit: int):
+    return (
+        db.query(
+            Budget.id,
+            Budget.user_id,
+            Budget.category,
+            Budget.budget_amount,
+            budget_month_spend().label("spent"),
+        )
+        .filter(Budget.is_completed == False, Budget.end_date < today)
+        .order_by(Budget.user_id, Budget.end_date, Budget.id)
+        .limit(limit)
+        .with_for_update(of=Budget, skip_locked=True)
+        .all()
+    )
+
+
+def _close_batch(limit: int) -> int:
+    db = SessionLocal()
+    try:
+        rows = _lock_expired_batch(db, date.today(), limit)
+        if not rows:
+            return 0
+
+        met = [row for row in rows if Decimal(row.spent) <= row.budget_amount]
+        gains: dict[str, dict[str, int]] = defaultdict(
+            lambda: {"xp": 0, "savings": 0, "goals": 0}
+        )
+        for row in met:
+            gain = gains[row.user_id]
+            gain["xp"] += BUDGET_COMPLETION_XP
+            gain["goals"] += 1
+            if row.budget_amount > row.spent:
+                gain["savings"] += int(row.budget_amount - Decimal(row.spent))
+
+        db.query(Budget).filter(Budget.id.in_([row.id for row in rows])).update(
+            {Budget.is_completed: True}, synchronize_session=False
+        )
+        if gains:
+            users = User.__table__
+            db.execute(
+                update(users)
+                .where(users.c.user_id == bindparam("b_user_id"))
+                .values(
+                    total_xp=func.coalesce(users.c.total_xp, 0) + bindparam("b_xp"),
+                    savings=func.coalesce(users.c.savings, 0) + bindparam("b_savings"),
+                    goals_completed=func.coalesce(users.c.goals_completed, 0)
+                    + bindparam("b_goals"),
+                ),
+                [
+                    {
+                        "b_user_id": user_id,
+                        "b_xp": gain["xp"],
+                        "b_savings": gain["savings"],
+                        "b_goals": gain["goals"],
+                    }
+                    for user_id, gain in gains.items()
+                ],
+            )
+        bump_user_data_versions(db, [row.user_id for row in rows])
+        db.commit()
+
+        if met:
+            _after_close(db, met, gains)
+        return len(rows)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def _after_close(db, met: list, gains: dict[str, dict[str, int]]):
+    """Events, achievement vouchers and reward evaluation for met budgets."""
+    log_events(
+        [
+            {
+                "user_id": row.user_id,
+                "event_type": "budget_completed",
+                "entity_type": "budget",
+                "entity_id": str(row.id),
+                "payload": {
+                    "category": row.category,
+                    "budget_amount": float(row.budget_amount),
+                    "remaining_budget": float(row.budget_amount - Decimal(row.spent)),
+                    "xp_gained": BUDGET_COMPLETION_XP,
+                },
+            }
+            for row in met
+        ]
+    )
+
+    users = {
+        user.user_id: user
+        for user in db.query(User).filter(User.user_id.in_(list(gains))).all()
+    }
+
+    # One voucher per met budget, tiered on the XP right after that budget
+    # counted (as the per-budget path did).
+    grants = []
+    remaining_xp = {user_id: gain["xp"] for user_id, gain in gains.items()}
+    for row in met:
+        user = users.get(row.user_id)
+        if user is None:
+            continue
+        remaining_xp[row.user_id] -= BUDGET_COMPLETION_XP
+        xp_after = (user.total_xp or 0) - remaining_xp[row.user_id]
+        grants.append((row.user_id, xp_after, "budget_completed", str(row.id)))
+    try:
+        issue_vouchers_for_xp_batch(db, grants)
+    except Exception:
+        db.rollback()
+        logger.exception("Achievement voucher batch failed for %s budgets", len(grants))
+
+    for user in users.values():
+        try:
+            evaluate_rewards(db, user)
+        except Exception:
+            db.rollback()
+            logger.exception("Reward evaluation failed for user_id=%s", user.user_id)
+
+
+def close_expired_budgets_once(batch_size: int | None = None) -> int:
+    """Close every expired budget platform-wide. Returns how many were closed."""
+    batch_size = batch_size or settings.BUDGET_CLOSEOUT_BATCH_SIZE
+    closed = 0
+    while True:
+        batch = _close_batch(batch_size)
+        closed += batch
+        if batch < batch_size:
+            return closed
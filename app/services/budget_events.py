@@ -1,6 +1,9 @@
+import uuid
+
 from app.utils import dispatcher
 from app.utils.events import TransactionCreated, BudgetCompleted
-from app.crud.budget import get_budgets_by_user, evaluate_budget_completion
+from app.crud.budget import get_active_budgets_for_transaction, evaluate_budget_completion
+from app.models.bank import Transaction
 from app.models.user import User
 from app.models.budget import Budget
 from app.services.event_logger import log_event_async
@@ -9,10 +12,21 @@ from app.services.event_logger import log_event_async
 def handle_transaction_created(event: TransactionCreated):
     db = event.db
     user_id = event.user_id
+    try:
+        transaction_id = uuid.UUID(event.transaction_id)
+    except (TypeError, ValueError):
+        transaction_id = event.transaction_id
+    transaction = db.query(Transaction).filter(Transaction.id == transaction_id).first()
+    if not transaction:
+        return
+
+    # Only active budgets counting this transaction (category and month) can change.
+    budgets = get_active_budgets_for_transaction(db, transaction)
+    if not budgets:
+        return
     user = db.query(User).filter(User.user_id == user_id).first()
     if not user:
         return
-    budgets = get_budgets_by_user(db, user_id)
     for budget in budgets:
         if not budget.is_completed:
             completed = evaluate_budget_completion(db, budget, user)
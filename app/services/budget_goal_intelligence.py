@@ -1,10 +1,12 @@
 from __future__ import annotations
 
-from datetime import date, datetime, time
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
 from decimal import Decimal
 from statistics import mean
 
-from sqlalchemy import func
+import numpy as np
+from sqlalchemy import Date, and_, cast, func
 from sqlalchemy.orm import Session
 
 from app.models.bank import Transaction
@@ -44,16 +46,75 @@ def _sum_spend_for_period(
     return Decimal(total or 0)
 
 
-def _average_daily_spend(
+@dataclass(eq=False)
+class _SpendSeries:
+    """
+    One category's DEBIT spend per day from `start`, in integer cents so
+    window totals are exact and match _sum_spend_for_period.
+    """
+
+    start: date
+    cents: np.ndarray  # int64
+
+    def _window(self, start_date: date, end_date: date) -> slice:
+        lo = max(0, (start_date - self.start).days)
+        hi = max(lo, (end_date - self.start).days + 1)
+        return slice(lo, hi)
+
+    def total(self, start_date: date, end_date: date) -> Decimal:
+        return Decimal(int(self.cents[self._window(start_date, end_date)].sum())) / 100
+
+    def average_daily(self, start_date: date, end_date: date) -> Decimal:
+        days = max(1, (end_date - start_date).days + 1)
+        return self.total(start_date, end_date) / Decimal(days)
+
+    def daily_amounts(self, start_date: date, end_date: date) -> np.ndarray:
+        return self.cents[self._window(start_date, end_date)] / 100.0
+
+
+def _load_spend_series(
     db: Session,
     user_id: str,
     category: str,
     start_date: date,
     end_date: date,
-) -> Decimal:
-    spend = _sum_spend_for_period(db, user_id, category, start_date, end_date)
-    days = max(1, (end_date - start_date).days + 1)
-    return spend / Decimal(days)
+) -> _SpendSeries:
+    """The daily spend series for [start_date, end_date] in one grouped query."""
+    days = max(0, (end_date - start_date).days + 1)
+    cents = np.zeros(days, dtype=np.int64)
+    if days:
+        day = cast(Transaction.date, Date)
+        rows = (
+            db.query(day, func.sum(Transaction.amount))
+            .filter(
+                Transaction.user_id == user_id,
+                Transaction.type == "DEBIT",
+                Transaction.category == category,
+                Transaction.date >= datetime.combine(start_date, time.min),
+                Transaction.date <= datetime.combine(end_date, time.max),
+            )
+            .group_by(day)
+            .all()
+        )
+        for spend_day, total in rows:
+            offset = (spend_day - start_date).days
+            if 0 <= offset < days:
+                cents[offset] += int(Decimal(total or 0) * 100)
+    return _SpendSeries(start=start_date, cents=cents)
+
+
+def _closed_cycles(db: Session, user_id: str, budget: Budget, today: date) -> list[Budget]:
+    return (
+        db.query(Budget)
+        .filter(
+            Budget.user_id == user_id,
+            Budget.category == budget.category,
+            Budget.end_date < today,
+        )
+        .order_by(Budget.end_date.desc())
+        .limit(3)
+        .all()
+    )
 
 
 def _latest_prediction_for_category(
@@ -72,6 +133,71 @@ def _latest_prediction_for_category(
     )
 
 
+def _sum_spend_by_budget(
+    db: Session,
+    user_id: str,
+    today: date,
+    budget_ids: list[str] | None = None,
+) -> dict[str, Decimal]:
+    """
+    Spend of every budget of the user (or of `budget_ids`) from its start
+    date through min(today, end_date), in one grouped query over
+    (category, period).
+    """
+    period_end = func.least(Budget.end_date, today) + 1
+    query = (
+        db.query(Budget.id, func.sum(Transaction.amount))
+        .outerjoin(
+            Transaction,
+            and_(
+                Transaction.user_id == Budget.user_id,
+                Transaction.type == "DEBIT",
+                Transaction.category == Budget.category,
+                Transaction.date >= Budget.start_date,
+                Transaction.date < period_end,
+            ),
+        )
+        .filter(Budget.user_id == user_id)
+        .group_by(Budget.id)
+    )
+    if budget_ids is not None:
+        query = query.filter(Budget.id.in_(budget_ids))
+    return {str(budget_id): Decimal(total or 0) for budget_id, total in query.all()}
+
+
+def _latest_predictions_by_category(
+    db: Session,
+    user_id: str,
+    categories: set[str],
+) -> dict[str, DailyPrediction]:
+    if not categories:
+        return {}
+
+    rank = (
+        func.row_number()
+        .over(
+            partition_by=DailyPrediction.category,
+            order_by=DailyPrediction.prediction_date.desc(),
+        )
+        .label("rank")
+    )
+    ranked = (
+        db.query(DailyPrediction.id, rank)
+        .filter(
+            DailyPrediction.user_id == user_id,
+            DailyPrediction.category.in_(categories),
+        )
+        .subquery()
+    )
+    predictions = (
+        db.query(DailyPrediction)
+        .join(ranked, ranked.c.id == DailyPrediction.id)
+        .filter(ranked.c.rank == 1)
+        .all()
+    )
+    return {prediction.category: prediction for prediction in predictions}
+
+
 def _build_micro_alerts(
     progress_percent: float,
     days_left: int,
@@ -125,22 +251,13 @@ def _build_micro_alerts(
     return alerts
 
 
-def get_budget_goal_status(db: Session, user_id: str, budget_id: str) -> dict | None:
-    budget = _get_budget_for_user(db, user_id, budget_id)
-    if not budget:
-        return None
-
-    today = date.today()
+def _build_goal_status(
+    budget: Budget,
+    current_spend: Decimal,
+    prediction: DailyPrediction | None,
+    today: date,
+) -> dict:
     effective_end = min(today, budget.end_date)
-
-    current_spend = _sum_spend_for_period(
-        db,
-        user_id,
-        budget.category,
-        budget.start_date,
-        effective_end,
-    )
-
     budget_amount = Decimal(budget.budget_amount)
     remaining = budget_amount - current_spend
     elapsed_days = max(1, (effective_end - budget.start_date).days + 1)
@@ -149,7 +266,6 @@ def get_budget_goal_status(db: Session, user_id: str, budget_id: str) -> dict |
     burn_rate = current_spend / Decimal(elapsed_days)
     projected_spend = current_spend + (burn_rate * Decimal(days_left))
 
-    prediction = _latest_prediction_for_category(db, user_id, budget.category)
     risk_level = str(getattr(prediction, "risk_level", "")).upper()
     predicted_to_exceed = projected_spend > budget_amount or risk_level == "HIGH"
 
@@ -178,16 +294,47 @@ def get_budget_goal_status(db: Session, user_id: str, budget_id: str) -> dict |
     }
 
 
+def get_budget_goal_status(db: Session, user_id: str, budget_id: str) -> dict | None:
+    budget = _get_budget_for_user(db, user_id, budget_id)
+    if not budget:
+        return None
+
+    today = date.today()
+    current_spend = _sum_spend_for_period(
+        db,
+        user_id,
+        budget.category,
+        budget.start_date,
+        min(today, budget.end_date),
+    )
+    prediction = _latest_prediction_for_category(db, user_id, budget.category)
+    return _build_goal_status(budget, current_spend, prediction, today)
+
+
 def get_all_budget_goal_statuses(db: Session, user_id: str) -> list[dict]:
+    """
+    Same dicts as get_budget_goal_status for every budget of the user, in
+    three queries regardless of how many budgets there are.
+    """
     budgets = db.query(Budget).filter(Budget.user_id == user_id).all()
-    statuses: list[dict] = []
+    if not budgets:
+        return []
 
-    for budget in budgets:
-        status = get_budget_goal_status(db, user_id, str(budget.id))
-        if status:
-            statuses.append(status)
+    today = date.today()
+    spend_by_budget = _sum_spend_by_budget(db, user_id, today)
+    predictions = _latest_predictions_by_category(
+        db, user_id, {budget.category for budget in budgets}
+    )
 
-    return statuses
+    return [
+        _build_goal_status(
+            budget,
+            spend_by_budget.get(str(budget.id), Decimal(0)),
+            predictions.get(budget.category),
+            today,
+        )
+        for budget in budgets
+    ]
 
 
 def get_budget_prediction_explanation(
@@ -195,30 +342,35 @@ def get_budget_prediction_explanation(
     user_id: str,
     budget_id: str,
 ) -> dict | None:
-    status = get_budget_goal_status(db, user_id, budget_id)
-    if not status:
+    budget = _get_budget_for_user(db, user_id, budget_id)
+    if not budget:
         return None
 
-    prediction = _latest_prediction_for_category(db, user_id, status["category"])
-    risk_level = str(getattr(prediction, "risk_level", "MEDIUM")).upper()
-    risk_probability = float(getattr(prediction, "risk_probability", 0.5) or 0.5)
-
     today = date.today()
-    last_7_start = today.fromordinal(today.toordinal() - 6)
-    prev_7_start = today.fromordinal(today.toordinal() - 13)
-    prev_7_end = today.fromordinal(today.toordinal() - 7)
+    last_7_start = today - timedelta(days=6)
+    prev_7_start = today - timedelta(days=13)
+    prev_7_end = today - timedelta(days=7)
 
-    last_7_avg = _average_daily_spend(
-        db, user_id, status["category"], last_7_start, today
-    )
-    prev_7_avg = _average_daily_spend(
+    # One spend query covers the budget period and both trend weeks.
+    effective_end = min(today, budget.end_date)
+    series = _load_spend_series(
         db,
         user_id,
-        status["category"],
-        prev_7_start,
-        prev_7_end,
+        budget.category,
+        min(budget.start_date, prev_7_start),
+        max(effective_end, today),
+    )
+    prediction = _latest_prediction_for_category(db, user_id, budget.category)
+    status = _build_goal_status(
+        budget, series.total(budget.start_date, effective_end), prediction, today
     )
 
+    risk_level = str(getattr(prediction, "risk_level", "MEDIUM")).upper()
+    risk_probability = float(getattr(prediction, "risk_probability", 0.5) or 0.5)
+
+    last_7_avg = series.average_daily(last_7_start, today)
+    prev_7_avg = series.average_daily(prev_7_start, prev_7_end)
+
     drivers: list[dict] = []
 
     if prev_7_avg > 0 and last_7_avg > prev_7_avg:
@@ -311,6 +463,101 @@ def simulate_budget_goal(
     }
 
 
+def _normal_cdf(z: np.ndarray) -> np.ndarray:
+    # Abramowitz-Stegun 7.1.26 erf approximation (|error| < 1.5e-7).
+    x = np.abs(z) / np.sqrt(2.0)
+    t = 1.0 / (1.0 + 0.3275911 * x)
+    poly = t * (
+        0.254829592
+        + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429)))
+    )
+    erf = 1.0 - poly * np.exp(-x * x)
+    return 0.5 * (1.0 + np.sign(z) * erf)
+
+
+def _simulate_grid(
+    daily_spend: np.ndarray,
+    current_spend: float,
+    budget_amount: float,
+    days_left: int,
+    reduction_percents: np.ndarray,
+    daily_caps: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Projected period spend and overrun probability for every
+    (reduction, daily cap) pair. Each remaining day is modelled as a draw
+    from the observed daily spend, scaled by (1 - reduction) and clipped at
+    the cap; the remaining-period total uses a normal approximation.
+    """
+    history = daily_spend if len(daily_spend) else np.zeros(1)
+    # (reductions, caps, observed days)
+    adjusted = np.minimum(
+        history[None, None, :] * (1.0 - reduction_percents[:, None, None] / 100.0),
+        daily_caps[None, :, None],
+    )
+    daily_mean = adjusted.mean(axis=2)
+    daily_std = adjusted.std(axis=2)
+
+    projected = current_spend + days_left * daily_mean
+    headroom = budget_amount - projected
+    spread = np.sqrt(days_left) * daily_std
+    with np.errstate(divide="ignore", invalid="ignore"):
+        probability = 1.0 - _normal_cdf(headroom / spread)
+    # No uncertainty left: the projection either overruns or it does not.
+    probability = np.where(spread > 0, probability, (headroom < 0).astype(np.float64))
+    return projected, probability
+
+
+def simulate_budget_goal_grid(
+    db: Session,
+    user_id: str,
+    budget_id: str,
+    reduction_percents: list[float],
+    daily_caps: list[float | None],
+) -> dict | None:
+    budget = _get_budget_for_user(db, user_id, budget_id)
+    if not budget:
+        return None
+
+    today = date.today()
+    effective_end = min(today, budget.end_date)
+    series = _load_spend_series(
+        db, user_id, budget.category, budget.start_date, effective_end
+    )
+    daily_spend = series.daily_amounts(budget.start_date, effective_end)
+    # Pad to the elapsed-day count used by the goal status burn rate.
+    elapsed_days = max(1, (effective_end - budget.start_date).days + 1)
+    if len(daily_spend) < elapsed_days:
+        daily_spend = np.pad(daily_spend, (0, elapsed_days - len(daily_spend)))
+
+    current_spend = float(daily_spend.sum())
+    budget_amount = float(budget.budget_amount)
+    days_left = max(0, (budget.end_date - today).days)
+
+    reductions = np.array([0.0, *reduction_percents], dtype=np.float64)
+    caps = np.array(
+        [np.inf, *(np.inf if cap is None else cap for cap in daily_caps)],
+        dtype=np.float64,
+    )
+    projected, probability = _simulate_grid(
+        daily_spend, current_spend, budget_amount, days_left, reductions, caps
+    )
+
+    return {
+        "budget_id": str(budget.id),
+        "category": budget.category,
+        "budget_amount": budget_amount,
+        "current_spend": round(current_spend, 2),
+        "days_left": days_left,
+        "baseline_projected_spend": round(float(projected[0, 0]), 2),
+        "baseline_overrun_probability": round(float(probability[0, 0]), 4),
+        "reduction_percents": reduction_percents,
+        "daily_caps": daily_caps,
+        "projected_spend": np.round(projected[1:, 1:], 2).tolist(),
+        "overrun_probability": np.round(probability[1:, 1:], 4).tolist(),
+    }
+
+
 def get_budget_goal_suggestions(
     db: Session, user_id: str, budget_id: str
 ) -> dict | None:
@@ -381,49 +628,34 @@ def get_budget_goal_suggestions(
     }
 
 
-def get_adaptive_budget_adjustment(
+def _adaptive_adjustment(
     db: Session,
     user_id: str,
-    budget_id: str,
-) -> dict | None:
-    budget = _get_budget_for_user(db, user_id, budget_id)
-    if not budget:
-        return None
-
-    history = (
-        db.query(Budget)
-        .filter(
-            Budget.user_id == user_id,
-            Budget.category == budget.category,
-            Budget.end_date < date.today(),
-        )
-        .order_by(Budget.end_date.desc())
-        .limit(3)
-        .all()
-    )
-
+    budget: Budget,
+    history: list[Budget],
+    series: _SpendSeries,
+    today: date,
+) -> dict:
     current_budget = Decimal(budget.budget_amount)
 
     if not history:
-        status = get_budget_goal_status(db, user_id, budget_id)
-        if status and status["predicted_to_exceed"]:
+        prediction = _latest_prediction_for_category(db, user_id, budget.category)
+        status = _build_goal_status(
+            budget,
+            series.total(budget.start_date, min(today, budget.end_date)),
+            prediction,
+            today,
+        )
+        if status["predicted_to_exceed"]:
             recommended = current_budget * Decimal("1.10")
             reason = "No historical cycles found; current trend indicates likely overrun, so a 10% buffer is suggested."
         else:
             recommended = current_budget
             reason = "No historical cycles found; keeping current budget as baseline."
     else:
-        realized_spends: list[Decimal] = []
-        for entry in history:
-            realized_spends.append(
-                _sum_spend_for_period(
-                    db,
-                    user_id,
-                    entry.category,
-                    entry.start_date,
-                    entry.end_date,
-                )
-            )
+        realized_spends = [
+            series.total(entry.start_date, entry.end_date) for entry in history
+        ]
 
         avg_spend = Decimal(str(mean([float(item) for item in realized_spends])))
 
@@ -449,6 +681,35 @@ def get_adaptive_budget_adjustment(
     }
 
 
+def _load_cycles_series(
+    db: Session, user_id: str, budget: Budget, history: list[Budget], today: date
+) -> _SpendSeries:
+    """One spend series spanning the current budget and its closed cycles."""
+    cycles = [budget, *history]
+    return _load_spend_series(
+        db,
+        user_id,
+        budget.category,
+        min(entry.start_date for entry in cycles),
+        max(min(today, entry.end_date) for entry in cycles),
+    )
+
+
+def get_adaptive_budget_adjustment(
+    db: Session,
+    user_id: str,
+    budget_id: str,
+) -> dict | None:
+    budget = _get_budget_for_user(db, user_id, budget_id)
+    if not budget:
+        return None
+
+    today = date.today()
+    history = _closed_cycles(db, user_id, budget, today)
+    series = _load_cycles_series(db, user_id, budget, history, today)
+    return _adaptive_adjustment(db, user_id, budget, history, series, today)
+
+
 def get_budget_period_review(db: Session, user_id: str, budget_id: str) -> dict | None:
     budget = _get_budget_for_user(db, user_id, budget_id)
     if not budget:
@@ -458,13 +719,9 @@ def get_budget_period_review(db: Session, user_id: str, budget_id: str) -> dict
     is_closed = budget.end_date < today
     effective_end = budget.end_date if is_closed else today
 
-    total_spent = _sum_spend_for_period(
-        db,
-        user_id,
-        budget.category,
-        budget.start_date,
-        effective_end,
-    )
+    history = _closed_cycles(db, user_id, budget, today)
+    series = _load_cycles_series(db, user_id, budget, history, today)
+    total_spent = series.total(budget.start_date, effective_end)
 
     budget_amount = Decimal(budget.budget_amount)
     achieved = total_spent <= budget_amount
@@ -483,12 +740,8 @@ def get_budget_period_review(db: Session, user_id: str, budget_id: str) -> dict
             else "In progress but currently trending above budget."
         )
 
-    recommended = get_adaptive_budget_adjustment(db, user_id, budget_id)
-    next_recommended_budget = (
-        recommended["recommended_budget_amount"]
-        if recommended
-        else float(budget_amount)
-    )
+    recommended = _adaptive_adjustment(db, user_id, budget, history, series, today)
+    next_recommended_budget = recommended["recommended_budget_amount"]
 
     return {
         "budget_id": str(budget.id),
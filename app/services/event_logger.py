@@ -2,11 +2,26 @@ from sqlalchemy.orm import Session
 from app.models.financial_event import FinancialEvent
 from sqlalchemy.exc import SQLAlchemyError
 from typing import Any, Dict, List
+import datetime
+import decimal
 import logging
 import threading
 from app.db.session import SessionLocal
 
 
+def _make_json_safe(obj):
+    if isinstance(obj, dict):
+        return {k: _make_json_safe(v) for k, v in obj.items()}
+    elif isinstance(obj, list):
+        return [_make_json_safe(v) for v in obj]
+    elif isinstance(obj, (datetime.date, datetime.datetime)):
+        return obj.isoformat()
+    elif isinstance(obj, decimal.Decimal):
+        return float(obj)
+    else:
+        return obj
+
+
 def log_event_async(
     _unused_db: Session,
     user_id: str,
@@ -15,24 +30,10 @@ def log_event_async(
     entity_id: str,
     payload: Dict[str, Any],
 ):
-    import datetime, decimal, json
-
-    def make_json_safe(obj):
-        if isinstance(obj, dict):
-            return {k: make_json_safe(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [make_json_safe(v) for v in obj]
-        elif isinstance(obj, (datetime.date, datetime.datetime)):
-            return obj.isoformat()
-        elif isinstance(obj, decimal.Decimal):
-            return float(obj)
-        else:
-            return obj
-
     def _log():
         db = SessionLocal()
         try:
-            safe_payload = make_json_safe(payload)
+            safe_payload = _make_json_safe(payload)
             event = FinancialEvent(
                 user_id=user_id,
                 event_type=event_type,
@@ -51,6 +52,35 @@ def log_event_async(
     threading.Thread(target=_log, daemon=True).start()
 
 
+def log_events(events: List[Dict[str, Any]]):
+    """
+    Insert many events (dicts with user_id, event_type, entity_type,
+    entity_id and payload) in one transaction, synchronously. For batch jobs.
+    """
+    if not events:
+        return
+    db = SessionLocal()
+    try:
+        db.add_all(
+            [
+                FinancialEvent(
+                    user_id=event["user_id"],
+                    event_type=event["event_type"],
+                    entity_type=event["entity_type"],
+                    entity_id=event["entity_id"],
+                    payload=_make_json_safe(event["payload"]),
+                )
+                for event in events
+            ]
+        )
+        db.commit()
+    except SQLAlchemyError as e:
+        db.rollback()
+        logging.error(f"Failed to log {len(events)} events: {e}")
+    finally:
+        db.close()
+
+
 def fetch_user_timeline(db: Session, user_id: str) -> List[FinancialEvent]:
     return (
         db.query(FinancialEvent)
@@ -0,0 +1,99 @@
+import re
+
+DISCRETIONARY = "discretionary"
+NON_DISCRETIONARY = "non_discretionary"
+
+NON_DISCRETIONARY_KEYWORDS = (
+    "utility",
+    "electricity",
+    "water",
+    "gas",
+    "internet",
+    "rent",
+    "maintenance",
+    "insurance",
+    "medical",
+    "hospital",
+    "pharmacy",
+    "school",
+    "education",
+    "tuition",
+    "loan",
+    "emi",
+    "debt",
+    "grocer",
+    "grocery",
+    "supermarket",
+)
+
+DISCRETIONARY_KEYWORDS = (
+    "dining",
+    "restaurant",
+    "cafe",
+    "coffee",
+    "entertainment",
+    "movie",
+    "shopping",
+    "fashion",
+    "taxi",
+    "ride",
+    "travel",
+    "fuel",
+    "gym",
+    "subscription",
+    "delivery",
+    "snack",
+    "fast food",
+    "food",
+    "transport",
+)
+
+NEEDS_CATEGORIES = frozenset(
+    {
+        "utilities",
+        "maintenance",
+        "rent",
+        "insurance",
+        "healthcare",
+        "education",
+        "groceries",
+    }
+)
+
+
+def _keyword_pattern(keywords) -> re.Pattern:
+    # Substring match, longest alternatives first.
+    ordered = sorted(set(keywords), key=len, reverse=True)
+    return re.compile("|".join(re.escape(keyword) for keyword in ordered))
+
+
+_NON_DISCRETIONARY_PATTERN = _keyword_pattern(NON_DISCRETIONARY_KEYWORDS)
+_DISCRETIONARY_PATTERN = _keyword_pattern(DISCRETIONARY_KEYWORDS)
+
+
+def classify_spend(
+    category: str | None, description: str | None, merchant: str | None
+) -> str:
+    """
+    Wants/needs class for a transaction. Needs keywords anywhere in the
+    category, description or merchant win, then wants keywords, then the
+    category name; anything else counts as discretionary.
+    """
+    text = f"{category or ''} {description or ''} {merchant or ''}".lower()
+
+    if _NON_DISCRETIONARY_PATTERN.search(text):
+        return NON_DISCRETIONARY
+
+    if _DISCRETIONARY_PATTERN.search(text):
+        return DISCRETIONARY
+
+    if (category or "").lower().strip() in NEEDS_CATEGORIES:
+        return NON_DISCRETIONARY
+
+    return DISCRETIONARY
+
+
+def classify_transaction(transaction) -> str:
+    return classify_spend(
+        transaction.category, transaction.description, transaction.merchant
+    )
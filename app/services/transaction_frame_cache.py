@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.crud.daily_aggregate import get_all_daily_aggregates_by_account
+from app.crud.user_data_version import get_user_data_version
+from app.services.analytics_queries import get_window_day_totals
+from app.utils.cache import register_cache
+
+_TYPE_NAMES = np.array(["DEBIT", "CREDIT", "OTHER"], dtype=object)
+_TYPE_CODES = {"DEBIT": 0, "CREDIT": 1}
+
+
+@dataclass(eq=False)
+class TransactionFrame:
+    """
+    An account's daily (UTC) transaction totals as typed numpy columns, sorted
+    by day. Types and categories are stored as small integer codes; an
+    uncategorized row has category "" (as daily_transaction_aggregates
+    stores it), which gets its own code like any other category.
+    """
+
+    day: np.ndarray  # datetime64[D]
+    type_code: np.ndarray  # int8: 0 DEBIT, 1 CREDIT, 2 other
+    category_code: np.ndarray  # int32 index into categories
+    categories: np.ndarray  # object
+    amount: np.ndarray  # float64
+    tx_count: np.ndarray  # int32
+
+    @classmethod
+    def from_rows(cls, rows) -> "TransactionFrame":
+        categories: dict[str, int] = {}
+        category_codes = [
+            categories.setdefault(row.category or "", len(categories)) for row in rows
+        ]
+
+        return cls(
+            day=np.array([row.day for row in rows], dtype="datetime64[D]"),
+            type_code=np.array(
+                [_TYPE_CODES.get(row.type, 2) for row in rows], dtype=np.int8
+            ),
+            category_code=np.array(category_codes, dtype=np.int32),
+            categories=np.array(list(categories), dtype=object),
+            amount=np.array([float(row.total_amount) for row in rows], dtype=np.float64),
+            tx_count=np.array([row.tx_count for row in rows], dtype=np.int32),
+        )
+
+    def __len__(self) -> int:
+        return len(self.day)
+
+    @property
+    def nbytes(self) -> int:
+        category_bytes = sum(len(name) + 56 for name in self.categories)
+        return (
+            self.day.nbytes
+            + self.type_code.nbytes
+            + self.category_code.nbytes
+            + self.amount.nbytes
+            + self.tx_count.nbytes
+            + category_bytes
+        )
+
+    @property
+    def first_day(self) -> np.datetime64 | None:
+        return self.day[0] if len(self.day) else None
+
+    @property
+    def last_day(self) -> np.datetime64 | None:
+        return self.day[-1] if len(self.day) else None
+
+    def _bounds(self, start_day, end_day) -> slice:
+        start = 0 if start_day is None else np.searchsorted(
+            self.day, np.datetime64(start_day, "D"), side="left"
+        )
+        end = len(self.day) if end_day is None else np.searchsorted(
+            self.day, np.datetime64(end_day, "D"), side="right"
+        )
+        return slice(start, end)
+
+    def day_totals(self, start_day=None, end_day=None) -> dict[str, np.ndarray]:
+        """
+        Rows for days in [start_day, end_day] decoded into the same column
+        layout as analytics_queries.get_window_day_totals().
+        """
+        window = self._bounds(start_day, end_day)
+        return {
+            "day": self.day[window],
+            "type": _TYPE_NAMES[self.type_code[window]],
+            "category": self.categories[self.category_code[window]],
+            "amount": self.amount[window],
+            "tx_count": self.tx_count[window],
+        }
+
+    def to_dataframe(self, start_day=None, end_day=None) -> pd.DataFrame:
+        """date/amount/type/category frame (dates at UTC midnight) for a day range."""
+        totals = self.day_totals(start_day, end_day)
+        return pd.DataFrame(
+            {
+                "amount": totals["amount"],
+                "type": totals["type"],
+                "date": pd.to_datetime(totals["day"]).tz_localize("UTC"),
+                "category": totals["category"],
+            }
+        )
+
+
+class TransactionFrameCache:
+    """
+    LRU of TransactionFrames keyed by account and validated against the
+    owner's data version, bounded by total array memory rather than entries.
+    """
+
+    def __init__(self, name: str, max_bytes: int):
+        self.name = name
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        register_cache(name, self)
+
+    def get(self, account_id, version: int) -> TransactionFrame | None:
+        with self._lock:
+            entry = self._entries.get(account_id)
+            if entry is None or entry[0] != version:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(account_id)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, account_id, version: int, frame: TransactionFrame):
+        size = frame.nbytes
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(account_id, None)
+            if previous is not None:
+                self._bytes -= previous[1].nbytes
+            self._entries[account_id] = (version, frame)
+            self._bytes += size
+            while self._bytes > self.max_bytes and self._entries:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "name": self.name,
+            "size": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+transaction_frame_cache = TransactionFrameCache(
+    "transaction_frames", settings.TRANSACTION_FRAME_CACHE_MAX_MB * 1024 * 1024
+)
+
+
+def get_account_frame(db: Session, user_id: str, account_id) -> TransactionFrame:
+    """The account's daily frame, rebuilt from the aggregates table when stale."""
+    # Read the version first: a write landing in between only makes the cached
+    # frame newer than its version, and the next bump replaces it.
+    version = get_user_data_version(db, user_id)
+    frame = transaction_frame_cache.get(account_id, version)
+    if frame is None:
+        frame = TransactionFrame.from_rows(
+            get_all_daily_aggregates_by_account(db, account_id)
+        )
+        transaction_frame_cache.set(account_id, version, frame)
+    return frame
+
+
+def get_window_day_totals_from_frame(
+    db: Session, frame: TransactionFrame, account_id, start: pd.Timestamp, end: pd.Timestamp
+) -> dict[str, np.ndarray]:
+    """
+    Day totals for the exact [start, end] window: whole days come from the
+    cached frame and only partially covered edge days are queried.
+    """
+    start_day = start.normalize()
+    end_day = end.normalize()
+    one_day = pd.Timedelta(days=1)
+    last_instant = one_day - pd.Timedelta(microseconds=1)
+
+    first_full_day = start_day if start == start_day else start_day + one_day
+    last_full_day = end_day if end >= end_day + last_instant else end_day - one_day
+
+    if first_full_day > last_full_day:
+        return get_window_day_totals(
+            db, account_id, start.to_pydatetime(), end.to_pydatetime()
+        )
+
+    parts = [frame.day_totals(first_full_day.date(), last_full_day.date())]
+    if first_full_day != start_day:
+        parts.append(
+            get_window_day_totals(
+                db,
+                account_id,
+                start.to_pydatetime(),
+                (first_full_day - pd.Timedelta(microseconds=1)).to_pydatetime(),
+            )
+        )
+    if last_full_day != end_day:
+        parts.append(
+            get_window_day_totals(
+                db, account_id, (last_full_day + one_day).to_pydatetime(), end.to_pydatetime()
+            )
+        )
+    if len(parts) == 1:
+        return parts[0]
+    return {key: np.concatenate([part[key] for part in parts]) for key in parts[0]}
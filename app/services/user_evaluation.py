@@ -0,0 +1,138 @@
+import logging
+import threading
+from datetime import datetime, time, timezone
+
+from fastapi import BackgroundTasks
+from sqlalchemy import func, or_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.crud.budget_ledger import reconcile_remaining_budgets
+from app.crud.user_data_version import get_user_data_version
+from app.db.advisory_lock import advisory_lock
+from app.db.session import SessionLocal
+from app.models.user import User
+from app.models.user_data_version import UserDataVersion
+from app.models.user_evaluation_status import UserEvaluationStatus
+from app.services.reward_evaluation import evaluate_rewards
+
+logger = logging.getLogger(__name__)
+
+# Users with an evaluation queued or running in this process. Across
+# processes, evaluate_user claims the user with an advisory lock.
+_in_flight: set[str] = set()
+_in_flight_lock = threading.Lock()
+
+
+def _today_start() -> datetime:
+    return datetime.combine(
+        datetime.now(timezone.utc).date(), time.min, tzinfo=timezone.utc
+    )
+
+
+def _stale_condition():
+    return or_(
+        UserEvaluationStatus.user_id.is_(None),
+        UserEvaluationStatus.last_evaluated_at < _today_start(),
+        UserEvaluationStatus.evaluated_version
+        < func.coalesce(UserDataVersion.version, 0),
+    )
+
+
+def is_evaluation_stale(db: Session, user_id: str) -> bool:
+    """
+    True when budgets/rewards have not been evaluated today or the user's
+    data changed since the last evaluation. A single read.
+    """
+    stale = (
+        db.query(_stale_condition())
+        .select_from(User)
+        .outerjoin(UserEvaluationStatus, UserEvaluationStatus.user_id == User.user_id)
+        .outerjoin(UserDataVersion, UserDataVersion.user_id == User.user_id)
+        .filter(User.user_id == user_id)
+        .scalar()
+    )
+    return bool(stale)
+
+
+def evaluate_user(db: Session, user_id: str) -> bool:
+    """
+    Reconcile the remaining_budget ledger, re-evaluate rewards and stamp the
+    marker. Expired budgets are closed by the nightly close-out job. Returns
+    False without evaluating when another worker is evaluating the user.
+    """
+    with advisory_lock(f"user_evaluation:{user_id}") as claimed:
+        if not claimed:
+            return False
+        _evaluate_claimed_user(db, user_id)
+    return True
+
+
+def _evaluate_claimed_user(db: Session, user_id: str):
+    reconcile_remaining_budgets(db, user_id)
+    user = db.query(User).filter(User.user_id == user_id).first()
+    if user is not None:
+        evaluate_rewards(db, user)
+
+    table = UserEvaluationStatus.__table__
+    values = {
+        "last_evaluated_at": datetime.now(timezone.utc),
+        "evaluated_version": get_user_data_version(db, user_id),
+    }
+    stmt = insert(table).values(user_id=user_id, **values)
+    stmt = stmt.on_conflict_do_update(index_elements=[table.c.user_id], set_=values)
+    db.execute(stmt)
+    db.commit()
+
+
+def _claim(user_id: str) -> bool:
+    with _in_flight_lock:
+        if user_id in _in_flight:
+            return False
+        _in_flight.add(user_id)
+        return True
+
+
+def _run_claimed_evaluation(user_id: str) -> bool:
+    db = SessionLocal()
+    try:
+        return evaluate_user(db, user_id)
+    except Exception:
+        db.rollback()
+        logger.exception("Budget/reward evaluation failed for user_id=%s", user_id)
+        return False
+    finally:
+        db.close()
+        with _in_flight_lock:
+            _in_flight.discard(user_id)
+
+
+def request_user_evaluation(background_tasks: BackgroundTasks, user_id: str):
+    """Queue an evaluation after the response unless one is already pending."""
+    if _claim(user_id):
+        background_tasks.add_task(_run_claimed_evaluation, user_id)
+
+
+def evaluate_due_users_once(limit: int | None = None) -> int:
+    """Evaluate up to `limit` users whose marker is stale. Returns how many ran."""
+    limit = limit or settings.USER_EVALUATION_BATCH_SIZE
+    db = SessionLocal()
+    try:
+        due = [
+            user_id
+            for (user_id,) in db.query(User.user_id)
+            .outerjoin(UserEvaluationStatus, UserEvaluationStatus.user_id == User.user_id)
+            .outerjoin(UserDataVersion, UserDataVersion.user_id == User.user_id)
+            .filter(_stale_condition())
+            .limit(limit)
+            .all()
+        ]
+    finally:
+        db.close()
+
+    evaluated = 0
+    for user_id in due:
+        if _claim(user_id) and _run_claimed_evaluation(user_id):
+            evaluated += 1
+    return evaluated
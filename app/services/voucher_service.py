@@ -127,8 +127,8 @@ def issue_voucher_for_tier(
     )
 
 
-def derive_tier_from_xp(db: Session, total_xp: int) -> int | None:
-    max_available_tier = (
+def _max_available_tier(db: Session) -> int | None:
+    return (
         db.query(func.max(VoucherTemplate.tier_required))
         .filter(
             VoucherTemplate.is_active == True,
@@ -136,9 +136,77 @@ def derive_tier_from_xp(db: Session, total_xp: int) -> int | None:
         )
         .scalar()
     )
+
+
+def _tier_for_xp(total_xp: int, max_available_tier: int | None) -> int | None:
     if not max_available_tier:
         return None
 
     # Tier progression by XP blocks of 2000, clamped to available tiers
     computed_tier = (total_xp // 2000) + 1
     return min(max(1, computed_tier), int(max_available_tier))
+
+
+def derive_tier_from_xp(db: Session, total_xp: int) -> int | None:
+    return _tier_for_xp(total_xp, _max_available_tier(db))
+
+
+def issue_vouchers_for_xp_batch(
+    db: Session,
+    grants: list[tuple[str, int, str | None, str | None]],
+) -> list[UserVoucher]:
+    """
+    Issue one voucher per (user_id, total_xp, source_type, source_id) grant,
+    tiered like derive_tier_from_xp. Templates are resolved once per tier,
+    all vouchers are committed together and their voucher.issued events are
+    logged as one batch.
+    """
+    if not grants:
+        return []
+
+    from app.services.event_logger import log_events
+
+    max_available_tier = _max_available_tier(db)
+    templates: dict[int | None, VoucherTemplate | None] = {}
+    issued_at = datetime.utcnow()
+    issued: list[tuple[UserVoucher, VoucherTemplate, str | None, str | None]] = []
+
+    for user_id, total_xp, source_type, source_id in grants:
+        tier = _tier_for_xp(total_xp or 0, max_available_tier)
+        if tier not in templates:
+            templates[tier] = _resolve_voucher_template_for_tier(db, tier)
+        template = templates[tier]
+        if not template:
+            continue
+        user_voucher = UserVoucher(
+            user_id=user_id,
+            voucher_template_id=template.id,
+            code=generate_unique_voucher_code(),
+            issued_at=issued_at,
+            expires_at=issued_at + timedelta(days=template.validity_days),
+            status=VoucherStatus.ACTIVE,
+        )
+        db.add(user_voucher)
+        issued.append((user_voucher, template, source_type, source_id))
+
+    # Build the events before commit expires the new rows.
+    db.flush()
+    events = [
+        {
+            "user_id": user_voucher.user_id,
+            "event_type": "voucher.issued",
+            "entity_type": "voucher",
+            "entity_id": str(user_voucher.id),
+            "payload": {
+                "voucher_template_id": str(template.id),
+                "code": user_voucher.code,
+                "expires_at": user_voucher.expires_at.isoformat(),
+                "source_type": source_type,
+                "source_id": source_id,
+            },
+        }
+        for user_voucher, template, source_type, source_id in issued
+    ]
+    db.commit()
+    log_events(events)
+    return [user_voucher for user_voucher, _, _, _ in issued]
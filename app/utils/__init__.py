@@ -1,6 +1,8 @@
 from .auth import (
     get_password_hash,
     verify_password,
+    get_password_hash_async,
+    verify_password_async,
     create_access_token,
     create_refresh_token,
     decrypt_token,
@@ -13,6 +15,8 @@ from .events import dispatcher, DomainEvent
 __all__ = [
     "get_password_hash",
     "verify_password",
+    "get_password_hash_async",
+    "verify_password_async",
     "create_access_token",
     "create_refresh_token",
     "get_current_user",
@@ -1,3 +1,5 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from passlib.context import CryptContext
 from jwcrypto import jwk, jwe
@@ -31,6 +33,28 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+# Argon2 is deliberately CPU/memory heavy; the bounded pool keeps a login burst
+# from stalling the event loop and caps how many hashes run at once.
+_password_hash_executor = ThreadPoolExecutor(
+    max_workers=max(1, settings.PASSWORD_HASH_MAX_CONCURRENCY),
+    thread_name_prefix="password-hash",
+)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _password_hash_executor, verify_password, plain_password, hashed_password
+    )
+
+
+async def get_password_hash_async(password: str) -> str:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _password_hash_executor, get_password_hash, password
+    )
+
+
 # ------------------- Token Helpers ------------------- #
 def _create_jwe_token(data: dict, expires_delta: timedelta) -> str:
     """Helper to create encrypted JWE tokens with expiration."""
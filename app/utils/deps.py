@@ -1,7 +1,13 @@
+import hashlib
+import time
+
 from fastapi import Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import event
+from sqlalchemy.orm import Session, make_transient_to_detached
 from fastapi.security import OAuth2PasswordBearer
+from app.config import settings
 from app.utils.auth import decrypt_token
+from app.utils.cache import TTLCache
 from app.db import get_db
 from app.models import User
 
@@ -9,6 +15,90 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 temp_token_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/request-otp")
 reset_token_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/reset-password")
 
+# sha256(access token) -> decrypted claims, and user_id -> user column snapshot.
+_token_claims_cache = TTLCache(
+    "auth_token_claims",
+    maxsize=settings.AUTH_CACHE_MAX_ENTRIES,
+    ttl=settings.AUTH_CACHE_TTL_SECONDS,
+)
+_user_snapshot_cache = TTLCache(
+    "auth_user_snapshots",
+    maxsize=settings.AUTH_CACHE_MAX_ENTRIES,
+    ttl=settings.AUTH_CACHE_TTL_SECONDS,
+)
+
+# Columns served from the snapshot. The password hash and the XP/savings/goal
+# counters are left expired so they are always read from the database on access.
+_USER_SNAPSHOT_FIELDS = (
+    "user_id",
+    "name",
+    "email",
+    "profile_image_url",
+    "is_active",
+    "is_verified",
+    "created_at",
+)
+
+
+def decode_access_token_cached(token: str) -> dict:
+    """decrypt_token() with the result cached until the token expires (or the TTL)."""
+    cache_key = hashlib.sha256(token.encode("utf-8")).hexdigest()
+    payload = _token_claims_cache.get(cache_key)
+    if payload is not None:
+        return payload
+
+    payload = decrypt_token(token)
+    ttl = float(settings.AUTH_CACHE_TTL_SECONDS)
+    if payload.get("exp"):
+        ttl = min(ttl, payload["exp"] - time.time())
+    if ttl > 0:
+        _token_claims_cache.set(cache_key, payload, ttl=ttl)
+    return payload
+
+
+def _get_user_cached(db: Session, user_id: str) -> User | None:
+    snapshot = _user_snapshot_cache.get(user_id)
+    if snapshot is None:
+        user = db.query(User).filter(User.user_id == user_id).first()
+        if user:
+            _user_snapshot_cache.set(
+                user_id, {field: getattr(user, field) for field in _USER_SNAPSHOT_FIELDS}
+            )
+        return user
+
+    # Attach the snapshot to this session as a persistent User without a SELECT;
+    # attributes outside the snapshot lazy-load if a handler touches them.
+    user = User(**snapshot)
+    make_transient_to_detached(user)
+    return db.merge(user, load=False)
+
+
+def invalidate_cached_user(user_id: str):
+    _user_snapshot_cache.pop(user_id)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_users(session, flush_context):
+    changed = {
+        obj.user_id
+        for obj in (*session.dirty, *session.deleted)
+        if isinstance(obj, User)
+    }
+    if changed:
+        session.info.setdefault("changed_user_ids", set()).update(changed)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_users(session):
+    # Password resets, profile updates and XP changes all flush the User row.
+    for user_id in session.info.pop("changed_user_ids", ()):
+        invalidate_cached_user(user_id)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_changed_users(session, previous_transaction):
+    session.info.pop("changed_user_ids", None)
+
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
@@ -21,7 +111,7 @@ async def get_current_user(
     )
 
     try:
-        payload = decrypt_token(token)
+        payload = decode_access_token_cached(token)
         if payload.get("token_type") == "temp":
             raise credentials_exception
         user_id = payload.get("id")
@@ -32,7 +122,7 @@ async def get_current_user(
         print("Token decryption failed:", str(e))
         raise credentials_exception
 
-    user = db.query(User).filter(User.user_id == user_id).first()
+    user = _get_user_cached(db, user_id)
     if not user:
         raise credentials_exception
 
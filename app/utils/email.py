@@ -1,52 +1,50 @@
+import queue
 import smtplib
+import threading
+import time
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from string import Template
 from app.config import settings
 
+_OTP_PURPOSES = {
+    "account_verification": {
+        "subject": "Verify Your Email - SaveMarga",
+        "title": "Email Verification",
+        "intro": "Thank you for signing up with <b>SaveMarga</b>.",
+        "instruction": "Please use the following OTP to verify your account:",
+        "icon": """
+            <svg xmlns="http://www.w3.org/2000/svg" width="48" height="48" fill="#2B74F5" viewBox="0 0 24 24">
+              <path d="M12 1a11 11 0 1 0 11 11A11.013 11.013 0 0 0 12 1Zm0 19.933A8.933 8.933 0 1 1 20.933 12 8.944 8.944 0 0 1 12 20.933ZM10.293 13.707l-2-2a1 1 0 0 1 1.414-1.414L11 11.586l3.293-3.293a1 1 0 1 1 1.414 1.414l-4 4a1 1 0 0 1-1.414 0Z"/>
+            </svg>
+        """,
+    },
+    "two_factor_auth": {
+        "subject": "Login Verification - SaveMarga",
+        "title": "Two-Factor Authentication",
+        "intro": "We detected a login attempt to your <b>SaveMarga</b> account.",
+        "instruction": "Use the OTP below to complete your login:",
+        "icon": """
+            <svg xmlns="http://www.w3.org/2000/svg" width="48" height="48" fill="#2B74F5" viewBox="0 0 24 24">
+              <path d="M12 2a5 5 0 0 1 5 5v3h1a2 2 0 0 1 2 2v8a2 2 0 0 1-2 2H6a2 2 0 0 1-2-2v-8a2 2 0 0 1 2-2h1V7a5 5 0 0 1 5-5Zm0 2a3 3 0 0 0-3 3v3h6V7a3 3 0 0 0-3-3Z"/>
+            </svg>
+        """,
+    },
+    "password_reset": {
+        "subject": "Reset Your Password - SaveMarga",
+        "title": "Password Reset Request",
+        "intro": "We received a request to reset your <b>SaveMarga</b> account password.",
+        "instruction": "Use the OTP below to reset your password:",
+        "icon": """
+            <svg xmlns="http://www.w3.org/2000/svg" width="48" height="48" fill="#2B74F5" viewBox="0 0 24 24">
+              <path d="M13 3a9 9 0 1 0 9 9h-2a7 7 0 1 1-7-7V3Zm0 4v5l4.28 2.54 1-1.74L14 11V7h-1Z"/>
+            </svg>
+        """,
+    },
+}
 
-def send_otp_email(to_email: str, otp: str, purpose: str):
-    # Define content for each OTP type
-    purposes = {
-        "account_verification": {
-            "subject": "Verify Your Email - SaveMarga",
-            "title": "Email Verification",
-            "intro": "Thank you for signing up with <b>SaveMarga</b>.",
-            "instruction": "Please use the following OTP to verify your account:",
-            "icon": """
-                <svg xmlns="http://www.w3.org/2000/svg" width="48" height="48" fill="#2B74F5" viewBox="0 0 24 24">
-                  <path d="M12 1a11 11 0 1 0 11 11A11.013 11.013 0 0 0 12 1Zm0 19.933A8.933 8.933 0 1 1 20.933 12 8.944 8.944 0 0 1 12 20.933ZM10.293 13.707l-2-2a1 1 0 0 1 1.414-1.414L11 11.586l3.293-3.293a1 1 0 1 1 1.414 1.414l-4 4a1 1 0 0 1-1.414 0Z"/>
-                </svg>
-            """,
-        },
-        "two_factor_auth": {
-            "subject": "Login Verification - SaveMarga",
-            "title": "Two-Factor Authentication",
-            "intro": "We detected a login attempt to your <b>SaveMarga</b> account.",
-            "instruction": "Use the OTP below to complete your login:",
-            "icon": """
-                <svg xmlns="http://www.w3.org/2000/svg" width="48" height="48" fill="#2B74F5" viewBox="0 0 24 24">
-                  <path d="M12 2a5 5 0 0 1 5 5v3h1a2 2 0 0 1 2 2v8a2 2 0 0 1-2 2H6a2 2 0 0 1-2-2v-8a2 2 0 0 1 2-2h1V7a5 5 0 0 1 5-5Zm0 2a3 3 0 0 0-3 3v3h6V7a3 3 0 0 0-3-3Z"/>
-                </svg>
-            """,
-        },
-        "password_reset": {
-            "subject": "Reset Your Password - SaveMarga",
-            "title": "Password Reset Request",
-            "intro": "We received a request to reset your <b>SaveMarga</b> account password.",
-            "instruction": "Use the OTP below to reset your password:",
-            "icon": """
-                <svg xmlns="http://www.w3.org/2000/svg" width="48" height="48" fill="#2B74F5" viewBox="0 0 24 24">
-                  <path d="M13 3a9 9 0 1 0 9 9h-2a7 7 0 1 1-7-7V3Zm0 4v5l4.28 2.54 1-1.74L14 11V7h-1Z"/>
-                </svg>
-            """,
-        },
-    }
-
-    # Default to registration if purpose not recognized
-    content = purposes.get(purpose, purposes["account_verification"])
-
-    # HTML Email Template
-    html_body = f"""
+_OTP_HTML_TEMPLATE = Template(
+    """
     <html>
       <body style="margin:0; padding:0; font-family:'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; background-color:transparent; color:#FFFFFF;">
         <table align="center" width="100%" style="max-width:600px; background-color:#0C0C0C; border-radius:12px; overflow:hidden;">
@@ -58,16 +56,16 @@ def send_otp_email(to_email: str, otp: str, purpose: str):
           <tr>
             <td style="padding:35px;">
               <div style="text-align:center; margin-bottom:20px;">
-                {content["icon"]}
+                $icon
               </div>
-              <h2 style="text-align:center; color:#FFAA2D; margin-bottom:15px;">{content["title"]}</h2>
+              <h2 style="text-align:center; color:#FFAA2D; margin-bottom:15px;">$title</h2>
               <p style="text-align:center; color:#CCCCCC; font-size:15px;">
-                {content["intro"]}<br><br>{content["instruction"]}
+                $intro<br><br>$instruction
               </p>
 
               <div style="text-align:center; margin:30px 0;">
                 <div style="display:inline-block; background-color:transparent; border:2px solid #2B74F5; border-radius:10px; padding:20px 50px; font-size:28px; font-weight:bold; color:#FFAA2D; letter-spacing:4px;">
-                  {otp}
+                  $otp
                 </div>
               </div>
 
@@ -85,34 +83,182 @@ def send_otp_email(to_email: str, otp: str, purpose: str):
       </body>
     </html>
     """
+)
 
-    # Plaintext Fallback
-    text_body = f"""
-{content['title']}
+_OTP_TEXT_TEMPLATE = Template(
+    """
+$title
 -----------------------
-{content['intro']}
-{content['instruction']}
+$intro
+$instruction
 
-Your OTP is: {otp}
+Your OTP is: $otp
 
 This OTP will expire in 10 minutes. Do not share it with anyone.
 """
+)
+
+# Per-purpose templates with everything but the OTP filled in, built once at import.
+_COMPILED_OTP_TEMPLATES = {
+    purpose: (
+        content["subject"],
+        Template(_OTP_TEXT_TEMPLATE.safe_substitute(content)),
+        Template(_OTP_HTML_TEMPLATE.safe_substitute(content)),
+    )
+    for purpose, content in _OTP_PURPOSES.items()
+}
+
+
+def build_otp_message(to_email: str, otp: str, purpose: str) -> MIMEMultipart:
+    # Default to registration if purpose not recognized
+    subject, text_template, html_template = _COMPILED_OTP_TEMPLATES.get(
+        purpose, _COMPILED_OTP_TEMPLATES["account_verification"]
+    )
 
-    # Build Email
     message = MIMEMultipart("alternative")
     message["From"] = settings.SMTP_FROM_EMAIL
     message["To"] = to_email
-    message["Subject"] = content["subject"]
+    message["Subject"] = subject
+
+    message.attach(MIMEText(text_template.substitute(otp=otp), "plain"))
+    message.attach(MIMEText(html_template.substitute(otp=otp), "html"))
+    return message
+
+
+class MailQueue:
+    """
+    In-process outbound mail queue. Worker threads each keep one authenticated
+    SMTP connection open and reuse it across messages; failed sends are retried
+    with exponential backoff on a fresh connection.
+    """
 
-    message.attach(MIMEText(text_body, "plain"))
-    message.attach(MIMEText(html_body, "html"))
+    def __init__(
+        self,
+        host: str | None = None,
+        port: int | None = None,
+        user: str | None = None,
+        password: str | None = None,
+        use_tls: bool | None = None,
+        workers: int | None = None,
+        max_retries: int | None = None,
+        backoff_seconds: float | None = None,
+        idle_seconds: float | None = None,
+    ):
+        self.host = host or settings.SMTP_HOST
+        self.port = port or settings.SMTP_PORT
+        self.user = settings.SMTP_USER if user is None else user
+        self.password = settings.SMTP_PASSWORD if password is None else password
+        self.use_tls = settings.SMTP_USE_TLS if use_tls is None else use_tls
+        self.workers = max(1, workers or settings.MAIL_QUEUE_WORKERS)
+        self.max_retries = (
+            settings.MAIL_MAX_RETRIES if max_retries is None else max_retries
+        )
+        self.backoff_seconds = (
+            settings.MAIL_RETRY_BACKOFF_SECONDS
+            if backoff_seconds is None
+            else backoff_seconds
+        )
+        self.idle_seconds = idle_seconds or settings.MAIL_SMTP_IDLE_SECONDS
 
-    # Send Email
-    try:
-        with smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT) as server:
+        self._queue: queue.Queue = queue.Queue(maxsize=settings.MAIL_QUEUE_MAXSIZE)
+        self._threads: list[threading.Thread] = []
+        self._lock = threading.Lock()
+        self.sent = 0
+        self.failed = 0
+
+    def start(self):
+        with self._lock:
+            if self._threads:
+                return
+            for index in range(self.workers):
+                thread = threading.Thread(
+                    target=self._worker, name=f"mail-queue-{index}", daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def enqueue(self, message: MIMEMultipart, label: str = "email"):
+        self.start()
+        try:
+            self._queue.put_nowait((message, label))
+        except queue.Full:
+            print(f"❌ Mail queue full, dropping {label} to {message['To']}")
+
+    def join(self):
+        """Block until every queued message has been sent or given up on."""
+        self._queue.join()
+
+    def stop(self, timeout: float = 10.0):
+        with self._lock:
+            threads, self._threads = self._threads, []
+        for _ in threads:
+            self._queue.put(None)
+        for thread in threads:
+            thread.join(timeout)
+
+    def _connect(self) -> smtplib.SMTP:
+        server = smtplib.SMTP(self.host, self.port, timeout=30)
+        if self.use_tls:
             server.starttls()
-            server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
-            server.send_message(message)
-        print(f"✅ [{purpose}] OTP email sent to {to_email}")
-    except Exception as e:
-        print(f"❌ Failed to send OTP email to {to_email}: {e}")
+        if self.user:
+            server.login(self.user, self.password)
+        return server
+
+    @staticmethod
+    def _close(server: smtplib.SMTP | None):
+        if server is None:
+            return
+        try:
+            server.quit()
+        except Exception:
+            server.close()
+
+    def _worker(self):
+        server = None
+        while True:
+            try:
+                item = self._queue.get(timeout=self.idle_seconds)
+            except queue.Empty:
+                # Don't hold an idle connection the server will drop anyway.
+                self._close(server)
+                server = None
+                continue
+
+            if item is None:
+                self._queue.task_done()
+                self._close(server)
+                return
+
+            message, label = item
+            try:
+                server = self._deliver(server, message, label)
+            finally:
+                self._queue.task_done()
+
+    def _deliver(self, server, message: MIMEMultipart, label: str):
+        for attempt in range(self.max_retries + 1):
+            try:
+                if server is None:
+                    server = self._connect()
+                server.send_message(message)
+                with self._lock:
+                    self.sent += 1
+                print(f"✅ [{label}] email sent to {message['To']}")
+                return server
+            except Exception as e:
+                self._close(server)
+                server = None
+                if attempt == self.max_retries:
+                    with self._lock:
+                        self.failed += 1
+                    print(f"❌ Failed to send {label} email to {message['To']}: {e}")
+                    return None
+                time.sleep(self.backoff_seconds * (2**attempt))
+
+
+mail_queue = MailQueue()
+
+
+def send_otp_email(to_email: str, otp: str, purpose: str):
+    """Queue an OTP email; delivery happens on the mail queue's worker threads."""
+    mail_queue.enqueue(build_otp_message(to_email, otp, purpose), label=purpose)
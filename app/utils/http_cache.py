@@ -0,0 +1,133 @@
+import gzip
+import hashlib
+from datetime import datetime, timezone
+
+from fastapi import Request, Response
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.crud.user_data_version import get_user_data_version
+from app.utils.cache import TTLCache
+from app.utils.serialization import FastJSONResponse, to_jsonable
+
+try:
+    import brotli
+except ImportError:  # optional: only gzip is offered without it
+    brotli = None
+
+# Last rendered body per (user, path, query) as {content-encoding: bytes}
+# ("identity" always present); replaced as soon as the user's data version
+# (and so the ETag) moves on.
+_response_body_cache = TTLCache(
+    "http_response_bodies",
+    maxsize=settings.HTTP_RESPONSE_CACHE_MAX_ENTRIES,
+    ttl=settings.HTTP_RESPONSE_CACHE_TTL_SECONDS,
+)
+
+_CACHE_CONTROL = "private, no-cache"
+
+
+def _accepted_encodings(accept_encoding: str) -> set[str]:
+    accepted = set()
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if coding and q > 0:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+def negotiate_encoding(request: Request) -> str:
+    """'br', 'gzip' or 'identity' for the request's Accept-Encoding."""
+    accepted = _accepted_encodings(request.headers.get("accept-encoding", ""))
+    if brotli is not None and ("br" in accepted or "*" in accepted):
+        return "br"
+    if "gzip" in accepted or "*" in accepted:
+        return "gzip"
+    return "identity"
+
+
+def _compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=settings.HTTP_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=settings.HTTP_GZIP_LEVEL)
+
+
+class VersionedResponse:
+    """
+    Conditional-GET helper for read endpoints whose output depends only on
+    the user's data version, the query string and the current UTC date.
+
+        cached = VersionedResponse(request, db, user_id)
+        if cached.hit is not None:
+            return cached.hit
+        ...
+        return cached.render(result)
+
+    Bodies are compressed with brotli or gzip when the client accepts it and
+    they are larger than HTTP_COMPRESSION_MIN_BYTES.
+    """
+
+    def __init__(self, request: Request, db: Session, user_id: str):
+        version = get_user_data_version(db, user_id)
+        query = "&".join(sorted(request.url.query.split("&")))
+        today = datetime.now(timezone.utc).date().isoformat()
+        digest = hashlib.sha256(
+            f"{user_id}|{version}|{today}|{request.url.path}?{query}".encode()
+        ).hexdigest()[:32]
+        self.etag = f'W/"{digest}"'
+        self._key = (user_id, request.url.path, query)
+        self._encoding = negotiate_encoding(request)
+        self.hit = self._lookup(request)
+
+    def _headers(self) -> dict[str, str]:
+        if self.etag is None:
+            return {"Cache-Control": "no-store", "Vary": "Accept-Encoding"}
+        return {
+            "ETag": self.etag,
+            "Cache-Control": _CACHE_CONTROL,
+            "Vary": "Accept-Encoding",
+        }
+
+    def _respond(self, bodies: dict[str, bytes]) -> Response:
+        identity = bodies["identity"]
+        encoding = self._encoding
+        if encoding == "identity" or len(identity) < settings.HTTP_COMPRESSION_MIN_BYTES:
+            return Response(
+                content=identity, media_type="application/json", headers=self._headers()
+            )
+        body = bodies.get(encoding)
+        if body is None:
+            body = bodies[encoding] = _compress(identity, encoding)
+        headers = self._headers()
+        headers["Content-Encoding"] = encoding
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    def _lookup(self, request: Request) -> Response | None:
+        if_none_match = request.headers.get("if-none-match", "")
+        candidates = {tag.strip() for tag in if_none_match.split(",")}
+        if self.etag in candidates or "*" in candidates:
+            return Response(status_code=304, headers=self._headers())
+
+        cached = _response_body_cache.get(self._key)
+        if cached is not None and cached[0] == self.etag:
+            return self._respond(cached[1])
+        return None
+
+    def render(self, result, cacheable: bool = True) -> Response:
+        """
+        Serialize `result`, remember the body for this ETag and return it.
+        Non-cacheable results (e.g. built from fallbacks) carry no ETag.
+        """
+        bodies = {"identity": FastJSONResponse(content=to_jsonable(result)).body}
+        if not cacheable:
+            self.etag = None
+            return self._respond(bodies)
+        _response_body_cache.set(self._key, (self.etag, bodies))
+        return self._respond(bodies)
@@ -1,9 +1,36 @@
 from starlette.requests import Request
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
+from app.config import settings
+from app.utils import rate_limit_storage  # noqa: F401  registers the appdb:// scheme
+
+
+def _authenticated_user_id(request: Request) -> str | None:
+    authorization = request.headers.get("authorization", "")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+
+    from app.utils.deps import decode_access_token_cached
+
+    try:
+        return decode_access_token_cached(token.strip()).get("id")
+    except Exception:
+        return None
 
 
 def rate_limit_key_func(request: Request) -> str:
+    """
+    Key limits by user when the request carries a valid bearer token, so the
+    limit follows the account rather than a (possibly shared) IP address.
+    """
+    user_id = _authenticated_user_id(request)
+    if user_id:
+        return f"user:{user_id}"
+    return rate_limit_ip_key_func(request)
+
+
+def rate_limit_ip_key_func(request: Request) -> str:
     """Use forwarded IP headers when present, else fall back to client host."""
     forwarded_for = request.headers.get("x-forwarded-for")
     if forwarded_for:
@@ -16,7 +43,9 @@ def rate_limit_key_func(request: Request) -> str:
     return request.client.host if request.client else "unknown"
 
 
-limiter = Limiter(key_func=rate_limit_key_func)
+limiter = Limiter(
+    key_func=rate_limit_key_func, storage_uri=settings.RATE_LIMIT_STORAGE_URI
+)
 rate_limit_exceeded_handler = _rate_limit_exceeded_handler
 
 __all__ = [
@@ -24,4 +53,5 @@ __all__ = [
     "RateLimitExceeded",
     "rate_limit_exceeded_handler",
     "rate_limit_key_func",
+    "rate_limit_ip_key_func",
 ]
@@ -0,0 +1,108 @@
+import threading
+import time
+
+from limits.storage import Storage
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+# Purge expired counters at most this often (seconds) per process.
+_PURGE_INTERVAL_SECONDS = 60
+
+_INCR_SQL = text(
+    """
+    INSERT INTO rate_limit_counters (key, count, expires_at)
+    VALUES (:key, :amount, now() + make_interval(secs => :expiry))
+    ON CONFLICT (key) DO UPDATE SET
+        count = CASE
+            WHEN rate_limit_counters.expires_at <= now() THEN EXCLUDED.count
+            ELSE rate_limit_counters.count + EXCLUDED.count
+        END,
+        expires_at = CASE
+            WHEN rate_limit_counters.expires_at <= now() THEN EXCLUDED.expires_at
+            ELSE rate_limit_counters.expires_at
+        END
+    RETURNING count
+    """
+)
+
+
+class DatabaseRateLimitStorage(Storage):
+    """
+    Fixed-window rate limit storage in the app's Postgres database, so every
+    worker and host shares the same counters. Selected with
+    RATE_LIMIT_STORAGE_URI="appdb://".
+    """
+
+    STORAGE_SCHEME = ["appdb"]
+
+    def __init__(self, uri: str | None = None, wrap_exceptions: bool = False, **options):
+        from app.db.session import engine
+
+        self.engine = engine
+        self._last_purge = 0.0
+        self._purge_lock = threading.Lock()
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+
+    @property
+    def base_exceptions(self):
+        return SQLAlchemyError
+
+    def incr(self, key: str, expiry: int, amount: int = 1) -> int:
+        self._maybe_purge()
+        with self.engine.begin() as conn:
+            return conn.execute(
+                _INCR_SQL, {"key": key, "amount": amount, "expiry": float(expiry)}
+            ).scalar_one()
+
+    def get(self, key: str) -> int:
+        with self.engine.connect() as conn:
+            count = conn.execute(
+                text(
+                    "SELECT count FROM rate_limit_counters "
+                    "WHERE key = :key AND expires_at > now()"
+                ),
+                {"key": key},
+            ).scalar()
+        return count or 0
+
+    def get_expiry(self, key: str) -> float:
+        with self.engine.connect() as conn:
+            expires_at = conn.execute(
+                text(
+                    "SELECT EXTRACT(EPOCH FROM expires_at) FROM rate_limit_counters "
+                    "WHERE key = :key AND expires_at > now()"
+                ),
+                {"key": key},
+            ).scalar()
+        return float(expires_at) if expires_at is not None else time.time()
+
+    def check(self) -> bool:
+        try:
+            with self.engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+            return True
+        except SQLAlchemyError:
+            return False
+
+    def reset(self) -> int | None:
+        with self.engine.begin() as conn:
+            return conn.execute(text("DELETE FROM rate_limit_counters")).rowcount
+
+    def clear(self, key: str) -> None:
+        with self.engine.begin() as conn:
+            conn.execute(
+                text("DELETE FROM rate_limit_counters WHERE key = :key"), {"key": key}
+            )
+
+    def _maybe_purge(self):
+        now = time.monotonic()
+        if now - self._last_purge < _PURGE_INTERVAL_SECONDS:
+            return
+        with self._purge_lock:
+            if now - self._last_purge < _PURGE_INTERVAL_SECONDS:
+                return
+            self._last_purge = now
+        with self.engine.begin() as conn:
+            conn.execute(
+                text("DELETE FROM rate_limit_counters WHERE expires_at <= now()")
+            )
@@ -0,0 +1,129 @@
+import json
+from typing import Any, Iterable, get_args, get_origin
+
+import numpy as np
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # optional: falls back to the stdlib encoder
+    orjson = None
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse for content that is already JSON-ready (plain dicts, lists,
+    str, int, float, bool, None), encoded with orjson when it is installed.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content)
+        return json.dumps(
+            content, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+        ).encode("utf-8")
+
+
+def to_jsonable(value: Any) -> Any:
+    """
+    Models (or lists of models) dumped the way FastAPI serializes a
+    response_model; anything else is assumed to be JSON-ready already.
+    """
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json", by_alias=True)
+    if isinstance(value, list):
+        return [to_jsonable(item) for item in value]
+    return value
+
+
+def money(value: float) -> str:
+    """Two-decimal string, identical to a serialized round(Decimal(value), 2)."""
+    return f"{value:.2f}"
+
+
+def money_list(values: np.ndarray | Iterable[float]) -> list[str]:
+    values = values.tolist() if isinstance(values, np.ndarray) else values
+    return [f"{value:.2f}" for value in values]
+
+
+def data_points(labels: Iterable, values: np.ndarray) -> list[dict]:
+    """[{label, value}] rows of a DataPoint chart."""
+    return [
+        {"label": str(label), "value": value}
+        for label, value in zip(labels, money_list(values))
+    ]
+
+
+def line_series(series_id: str, labels: Iterable, values: np.ndarray) -> dict:
+    """A LineSeries {id, data: [{x, y}]}."""
+    return {
+        "id": series_id,
+        "data": [
+            {"x": str(label), "y": value}
+            for label, value in zip(labels, money_list(values))
+        ],
+    }
+
+
+def _columnar_kind(annotation: Any) -> str | None:
+    """'points' for List[{label, value}] / List[{id, label, value}], 'series' for List[{id, data}]."""
+    args = get_args(annotation)
+    if get_origin(annotation) is not list or not args:
+        return None
+    item = args[0]
+    if not (isinstance(item, type) and issubclass(item, BaseModel)):
+        return None
+    fields = set(item.model_fields)
+    if fields in ({"label", "value"}, {"id", "label", "value"}):
+        return "points"
+    if fields == {"id", "data"}:
+        return "series"
+    return None
+
+
+def _columnar_points(points: list[dict]) -> dict:
+    columns = {
+        "labels": [point["label"] for point in points],
+        "values": [point["value"] for point in points],
+    }
+    if points and "id" in points[0]:
+        ids = [point["id"] for point in points]
+        if ids != columns["labels"]:
+            columns["ids"] = ids
+    return columns
+
+
+def _columnar_series(series: list[dict]) -> dict:
+    labels = [[point["x"] for point in item["data"]] for item in series]
+    shared = all(item_labels == labels[0] for item_labels in labels)
+    columns: dict[str, Any] = {"labels": labels[0] if labels else []} if shared else {}
+    columns["series"] = [
+        {
+            "id": item["id"],
+            **({} if shared else {"labels": item_labels}),
+            "values": [point["y"] for point in item["data"]],
+        }
+        for item, item_labels in zip(series, labels)
+    ]
+    return columns
+
+
+def to_columnar(body: dict, model: type[BaseModel]) -> dict:
+    """
+    `format=columnar` variant of a JSON-ready `model` response: DataPoint and
+    pie lists become parallel {labels, values} arrays and each LineSeries list
+    becomes {labels, series: [{id, values}]}, with one label array shared when
+    every series has the same x values. Other fields are left as they are.
+    """
+    columnar = {}
+    for key, value in body.items():
+        field = model.model_fields.get(key)
+        kind = _columnar_kind(field.annotation) if field is not None else None
+        if kind == "points":
+            columnar[key] = _columnar_points(value)
+        elif kind == "series":
+            columnar[key] = _columnar_series(value)
+        else:
+            columnar[key] = value
+    return columnar
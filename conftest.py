@@ -0,0 +1,80 @@
+import uuid
+
+import pytest
+from sqlalchemy import text
+
+from app.db.query_stats import assert_max_queries, count_queries
+
+
+@pytest.fixture
+def query_counter():
+    """
+    Every SQL statement the test executes (from any thread), e.g.:
+
+        def test_dashboard(client, query_counter):
+            client.get("/api/v1/dashboard/")
+            assert query_counter.count <= 12
+    """
+    with count_queries() as stats:
+        yield stats
+
+
+@pytest.fixture
+def max_queries():
+    """`with max_queries(12): ...` fails if the block runs more statements."""
+    return assert_max_queries
+
+
+@pytest.fixture(scope="session")
+def _database():
+    """
+    The schema on DATABASE_URL, created once per run. Tests that use the db
+    fixture need a disposable Postgres database: every table is truncated
+    after each test. They are skipped on any other backend.
+    """
+    import app.models  # noqa: F401  register all models
+    from app.db.base import Base
+    from app.db.session import engine
+
+    if engine.dialect.name != "postgresql":
+        pytest.skip("needs DATABASE_URL pointing at a disposable Postgres database")
+    Base.metadata.create_all(engine)
+    return engine, Base
+
+
+@pytest.fixture
+def db(_database):
+    from app.db.session import SessionLocal
+
+    engine, base = _database
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        tables = ", ".join(f'"{table.name}"' for table in base.metadata.sorted_tables)
+        with engine.begin() as conn:
+            conn.execute(text(f"TRUNCATE {tables} CASCADE"))
+
+
+@pytest.fixture
+def make_user(db):
+    from app.models.user import User
+
+    def make(**fields) -> User:
+        user_id = str(uuid.uuid4())
+        user = User(
+            user_id=user_id,
+            name="test",
+            email=f"{user_id}@example.com",
+            hashed_password="x",
+            total_xp=0,
+            savings=0,
+            goals_completed=0,
+            **fields,
+        )
+        db.add(user)
+        db.commit()
+        return user
+
+    return make
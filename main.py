@@ -5,9 +5,17 @@ import asyncio
 import app.services.budget_events  # Import event handler modules to ensure registration
 import app.services.prediction_events
 import app.services.reward_events
-from app.services.background_tasks import run_daily_bank_sync_loop
+from app.services.background_tasks import (
+    run_daily_bank_sync_loop,
+    run_nightly_ai_suggestions_loop,
+    run_nightly_budget_closeout_loop,
+    run_user_evaluation_loop,
+)
+from app.config import settings
 from app.db import Base, engine
+from app.db.query_stats import install_query_stats_middleware
 import app.models  # Import all models to register them with Base.metadata
+from app.utils.email import mail_queue
 from app.utils.rate_limit import (
     limiter,
     RateLimitExceeded,
@@ -20,6 +28,9 @@ Base.metadata.create_all(bind=engine)
 # Initialize FastAPI app
 app = FastAPI()
 daily_sync_task = None
+user_evaluation_task = None
+ai_suggestions_task = None
+budget_closeout_task = None
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded_handler)
 
@@ -39,6 +50,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.SQL_QUERY_STATS_ENABLED:
+    install_query_stats_middleware(
+        app, engine, repeat_threshold=settings.SQL_QUERY_STATS_REPEAT_THRESHOLD
+    )
+
 # Include your API routes
 app.include_router(api_router, prefix="/api/v1")
 
@@ -60,3 +76,71 @@ async def stop_daily_sync_worker():
         except asyncio.CancelledError:
             pass
         daily_sync_task = None
+
+
+@app.on_event("startup")
+async def start_user_evaluation_worker():
+    global user_evaluation_task
+    if user_evaluation_task is None:
+        user_evaluation_task = asyncio.create_task(
+            run_user_evaluation_loop(settings.USER_EVALUATION_INTERVAL_MINUTES)
+        )
+
+
+@app.on_event("shutdown")
+async def stop_user_evaluation_worker():
+    global user_evaluation_task
+    if user_evaluation_task is not None:
+        user_evaluation_task.cancel()
+        try:
+            await user_evaluation_task
+        except asyncio.CancelledError:
+            pass
+        user_evaluation_task = None
+
+
+@app.on_event("startup")
+async def start_ai_suggestions_worker():
+    global ai_suggestions_task
+    if ai_suggestions_task is None:
+        ai_suggestions_task = asyncio.create_task(
+            run_nightly_ai_suggestions_loop(settings.AI_SUGGESTIONS_PRECOMPUTE_HOUR_UTC)
+        )
+
+
+@app.on_event("shutdown")
+async def stop_ai_suggestions_worker():
+    global ai_suggestions_task
+    if ai_suggestions_task is not None:
+        ai_suggestions_task.cancel()
+        try:
+            await ai_suggestions_task
+        except asyncio.CancelledError:
+            pass
+        ai_suggestions_task = None
+
+
+@app.on_event("startup")
+async def start_budget_closeout_worker():
+    global budget_closeout_task
+    if budget_closeout_task is None:
+        budget_closeout_task = asyncio.create_task(
+            run_nightly_budget_closeout_loop(settings.BUDGET_CLOSEOUT_HOUR_UTC)
+        )
+
+
+@app.on_event("shutdown")
+async def stop_budget_closeout_worker():
+    global budget_closeout_task
+    if budget_closeout_task is not None:
+        budget_closeout_task.cancel()
+        try:
+            await budget_closeout_task
+        except asyncio.CancelledError:
+            pass
+        budget_closeout_task = None
+
+
+@app.on_event("shutdown")
+async def stop_mail_queue():
+    await asyncio.to_thread(mail_queue.stop)
@@ -0,0 +1,30 @@
+"""
+Rebuild daily_transaction_aggregates from the transactions table.
+
+    python scripts/backfill_daily_aggregates.py            # every user
+    python scripts/backfill_daily_aggregates.py <user_id>  # one user
+"""
+
+import sys
+
+from app.crud.daily_aggregate import rebuild_daily_aggregates
+from app.db.session import SessionLocal
+import app.models  # noqa: F401  register all models
+
+
+def backfill_daily_aggregates(user_id: str | None = None):
+    db = SessionLocal()
+    try:
+        written = rebuild_daily_aggregates(db, user_id=user_id)
+        scope = f"user {user_id}" if user_id else "all users"
+        print(f"Rebuilt {written} daily aggregate rows for {scope}.")
+    except Exception as e:
+        db.rollback()
+        print(f"An error occurred: {e}")
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    backfill_daily_aggregates(sys.argv[1] if len(sys.argv) > 1 else None)
@@ -0,0 +1,62 @@
+"""
+Classify transactions that have no spend_class yet.
+
+    python scripts/backfill_spend_class.py
+
+Rows are grouped by (category, description, merchant) so each distinct text
+combination is classified once and written with a single UPDATE.
+"""
+
+from sqlalchemy import func
+
+import app.models  # noqa: F401  register all models
+from app.db.session import SessionLocal
+from app.models.bank import Transaction
+from app.services.spend_classifier import classify_spend
+
+BATCH_SIZE = 500
+
+
+def backfill_spend_class():
+    db = SessionLocal()
+    try:
+        groups = (
+            db.query(
+                Transaction.category,
+                Transaction.description,
+                Transaction.merchant,
+                func.count(Transaction.id),
+            )
+            .filter(Transaction.spend_class.is_(None))
+            .group_by(
+                Transaction.category, Transaction.description, Transaction.merchant
+            )
+            .all()
+        )
+
+        updated = 0
+        for index, (category, description, merchant, count) in enumerate(groups, 1):
+            db.query(Transaction).filter(
+                Transaction.spend_class.is_(None),
+                Transaction.category.is_not_distinct_from(category),
+                Transaction.description.is_not_distinct_from(description),
+                Transaction.merchant.is_not_distinct_from(merchant),
+            ).update(
+                {Transaction.spend_class: classify_spend(category, description, merchant)},
+                synchronize_session=False,
+            )
+            updated += count
+            if index % BATCH_SIZE == 0:
+                db.commit()
+        db.commit()
+        print(f"Classified {updated} transactions across {len(groups)} text groups.")
+    except Exception as e:
+        db.rollback()
+        print(f"An error occurred: {e}")
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    backfill_spend_class()
@@ -0,0 +1,185 @@
+"""
+Benchmark analytics data loading: full-history fetch + pandas filtering (the
+previous implementation) against the SQL pushdown in
+app/services/analytics_queries.py, for synthetic users of increasing size.
+
+    python scripts/bench_analytics.py --sizes 10000 100000 1000000 --repeat 3
+
+Requires DATABASE_URL to point at a Postgres database with the schema
+migrated. Each synthetic user, account and transaction set is deleted again
+after it has been measured.
+"""
+
+import argparse
+import random
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pandas as pd
+
+import app.models  # noqa: F401  register all models
+from app import crud
+from app.api.analytics import build_financial_analytics
+from app.db.session import SessionLocal
+from app.models.bank import BankAccount, Transaction
+from app.models.user import User
+from app.services.analytics_queries import (
+    get_account_date_bounds,
+    get_window_day_totals,
+    get_window_spend_class_totals,
+)
+from app.services.transaction_frame_cache import transaction_frame_cache
+
+CATEGORIES = ["food", "rent", "groceries", "transport", "shopping", "salary", "utilities", None]
+DESCRIPTIONS = ["coffee", "monthly rent", "supermarket run", "taxi", "online order", None]
+MERCHANTS = ["Cafe Nepal", "Bhatbhateni", "Pathao", "Daraz", None]
+
+
+def _seed(db, size: int) -> tuple[str, uuid.UUID]:
+    user_id = str(uuid.uuid4())
+    account_id = uuid.uuid4()
+    db.add(User(user_id=user_id, name="bench", email=f"bench-{user_id}@example.com", hashed_password="x"))
+    db.add(
+        BankAccount(
+            id=account_id,
+            external_account_id=f"bench-{account_id}",
+            user_id=user_id,
+            bank_name="Nabil Bank",
+            account_number_masked="****",
+            account_type="savings",
+            balance=Decimal("0"),
+        )
+    )
+    db.commit()
+
+    now = datetime.now(timezone.utc)
+    rng = random.Random(size)
+    batch = []
+    for _ in range(size):
+        batch.append(
+            {
+                "id": uuid.uuid4(),
+                "user_id": user_id,
+                "account_id": account_id,
+                "source": "BANK",
+                "date": now - timedelta(minutes=rng.randint(0, 60 * 24 * 365 * 3)),
+                "amount": Decimal(rng.randint(100, 500000)) / 100,
+                "currency": "NPR",
+                "type": "CREDIT" if rng.random() < 0.2 else "DEBIT",
+                "status": "BOOKED",
+                "description": rng.choice(DESCRIPTIONS),
+                "merchant": rng.choice(MERCHANTS),
+                "category": rng.choice(CATEGORIES),
+            }
+        )
+        if len(batch) == 10000:
+            db.execute(Transaction.__table__.insert(), batch)
+            batch = []
+    if batch:
+        db.execute(Transaction.__table__.insert(), batch)
+    crud.rebuild_daily_aggregates(db, user_id)
+    return user_id, account_id
+
+
+def _cleanup(db, user_id: str, account_id: uuid.UUID):
+    crud.delete_transactions_by_user(db, user_id)
+    db.query(BankAccount).filter(BankAccount.id == account_id).delete(synchronize_session=False)
+    db.query(User).filter(User.user_id == user_id).delete(synchronize_session=False)
+    db.commit()
+
+
+def _legacy_load(db, account_id, start, end):
+    transactions = crud.get_transactions_by_account(db=db, account_id=account_id)
+    df = pd.DataFrame(
+        [
+            {
+                "amount": float(t.amount),
+                "type": t.type,
+                "category": t.category,
+                "description": t.description,
+                "merchant": t.merchant,
+                "date": t.date,
+            }
+            for t in transactions
+        ]
+    )
+    df["date"] = pd.to_datetime(df["date"]).dt.tz_convert(timezone.utc)
+    df_window = df[(df["date"] >= start) & (df["date"] <= end)].copy()
+    return df_window.groupby([df_window["date"].dt.strftime("%b %Y"), "type"])["amount"].sum()
+
+
+def _pushdown_load(db, account_id, start, end):
+    get_account_date_bounds(db, account_id)
+    totals = get_window_day_totals(db, account_id, start, end)
+    get_window_spend_class_totals(db, account_id, start, end)
+    df_window = pd.DataFrame(
+        {
+            "date": pd.to_datetime(totals["day"]).tz_localize(timezone.utc),
+            "type": totals["type"],
+            "amount": totals["amount"],
+        }
+    )
+    return df_window.groupby([df_window["date"].dt.strftime("%b %Y"), "type"])["amount"].sum()
+
+
+def _time(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def run(sizes: list[int], repeat: int, horizon: str):
+    now = pd.Timestamp(datetime.now(timezone.utc))
+    window_start = now - pd.DateOffset(months=3) if horizon == "3m" else now - pd.DateOffset(years=10)
+
+    for size in sizes:
+        db = SessionLocal()
+        user_id, account_id = _seed(db, size)
+        try:
+            user = SimpleNamespace(user_id=user_id)
+            legacy_ms = _time(lambda: _legacy_load(db, account_id, window_start, now), repeat)
+            pushdown_ms = _time(
+                lambda: _pushdown_load(db, account_id, window_start.to_pydatetime(), now.to_pydatetime()),
+                repeat,
+            )
+            transaction_frame_cache.clear()
+            cold_ms = _time(
+                lambda: (
+                    transaction_frame_cache.clear(),
+                    build_financial_analytics(
+                        db=db, current_user=user, time_horizon=horizon, year=None, startDate=None, endDate=None
+                    ),
+                ),
+                repeat,
+            )
+            endpoint_ms = _time(
+                lambda: build_financial_analytics(
+                    db=db, current_user=user, time_horizon=horizon, year=None, startDate=None, endDate=None
+                ),
+                repeat,
+            )
+            print(
+                f"{size:>9} tx | legacy fetch+pandas {legacy_ms:9.1f}ms | "
+                f"sql pushdown {pushdown_ms:8.1f}ms | endpoint cold {cold_ms:8.1f}ms | "
+                f"endpoint cached {endpoint_ms:8.1f}ms | "
+                f"speedup x{legacy_ms / max(pushdown_ms, 1e-6):.1f}"
+            )
+        finally:
+            _cleanup(db, user_id, account_id)
+            db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--horizon", choices=["all", "3m"], default="all")
+    args = parser.parse_args()
+    run(args.sizes, args.repeat, args.horizon)
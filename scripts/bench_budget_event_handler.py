@@ -0,0 +1,122 @@
+"""
+Micro-benchmark for the TransactionCreated budget handler: evaluating every
+uncompleted budget of the user (the previous implementation) against
+evaluating only the active budgets whose category and month count the
+transaction, for users with an increasing number of budgets.
+
+    python scripts/bench_budget_event_handler.py --budgets 10 100 1000 --repeat 50
+
+Requires DATABASE_URL to point at a Postgres database with the schema
+migrated. Budgets are seeded over their amount so no evaluation completes
+them; the synthetic user and its data are deleted again afterwards.
+"""
+
+import argparse
+import statistics
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+import app.models  # noqa: F401  register all models
+from app.crud.budget import evaluate_budget_completion
+from app.db.query_stats import count_queries
+from app.db.session import SessionLocal
+from app.models.bank import Transaction
+from app.models.budget import Budget
+from app.models.user import User
+from app.services.budget_events import handle_transaction_created
+from app.utils.events import TransactionCreated
+
+
+def _transaction(user_id: str, category: str, amount: Decimal, when: datetime) -> Transaction:
+    return Transaction(
+        user_id=user_id,
+        source="MANUAL",
+        date=when,
+        amount=amount,
+        currency="NPR",
+        type="DEBIT",
+        status="COMPLETED",
+        category=category,
+    )
+
+
+def _seed(db, budgets: int) -> tuple[str, str]:
+    user_id = str(uuid.uuid4())
+    db.add(User(user_id=user_id, name="bench", email=f"bench-{user_id}@example.com", hashed_password="x", total_xp=0, savings=0, goals_completed=0))
+    db.commit()
+
+    today = date.today()
+    start = today.replace(day=1)
+    now = datetime.now(timezone.utc)
+    for i in range(budgets):
+        category = f"cat-{i}"
+        db.add(
+            Budget(
+                user_id=user_id,
+                category=category,
+                budget_amount=Decimal("1.00"),
+                start_date=start,
+                end_date=start + timedelta(days=60),
+            )
+        )
+        # Overspent from the start, so evaluation never completes it.
+        db.add(_transaction(user_id, category, Decimal("100.00"), now))
+
+    new_tx = _transaction(user_id, "cat-0", Decimal("10.00"), now)
+    db.add(new_tx)
+    db.commit()
+    return user_id, str(new_tx.id)
+
+
+def _cleanup(db, user_id: str):
+    db.query(Transaction).filter(Transaction.user_id == user_id).delete(synchronize_session=False)
+    db.query(Budget).filter(Budget.user_id == user_id).delete(synchronize_session=False)
+    db.query(User).filter(User.user_id == user_id).delete(synchronize_session=False)
+    db.commit()
+
+
+def _legacy_handler(event: TransactionCreated):
+    db = event.db
+    user = db.query(User).filter(User.user_id == event.user_id).first()
+    budgets = db.query(Budget).filter(Budget.user_id == event.user_id).all()
+    for budget in budgets:
+        if not budget.is_completed:
+            evaluate_budget_completion(db, budget, user)
+
+
+def _time(db, handler, event_, repeat: int) -> tuple[float, int]:
+    samples = []
+    with count_queries() as counter:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            handler(event_)
+            samples.append(time.perf_counter() - start)
+            db.expire_all()
+    return statistics.median(samples) * 1000, counter.count // repeat
+
+
+def run(budget_counts: list[int], repeat: int):
+    for budgets in budget_counts:
+        db = SessionLocal()
+        user_id, transaction_id = _seed(db, budgets)
+        try:
+            event_ = TransactionCreated(db, user_id, transaction_id, {})
+            legacy_ms, legacy_queries = _time(db, _legacy_handler, event_, repeat)
+            targeted_ms, targeted_queries = _time(db, handle_transaction_created, event_, repeat)
+            print(
+                f"{budgets:>6} budgets | all budgets {legacy_ms:9.2f}ms {legacy_queries:>5} queries | "
+                f"targeted {targeted_ms:7.2f}ms {targeted_queries:>2} queries"
+            )
+        finally:
+            _cleanup(db, user_id)
+            db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budgets", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    run(args.budgets, args.repeat)
@@ -0,0 +1,109 @@
+"""
+Micro-benchmark for chart response construction + serialization on a 5-year
+weekly series: pydantic DataPoint/LineSeries models built from
+round(Decimal(value), 2) and encoded by FastAPI's default path, against the
+bulk-formatted dict path in app/utils/serialization.py.
+
+    python scripts/bench_chart_serialization.py --years 5 --repeat 200
+
+No database is needed. Both paths must produce the same JSON document.
+"""
+
+import argparse
+import json
+import random
+import statistics
+import time
+from decimal import Decimal
+
+import numpy as np
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app import schemas
+from app.utils.serialization import (
+    FastJSONResponse,
+    data_points,
+    line_series,
+    orjson,
+)
+
+
+def _series(years: int):
+    rng = random.Random(years)
+    weeks = years * 52
+    labels = [f"{2020 + i // 52}-W{i % 52 + 1:02d}" for i in range(weeks)]
+    income = np.array([rng.uniform(0, 250000) for _ in range(weeks)])
+    expense = np.array([rng.uniform(0, 200000) for _ in range(weeks)])
+    return labels, income, expense
+
+
+def _model_path(labels, income, expense) -> bytes:
+    def points(values):
+        return [
+            schemas.DataPoint(label=str(label), value=round(Decimal(value), 2))
+            for label, value in zip(labels, values.tolist())
+        ]
+
+    def series(series_id, values):
+        return schemas.LineSeries(
+            id=series_id,
+            data=[
+                schemas.LineSeriesDataPoint(x=str(label), y=round(Decimal(value), 2))
+                for label, value in zip(labels, values.tolist())
+            ],
+        )
+
+    body = {
+        "weeklyTransactionData": points(expense),
+        "weeklyBalanceData": points(income),
+        "weeklyLineSeries": [
+            series("weekly_income", income),
+            series("weekly_expense", expense),
+        ],
+    }
+    return JSONResponse(content=jsonable_encoder(body)).body
+
+
+def _fast_path(labels, income, expense) -> bytes:
+    body = {
+        "weeklyTransactionData": data_points(labels, expense),
+        "weeklyBalanceData": data_points(labels, income),
+        "weeklyLineSeries": [
+            line_series("weekly_income", labels, income),
+            line_series("weekly_expense", labels, expense),
+        ],
+    }
+    return FastJSONResponse(content=body).body
+
+
+def _time(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def run(years: int, repeat: int):
+    labels, income, expense = _series(years)
+    legacy_body = _model_path(labels, income, expense)
+    fast_body = _fast_path(labels, income, expense)
+    if json.loads(legacy_body) != json.loads(fast_body):
+        raise SystemExit("fast path output differs from the model path")
+
+    legacy_ms = _time(lambda: _model_path(labels, income, expense), repeat)
+    fast_ms = _time(lambda: _fast_path(labels, income, expense), repeat)
+    encoder = "orjson" if orjson is not None else "stdlib json"
+    print(f"{len(labels)} weeks x 4 series, {len(fast_body)} bytes")
+    print(f"models + jsonable_encoder {legacy_ms:8.2f}ms")
+    print(f"dicts + {encoder:<17} {fast_ms:8.2f}ms  (x{legacy_ms / max(fast_ms, 1e-9):.1f})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    run(args.years, args.repeat)
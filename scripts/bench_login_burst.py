@@ -0,0 +1,102 @@
+"""
+Load test: latency of an unrelated endpoint while a burst of logins is running.
+
+Start the API (e.g. `uvicorn main:app --workers 1`) and run:
+
+    python scripts/bench_login_burst.py --base-url http://127.0.0.1:8000 \
+        --email someone@example.com --password secret --logins 200 --concurrency 50
+
+Each login is sent with its own X-Forwarded-For address so the per-IP login
+limit does not short-circuit the burst before Argon2 runs. The probe endpoint
+is sampled continuously before and during the burst and p50/p95/p99 are
+printed for both phases.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _report(label: str, samples: list[float]):
+    if not samples:
+        print(f"{label}: no samples")
+        return
+    print(
+        f"{label}: n={len(samples)} "
+        f"p50={_percentile(samples, 50):.1f}ms "
+        f"p95={_percentile(samples, 95):.1f}ms "
+        f"p99={_percentile(samples, 99):.1f}ms "
+        f"max={max(samples):.1f}ms "
+        f"mean={statistics.fmean(samples):.1f}ms"
+    )
+
+
+async def _probe(client: httpx.AsyncClient, path: str, stop: asyncio.Event, interval: float) -> list[float]:
+    samples = []
+    while not stop.is_set():
+        start = time.perf_counter()
+        await client.get(path)
+        samples.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(interval)
+    return samples
+
+
+async def _login(client: httpx.AsyncClient, index: int, email: str, password: str, semaphore: asyncio.Semaphore) -> int:
+    async with semaphore:
+        response = await client.post(
+            "/api/v1/auth/login",
+            json={"email": email, "password": password},
+            headers={"X-Forwarded-For": f"10.{index // 65536 % 256}.{index // 256 % 256}.{index % 256}"},
+        )
+        return response.status_code
+
+
+async def run(args):
+    limits = httpx.Limits(max_connections=args.concurrency + 10)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=60, limits=limits) as client:
+        await client.get(args.probe_path)  # warm up
+
+        stop = asyncio.Event()
+        baseline_task = asyncio.create_task(_probe(client, args.probe_path, stop, args.probe_interval))
+        await asyncio.sleep(args.baseline_seconds)
+        stop.set()
+        baseline = await baseline_task
+
+        stop = asyncio.Event()
+        burst_probe_task = asyncio.create_task(_probe(client, args.probe_path, stop, args.probe_interval))
+        semaphore = asyncio.Semaphore(args.concurrency)
+        burst_start = time.perf_counter()
+        statuses = await asyncio.gather(
+            *(_login(client, i, args.email, args.password, semaphore) for i in range(args.logins))
+        )
+        burst_elapsed = time.perf_counter() - burst_start
+        stop.set()
+        during_burst = await burst_probe_task
+
+    print(f"Logins: {args.logins} in {burst_elapsed:.2f}s, status codes: {sorted(set(statuses))}")
+    _report(f"{args.probe_path} baseline", baseline)
+    _report(f"{args.probe_path} during login burst", during_burst)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--probe-path", default="/openapi.json")
+    parser.add_argument("--probe-interval", type=float, default=0.01)
+    parser.add_argument("--baseline-seconds", type=float, default=3.0)
+    asyncio.run(run(parser.parse_args()))
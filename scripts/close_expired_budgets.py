@@ -0,0 +1,13 @@
+"""
+Close every expired budget now instead of waiting for the nightly job.
+
+    python scripts/close_expired_budgets.py
+"""
+
+from app.services.budget_closeout import close_expired_budgets_once
+import app.models  # noqa: F401  register all models
+
+
+if __name__ == "__main__":
+    closed = close_expired_budgets_once()
+    print(f"Closed {closed} expired budgets.")
@@ -0,0 +1,32 @@
+"""
+Recompute budgets.remaining_budget from the transactions table.
+
+    python scripts/reconcile_budget_ledger.py            # every user
+    python scripts/reconcile_budget_ledger.py <user_id>  # one user
+
+Per-user reconciliation also runs with each scheduled budget evaluation.
+"""
+
+import sys
+
+from app.crud.budget_ledger import reconcile_remaining_budgets
+from app.db.session import SessionLocal
+import app.models  # noqa: F401  register all models
+
+
+def reconcile_budget_ledger(user_id: str | None = None):
+    db = SessionLocal()
+    try:
+        corrected = reconcile_remaining_budgets(db, user_id=user_id)
+        scope = f"user {user_id}" if user_id else "all users"
+        print(f"Corrected remaining_budget on {corrected} budgets for {scope}.")
+    except Exception as e:
+        db.rollback()
+        print(f"An error occurred: {e}")
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    reconcile_budget_ledger(sys.argv[1] if len(sys.argv) > 1 else None)
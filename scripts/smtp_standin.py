@@ -0,0 +1,161 @@
+"""
+Minimal local SMTP server for development, tests and mail-queue throughput runs.
+
+Serve (point SMTP_HOST/SMTP_PORT at it and set SMTP_USE_TLS=false):
+
+    python scripts/smtp_standin.py --port 8025
+
+Throughput run against the app's MailQueue (needs the usual .env settings):
+
+    python scripts/smtp_standin.py --bench 2000 --workers 4 --latency-ms 5
+
+The server speaks just enough ESMTP for smtplib: EHLO/HELO, AUTH PLAIN (any
+credentials accepted), MAIL, RCPT, DATA, RSET, NOOP and QUIT. Messages are
+counted and optionally printed; nothing is relayed.
+"""
+
+import argparse
+import asyncio
+import threading
+import time
+
+
+class SmtpStandIn:
+    def __init__(self, host: str = "127.0.0.1", port: int = 8025, latency: float = 0.0, verbose: bool = False):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.verbose = verbose
+        self.messages_received = 0
+        self.connections_opened = 0
+        self._server = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        await self.start()
+        print(f"SMTP stand-in listening on {self.host}:{self.port}")
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections_opened += 1
+
+        async def reply(line: str):
+            writer.write(f"{line}\r\n".encode())
+            await writer.drain()
+
+        await reply("220 smtp-standin ESMTP ready")
+        try:
+            while True:
+                raw = await reader.readline()
+                if not raw:
+                    break
+                command = raw.decode(errors="replace").strip()
+                verb = command.split(" ", 1)[0].upper()
+
+                if verb == "EHLO":
+                    writer.write(b"250-smtp-standin\r\n250-AUTH PLAIN\r\n250 8BITMIME\r\n")
+                    await writer.drain()
+                elif verb == "HELO":
+                    await reply("250 smtp-standin")
+                elif verb == "AUTH":
+                    await reply("235 2.7.0 Authentication successful")
+                elif verb in ("MAIL", "RCPT", "RSET", "NOOP"):
+                    await reply("250 OK")
+                elif verb == "DATA":
+                    await reply("354 End data with <CR><LF>.<CR><LF>")
+                    lines = []
+                    while True:
+                        line = await reader.readline()
+                        if not line or line in (b".\r\n", b".\n"):
+                            break
+                        lines.append(line)
+                    if self.latency:
+                        await asyncio.sleep(self.latency)
+                    self.messages_received += 1
+                    if self.verbose:
+                        print(b"".join(lines).decode(errors="replace"))
+                    await reply("250 OK: queued")
+                elif verb == "QUIT":
+                    await reply("221 Bye")
+                    break
+                else:
+                    await reply("502 Command not implemented")
+        finally:
+            writer.close()
+
+
+def _run_in_thread(standin: SmtpStandIn) -> threading.Event:
+    ready = threading.Event()
+
+    def runner():
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(standin.start())
+        ready.set()
+        loop.run_forever()
+
+    threading.Thread(target=runner, daemon=True).start()
+    ready.wait()
+    return ready
+
+
+def bench(count: int, workers: int, latency: float):
+    from app.utils.email import MailQueue, build_otp_message
+
+    standin = SmtpStandIn(port=0, latency=latency)
+    _run_in_thread(standin)
+
+    mail_queue = MailQueue(
+        host=standin.host,
+        port=standin.port,
+        user="",
+        use_tls=False,
+        workers=workers,
+        backoff_seconds=0.05,
+    )
+
+    start = time.perf_counter()
+    for i in range(count):
+        mail_queue.enqueue(
+            build_otp_message(f"user{i}@example.com", f"{i % 1000000:06d}", "two_factor_auth"),
+            label="bench",
+        )
+    enqueue_elapsed = time.perf_counter() - start
+    mail_queue.join()
+    elapsed = time.perf_counter() - start
+    mail_queue.stop()
+
+    print(
+        f"Enqueued {count} messages in {enqueue_elapsed * 1000:.1f}ms "
+        f"({enqueue_elapsed / count * 1e6:.1f}us per enqueue)"
+    )
+    print(
+        f"Delivered {standin.messages_received} messages in {elapsed:.2f}s "
+        f"({standin.messages_received / elapsed:.0f} msg/s) over "
+        f"{standin.connections_opened} SMTP connections with {workers} workers; "
+        f"failed={mail_queue.failed}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8025)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="artificial delay per DATA")
+    parser.add_argument("--verbose", action="store_true", help="print received messages")
+    parser.add_argument("--bench", type=int, default=0, help="send N messages through MailQueue and exit")
+    parser.add_argument("--workers", type=int, default=2)
+    args = parser.parse_args()
+
+    if args.bench:
+        bench(args.bench, args.workers, args.latency_ms / 1000)
+    else:
+        standin = SmtpStandIn(args.host, args.port, args.latency_ms / 1000, args.verbose)
+        try:
+            asyncio.run(standin.serve_forever())
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,43 @@
+import asyncio
+
+from app.db.advisory_lock import advisory_lock
+from app.services import ai_suggestions
+from app.services.ai_suggestions import _llm_prompt, suggestion_fingerprint
+
+
+def test_users_sharing_a_fingerprint_share_the_prompt():
+    first = [("Food", 12345.67), ("Rent", 30000.00), ("Transport", 2100.10)]
+    second = [("food", 12401.02), ("Rent", 30050.00), ("transport", 2099.95)]
+    assert suggestion_fingerprint(first) == suggestion_fingerprint(second)
+
+    prompt = _llm_prompt(first)
+    assert prompt == _llm_prompt(second)
+    for _, amount in first + second:
+        assert f"{amount:.2f}" not in prompt
+
+
+def test_precompute_runs_once_across_workers(db, monkeypatch):
+    def fail(*args):
+        raise AssertionError("precompute ran while another worker held the claim")
+
+    monkeypatch.setattr(ai_suggestions, "_active_top_expense_categories", fail)
+    with advisory_lock(ai_suggestions._PRECOMPUTE_LOCK) as claimed:
+        assert claimed
+        assert asyncio.run(ai_suggestions.precompute_ai_suggestions_once()) == 0
+
+    calls = []
+    monkeypatch.setattr(
+        ai_suggestions, "_active_top_expense_categories", lambda *a: calls.append(a) or []
+    )
+    assert asyncio.run(ai_suggestions.precompute_ai_suggestions_once()) == 0
+    assert len(calls) == 1
+
+
+def test_advisory_lock_is_exclusive_until_released(db):
+    with advisory_lock("test-job") as first:
+        with advisory_lock("test-job") as second:
+            assert first and not second
+        with advisory_lock("other-job") as other:
+            assert other
+    with advisory_lock("test-job") as again:
+        assert again
@@ -0,0 +1,69 @@
+import random
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from app.services.analytics_engine import CREDIT, DEBIT, build_analytics_pivots
+from app.services.transaction_frame_cache import TransactionFrame
+
+CATEGORIES = ["food", "rent", "groceries", "transport", "shopping", "salary", "bonus"]
+
+
+def _transactions(seed: int) -> list[dict]:
+    rng = random.Random(seed)
+    start = date(2026, 1, 1)
+    rows = []
+    for _ in range(600):
+        rows.append(
+            {
+                "day": start + timedelta(days=rng.randint(0, 120)),
+                "type": rng.choice(["DEBIT", "DEBIT", "CREDIT"]),
+                # Uncategorized spend is large enough to rank in a top 5.
+                "category": rng.choice([*CATEGORIES, None, None, None]),
+                "amount": Decimal(rng.randint(100, 500_000)) / 100,
+            }
+        )
+    return rows
+
+
+def _baseline_pie(transactions: list[dict], type_: str) -> list[tuple[str, float]]:
+    # The per-transaction groupby the analytics endpoint used before.
+    df = pd.DataFrame(
+        [{**tx, "amount": float(tx["amount"])} for tx in transactions]
+    )
+    totals = df[df["type"] == type_].groupby("category")["amount"].sum().nlargest(5)
+    return [(category, round(amount, 2)) for category, amount in totals.items()]
+
+
+def _aggregate_rows(transactions: list[dict]) -> list[SimpleNamespace]:
+    # daily_transaction_aggregates: one row per (day, type, category or "").
+    totals = defaultdict(lambda: [Decimal(0), 0])
+    for tx in transactions:
+        cell = totals[(tx["day"], tx["type"], tx["category"] or "")]
+        cell[0] += tx["amount"]
+        cell[1] += 1
+    return [
+        SimpleNamespace(day=day, type=type_, category=category, total_amount=amount, tx_count=count)
+        for (day, type_, category), (amount, count) in sorted(totals.items())
+    ]
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3, 4, 5])
+def test_pies_match_per_transaction_groupby(seed):
+    transactions = _transactions(seed)
+    totals = TransactionFrame.from_rows(_aggregate_rows(transactions)).day_totals()
+    pivots = build_analytics_pivots(
+        totals["day"], totals["type"], totals["category"], totals["amount"]
+    )
+
+    for type_, type_index in (("DEBIT", DEBIT), ("CREDIT", CREDIT)):
+        pie = [
+            (category, round(amount, 2))
+            for category, amount in pivots.top_categories(type_index, 5)
+        ]
+        assert pie == _baseline_pie(transactions, type_)
+        assert "" not in [category for category, _ in pie]
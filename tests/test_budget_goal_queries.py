@@ -0,0 +1,103 @@
+import random
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+from app.models.bank import Transaction
+from app.models.budget import Budget
+from app.models.daily_prediction import DailyPrediction
+from app.services.budget_goal_intelligence import (
+    get_all_budget_goal_statuses,
+    get_budget_goal_status,
+)
+
+CATEGORIES = ["food", "rent", "groceries", "transport", "shopping", "utilities"]
+
+
+def _seed_budgets(db, user_id: str, budgets: int, rng: random.Random):
+    today = date.today()
+    for i in range(budgets):
+        start = today - timedelta(days=rng.randint(0, 40))
+        db.add(
+            Budget(
+                user_id=user_id,
+                category=CATEGORIES[i % len(CATEGORIES)],
+                budget_amount=Decimal(rng.randint(1000, 50000)),
+                start_date=start,
+                end_date=start + timedelta(days=rng.choice([7, 30, 60])),
+            )
+        )
+
+    now = datetime.now(timezone.utc)
+    for _ in range(budgets * 40):
+        db.add(
+            Transaction(
+                user_id=user_id,
+                source="MANUAL",
+                date=now - timedelta(days=rng.randint(0, 90), minutes=rng.randint(0, 1440)),
+                amount=Decimal(rng.randint(10, 5000)),
+                currency="NPR",
+                type=rng.choice(["DEBIT", "DEBIT", "CREDIT"]),
+                status="COMPLETED",
+                category=rng.choice(CATEGORIES),
+            )
+        )
+    db.commit()
+
+
+def _seed_predictions(db, user_id: str, rng: random.Random):
+    today = date.today()
+    for category in CATEGORIES:
+        for days_ago in range(3):
+            day = today - timedelta(days=days_ago)
+            db.add(
+                DailyPrediction(
+                    user_id=user_id,
+                    prediction_date=day,
+                    day_of_week=day.strftime("%A"),
+                    day_of_week_id=day.weekday(),
+                    category=category,
+                    predicted_amount=Decimal(rng.randint(10, 500)),
+                    rolling_7_day_avg=Decimal(rng.randint(10, 500)),
+                    budget_remaining=Decimal(rng.randint(0, 5000)),
+                    risk_probability=Decimal("0.5"),
+                    risk_level=rng.choice(["LOW", "MEDIUM", "HIGH"]),
+                    time_horizon="30d",
+                )
+            )
+    db.commit()
+
+
+def test_batched_statuses_match_per_budget_statuses(db, make_user):
+    user = make_user()
+    rng = random.Random(25)
+    _seed_budgets(db, user.user_id, 25, rng)
+    _seed_predictions(db, user.user_id, rng)
+
+    batched = get_all_budget_goal_statuses(db, user.user_id)
+    per_budget = [
+        get_budget_goal_status(db, user.user_id, status["budget_id"])
+        for status in batched
+    ]
+
+    assert len(batched) == 25
+    assert batched == per_budget
+
+
+def test_batched_query_count_does_not_grow_with_budgets(
+    db, make_user, query_counter, max_queries
+):
+    user = make_user()
+    rng = random.Random(1)
+    _seed_budgets(db, user.user_id, 1, rng)
+    _seed_predictions(db, user.user_id, rng)
+
+    before = query_counter.count
+    get_all_budget_goal_statuses(db, user.user_id)
+    one_budget = query_counter.count - before
+
+    _seed_budgets(db, user.user_id, 49, rng)
+    db.expire_all()
+    with max_queries(one_budget):
+        statuses = get_all_budget_goal_statuses(db, user.user_id)
+
+    assert len(statuses) == 50
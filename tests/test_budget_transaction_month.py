@@ -0,0 +1,55 @@
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select
+
+from app.crud.budget import get_active_budgets_for_transaction
+from app.crud.budget_ledger import budget_month_spend
+from app.models.bank import Transaction
+from app.models.budget import Budget
+
+
+def _debit(user_id, when: datetime, amount: str) -> Transaction:
+    return Transaction(
+        user_id=user_id,
+        source="MANUAL",
+        date=when,
+        amount=Decimal(amount),
+        currency="NPR",
+        type="DEBIT",
+        status="COMPLETED",
+        category="Food",
+    )
+
+
+@pytest.mark.parametrize(
+    "when, counted",
+    [
+        # Earlier in the start month than start_date: counted as the month's spend.
+        (datetime(2026, 3, 2, 9, tzinfo=timezone.utc), True),
+        (datetime(2026, 3, 15, 9, tzinfo=timezone.utc), True),
+        # Before end_date but in the following month: not counted.
+        (datetime(2026, 4, 5, 9, tzinfo=timezone.utc), False),
+    ],
+)
+def test_active_budgets_match_the_spend_month(db, make_user, when, counted):
+    user = make_user()
+    budget = Budget(
+        user_id=user.user_id,
+        category="Food",
+        budget_amount=Decimal("1000.00"),
+        start_date=date(2026, 3, 10),
+        end_date=date(2026, 4, 20),
+    )
+    transaction = _debit(user.user_id, when, "25.00")
+    db.add_all([budget, transaction])
+    db.commit()
+
+    matched = get_active_budgets_for_transaction(db, transaction)
+    spend = db.execute(
+        select(budget_month_spend()).where(Budget.id == budget.id)
+    ).scalar_one()
+
+    assert [b.id for b in matched] == ([budget.id] if counted else [])
+    assert spend == (Decimal("25.00") if counted else 0)
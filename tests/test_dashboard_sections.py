@@ -0,0 +1,35 @@
+import asyncio
+import threading
+
+from app.api import dashboard
+from app.models.bank import BankAccount
+
+
+def test_frame_load_runs_off_the_event_loop(db, make_user, monkeypatch):
+    user = make_user()
+    db.add(
+        BankAccount(
+            external_account_id=f"ext-{user.user_id}",
+            user_id=user.user_id,
+            bank_name="Nabil Bank",
+            account_number_masked="****0001",
+            account_type="SAVINGS",
+            balance=0,
+        )
+    )
+    db.commit()
+
+    loop_threads = []
+    load_account_frame = dashboard.get_account_frame
+
+    def get_account_frame(frame_db, *args):
+        loop_threads.append(threading.current_thread())
+        assert frame_db is not db
+        return load_account_frame(frame_db, *args)
+
+    monkeypatch.setattr(dashboard, "get_account_frame", get_account_frame)
+
+    result = asyncio.run(dashboard.build_dashboard_data(db, user))
+
+    assert result.summary.totalIncome == "0.00"
+    assert loop_threads and loop_threads[0] is not threading.main_thread()
@@ -0,0 +1,21 @@
+import importlib
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import app.api
+from app.config import settings
+
+
+@pytest.mark.parametrize("enabled, status_code", [(False, 404), (True, 401)])
+def test_cache_stats_is_mounted_only_when_enabled(monkeypatch, enabled, status_code):
+    monkeypatch.setattr(settings, "OPS_ENDPOINTS_ENABLED", enabled)
+    try:
+        api = FastAPI()
+        api.include_router(importlib.reload(app.api).api_router, prefix="/api/v1")
+        response = TestClient(api).get("/api/v1/ops/cache-stats")
+        assert response.status_code == status_code
+    finally:
+        monkeypatch.undo()
+        importlib.reload(app.api)
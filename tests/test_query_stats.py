@@ -0,0 +1,53 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+from app.db.query_stats import _QUERY_START_KEY, normalize_statement
+from app.db.session import engine
+
+
+def _run(*statements: str):
+    with engine.connect() as conn:
+        for statement in statements:
+            conn.execute(text(statement))
+
+
+def test_query_counter_counts_statements(query_counter):
+    _run("SELECT 1", "SELECT 2", "SELECT 3")
+
+    assert query_counter.count == 3
+    assert query_counter.shapes["SELECT ?"] == 3
+    assert query_counter.repeated_shapes(3) == [("SELECT ?", 3)]
+
+
+def test_max_queries_passes_within_limit(max_queries):
+    with max_queries(2) as stats:
+        _run("SELECT 1", "SELECT 2")
+
+    assert stats.count == 2
+
+
+def test_max_queries_fails_over_limit(max_queries):
+    with pytest.raises(AssertionError, match="at most 1 SQL statements, got 2"):
+        with max_queries(1):
+            _run("SELECT 1", "SELECT 1")
+
+
+def test_failed_statement_does_not_leak_start_time(query_counter):
+    with engine.connect() as conn:
+        with pytest.raises(DBAPIError):
+            conn.execute(text("SELECT * FROM no_such_table"))
+        assert conn.info.get(_QUERY_START_KEY) == []
+        conn.rollback()
+
+        conn.execute(text("SELECT 1"))
+        assert conn.info.get(_QUERY_START_KEY) == []
+
+    assert query_counter.count == 1
+
+
+def test_normalize_statement_collapses_literals_and_in_lists():
+    assert (
+        normalize_statement("SELECT * FROM t WHERE id IN (%(id_1)s, %(id_2)s) AND n = 5")
+        == "SELECT * FROM t WHERE id IN (?) AND n = ?"
+    )
@@ -0,0 +1,58 @@
+import uuid
+from decimal import Decimal
+
+from app.crud.bank import deactivate_bank_accounts_by_user
+from app.crud.user_data_version import (
+    bump_all_user_data_versions,
+    bump_user_data_version,
+    get_user_data_version,
+)
+from app.models.bank import BankAccount
+from app.services.bank_sync import _sync_stock_instruments_for_user
+
+
+def test_bump_all_covers_users_without_a_version_row(db, make_user):
+    versioned = make_user()
+    unversioned = make_user()
+    bump_user_data_version(db, versioned.user_id)
+    db.commit()
+
+    bump_all_user_data_versions(db)
+    db.commit()
+
+    assert get_user_data_version(db, versioned.user_id) == 2
+    assert get_user_data_version(db, unversioned.user_id) == 1
+
+
+def test_unlinking_bank_accounts_bumps_the_version(db, make_user):
+    user = make_user()
+    db.add(
+        BankAccount(
+            external_account_id=str(uuid.uuid4()),
+            user_id=user.user_id,
+            bank_name="Nabil Bank",
+            account_number_masked="****1234",
+            account_type="SAVINGS",
+            balance=Decimal("100.00"),
+        )
+    )
+    db.commit()
+    before = get_user_data_version(db, user.user_id)
+
+    deactivate_bank_accounts_by_user(db, user.user_id)
+
+    assert get_user_data_version(db, user.user_id) == before + 1
+
+
+def test_stock_instrument_sync_bumps_the_version(db, make_user):
+    user = make_user()
+
+    synced = _sync_stock_instruments_for_user(
+        db, user.user_id, [{"symbol": "nabil", "quantity": 10, "current_price": 500}]
+    )
+
+    assert synced == 1
+    assert get_user_data_version(db, user.user_id) == 1
+
+    assert _sync_stock_instruments_for_user(db, user.user_id, []) == 0
+    assert get_user_data_version(db, user.user_id) == 1
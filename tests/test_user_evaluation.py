@@ -0,0 +1,28 @@
+from app.db.advisory_lock import advisory_lock
+from app.models.user_evaluation_status import UserEvaluationStatus
+from app.services.user_evaluation import evaluate_user, is_evaluation_stale
+
+
+def _marker(db, user_id):
+    db.expire_all()
+    return db.get(UserEvaluationStatus, user_id)
+
+
+def test_evaluation_skips_a_user_claimed_by_another_worker(db, make_user):
+    user = make_user()
+
+    with advisory_lock(f"user_evaluation:{user.user_id}"):
+        assert evaluate_user(db, user.user_id) is False
+    assert _marker(db, user.user_id) is None
+    assert is_evaluation_stale(db, user.user_id)
+
+    assert evaluate_user(db, user.user_id) is True
+    assert _marker(db, user.user_id) is not None
+    assert not is_evaluation_stale(db, user.user_id)
+
+
+def test_claim_is_per_user(db, make_user):
+    first, second = make_user(), make_user()
+
+    with advisory_lock(f"user_evaluation:{first.user_id}"):
+        assert evaluate_user(db, second.user_id) is True